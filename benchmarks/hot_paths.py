@@ -0,0 +1,220 @@
+"""Benchmark the hot paths of paiargparse on synthetic schemas (see synthetic_schema.py).
+
+For each schema the (minimum) time of constructing a parser, parse_args, format_help, to_dict and from_dict, the peak
+memory of parsing (tracemalloc) and the number of parse passes are measured. The results are written as json, pass
+the results of a previous commit to `--compare` to report regressions.
+
+The scaling checks grow the width (length of a list of dataclasses) and the depth of a schema and fail if the number
+of parse passes or the time of constructing the dataclasses (`_tree_to_data_class`) grows super-linearly with the
+number of dataclasses.
+
+Usage:
+    python benchmarks/hot_paths.py [--repeat 5] [--output results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+root_dir = os.path.dirname(this_dir)
+sys.path.insert(0, root_dir)
+
+from paiargparse import PAIArgumentParser
+from synthetic_schema import Schema
+
+SCHEMAS = [
+    Schema(),
+    Schema(depth=1, fields=100),
+    Schema(depth=1, list_length=100, dict_keys=0),
+    Schema(depth=1, list_length=0, dict_keys=100),
+    Schema(depth=2, choices=20),
+    Schema(depth=8, list_length=0, dict_keys=0),
+]
+
+# schema of each step of the scaling checks
+SCALING = {
+    "width": [Schema(depth=1, list_length=n, dict_keys=0) for n in [16, 32, 64, 128]],
+    "depth": [Schema(depth=d, list_length=0, dict_keys=0) for d in [4, 8, 16, 32]],
+}
+
+# Max exponent of the growth of the parse passes and of _tree_to_data_class with the number of dataclasses
+MAX_SCALING_EXPONENT = 1.5  # linear is 1, quadratic is 2 (allow for the noise of small times)
+
+# Metrics that are compared to previous results
+COMPARED_METRICS = ["construct_ms", "parse_args_ms", "format_help_ms", "to_dict_ms", "from_dict_ms", "peak_memory_kib"]
+
+# Min absolute increase of a time (ms) or memory (KiB) metric that is a regression, smaller differences are noise
+MIN_REGRESSION_MS = 0.1
+MIN_REGRESSION_KIB = 64
+
+
+def best_time_ms(fn: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def create_parser(root_cls) -> PAIArgumentParser:
+    parser = PAIArgumentParser()
+    parser.add_root_argument("root", root_cls)
+    return parser
+
+
+def peak_memory_kib(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def tree_to_data_class_ms(parser: PAIArgumentParser, repeat: int) -> float:
+    """Time to construct the dataclasses of the tree that was expanded by the last parse"""
+    dc_parser = parser._dc_parser
+
+    def construct():
+        for node in dc_parser._params_tree.dcs.values():
+            dc_parser._tree_to_data_class(node)
+
+    return best_time_ms(construct, repeat)
+
+
+def benchmark_schema(schema: Schema, repeat: int) -> Dict[str, float]:
+    root_cls = schema.create()
+    argv = schema.argv()
+    parser = create_parser(root_cls)
+    root = parser.parse_args(argv).root
+    d = root.to_dict()
+    return {
+        "nodes": schema.num_nodes(),
+        "args": len(argv),
+        "parse_passes": parser._dc_parser._num_parse_passes,
+        "construct_ms": best_time_ms(lambda: create_parser(root_cls), repeat),
+        "parse_args_ms": best_time_ms(lambda: parser.parse_args(argv), repeat),
+        "tree_to_data_class_ms": tree_to_data_class_ms(parser, repeat),
+        # the help of the arguments that were expanded by the last parse
+        "format_help_ms": best_time_ms(parser.format_help, repeat),
+        "to_dict_ms": best_time_ms(root.to_dict, repeat),
+        "from_dict_ms": best_time_ms(lambda: root_cls.from_dict(d), repeat),
+        "peak_memory_kib": peak_memory_kib(lambda: create_parser(root_cls).parse_args(argv)),
+    }
+
+
+def scaling_exponent(nodes: List[int], values: List[float]) -> float:
+    """The exponent k of values ~ nodes^k (least squares fit of the logarithms)"""
+    if min(values) <= 0:
+        return 0.0
+    xs = [math.log(n) for n in nodes]
+    ys = [math.log(v) for v in values]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def check_scaling(repeat: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, schemas in SCALING.items():
+        runs = []
+        for schema in schemas:
+            parser = create_parser(schema.create())
+            parser.parse_args(schema.argv())
+            runs.append(
+                {
+                    "nodes": schema.num_nodes(),
+                    "parse_passes": parser._dc_parser._num_parse_passes,
+                    # small times, more repetitions to reduce the noise
+                    "tree_to_data_class_ms": tree_to_data_class_ms(parser, 4 * repeat),
+                }
+            )
+        nodes = [r["nodes"] for r in runs]
+        results[name] = {
+            "runs": runs,
+            "exponents": {
+                metric: scaling_exponent(nodes, [r[metric] for r in runs])
+                for metric in ["parse_passes", "tree_to_data_class_ms"]
+            },
+        }
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], previous: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the ratios of the metrics to the previous results, returns the regressions"""
+    regressions = []
+    print(f"\ncompared to {previous.get('commit', 'unknown')} (ratio new / previous)")
+    for key, metrics in results["schemas"].items():
+        previous_metrics = previous.get("schemas", {}).get(key)
+        if previous_metrics is None:
+            continue
+        ratios = []
+        for metric in COMPARED_METRICS:
+            if previous_metrics.get(metric, 0) <= 0:
+                continue
+            ratio = metrics[metric] / previous_metrics[metric]
+            ratios.append(f"{metric} {ratio:.2f}")
+            min_increase = MIN_REGRESSION_KIB if metric.endswith("_kib") else MIN_REGRESSION_MS
+            if ratio > 1 + threshold and metrics[metric] - previous_metrics[metric] > min_increase:
+                regressions.append(f"{key}: {metric} {previous_metrics[metric]:.2f} -> {metrics[metric]:.2f}")
+        print(f"{key:<24}{', '.join(ratios)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="json file to write the results to")
+    parser.add_argument("--compare", help="json file of previous results")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that is a regression")
+    args = parser.parse_args()
+
+    results = {"commit": git_commit(), "python": platform.python_version(), "schemas": {}}
+    print(f"{'schema':<24}{'nodes':>7}{'passes':>7}{'construct':>10}{'parse':>10}{'tree':>10}{'help':>10}", end="")
+    print(f"{'to_dict':>10}{'from_dict':>10}{'peak [KiB]':>12}")
+    for schema in SCHEMAS:
+        m = results["schemas"][schema.key] = benchmark_schema(schema, args.repeat)
+        print(
+            f"{schema.key:<24}{m['nodes']:>7}{m['parse_passes']:>7}{m['construct_ms']:>10.2f}{m['parse_args_ms']:>10.2f}"
+            f"{m['tree_to_data_class_ms']:>10.2f}{m['format_help_ms']:>10.2f}{m['to_dict_ms']:>10.2f}"
+            f"{m['from_dict_ms']:>10.2f}{m['peak_memory_kib']:>12.0f}"
+        )
+    print("(times in ms)")
+
+    errors = []
+    results["scaling"] = check_scaling(args.repeat)
+    print("\nscaling exponents with the number of dataclasses")
+    for name, scaling in results["scaling"].items():
+        exponents = scaling["exponents"]
+        print(f"{name:<24}{', '.join(f'{metric} {k:.2f}' for metric, k in exponents.items())}")
+        errors += [
+            f"{metric} grows super-linearly with the {name} (exponent {k:.2f})"
+            for metric, k in exponents.items()
+            if k > MAX_SCALING_EXPONENT
+        ]
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            errors += [f"Regression {r}" for r in compare(results, json.load(f), args.threshold)]
+
+    if errors:
+        print("\n".join(errors), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark the time to import paiargparse and to parse a simple command line.
+
+Runs `python -X importtime` in fresh processes and reports the (minimum) cumulative import time of paiargparse.
+The script fails if the time exceeds the budget, or if a module that is only required for serialization or for
+suggestions of unknown arguments (e.g. dataclasses_json) is imported.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 10] [--budget-ms 75]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Budget of the cumulative import time of paiargparse in ms (with compiled byte code)
+IMPORT_TIME_BUDGET_MS = 75
+
+# Modules that must not be imported to parse the command line
+LAZY_MODULES = ["dataclasses_json", "marshmallow", "editdistance", "orjson"]
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+root_dir = os.path.dirname(this_dir)
+
+PARSE_CODE = """
+import sys
+from dataclasses import dataclass
+from paiargparse import PAIArgumentParser, pai_dataclass
+
+@pai_dataclass
+@dataclass
+class Params:
+    p: int = 0
+
+parser = PAIArgumentParser()
+parser.add_root_argument("root", Params)
+parser.parse_args(["--root.p", "1"])
+print(" ".join(m for m in {lazy_modules} if m in sys.modules))
+"""
+
+
+def run_python(args, **kwargs) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=root_dir)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True, **kwargs)
+
+
+def import_time_us() -> int:
+    """Cumulative import time of paiargparse in a new process in us"""
+    stderr = run_python(["-X", "importtime", "-c", "import paiargparse"]).stderr
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "paiargparse":
+            return int(parts[1])
+    raise ValueError(f"Could not find the import time of paiargparse in:\n{stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    args = parser.parse_args()
+
+    run_python(["-c", "import paiargparse"])  # warm up, i.e. compile the byte code
+    times_ms = sorted(import_time_us() / 1000 for _ in range(args.repeat))
+    print(f"import paiargparse: min {times_ms[0]:.1f} ms, median {times_ms[len(times_ms) // 2]:.1f} ms")
+
+    imported = run_python(["-c", PARSE_CODE.format(lazy_modules=LAZY_MODULES)]).stdout.split()
+    print(f"lazy modules imported by parsing: {', '.join(imported) if imported else 'none'}")
+
+    errors = []
+    if times_ms[0] > args.budget_ms:
+        errors.append(f"Import time {times_ms[0]:.1f} ms exceeds the budget of {args.budget_ms} ms")
+    if imported:
+        errors.append(f"Modules {imported} must only be imported when used")
+    if errors:
+        print("\n".join(errors), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
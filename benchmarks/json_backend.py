@@ -0,0 +1,103 @@
+"""Benchmark writing and reading nested pai_dataclasses with the available json backends.
+
+The config consists of a list of nested dataclasses with large lists of numbers (e.g. the parameters of several
+data generators). For each backend the time of to_json_bytes, from_json and the size of the output is reported.
+`dataclasses_json` is the previous implementation (json.dumps(to_dict()) and from_dict(json.loads())).
+
+Usage:
+    python benchmarks/json_backend.py [--items 100] [--list-size 1000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.dirname(this_dir))
+
+from paiargparse import pai_dataclass
+from paiargparse.json_backend import available_json_backends
+
+
+@pai_dataclass
+@dataclass
+class Augmentation:
+    name: str = "noise"
+    strength: float = 0.5
+    weights: List[float] = field(default_factory=list)
+
+
+@pai_dataclass
+@dataclass
+class Generator:
+    path: str = "data/train"
+    ids: List[int] = field(default_factory=list)
+    augmentations: List[Augmentation] = field(default_factory=list)
+    meta: Dict[str, str] = field(default_factory=dict)
+
+
+@pai_dataclass
+@dataclass
+class Config:
+    name: str = "config"
+    generators: List[Generator] = field(default_factory=list)
+
+
+def create_config(items: int, list_size: int) -> Config:
+    return Config(
+        generators=[
+            Generator(
+                path=f"data/{i}",
+                ids=list(range(list_size)),
+                augmentations=[Augmentation(weights=[j / list_size for j in range(list_size)]) for _ in range(3)],
+                meta={f"key{j}": str(j) for j in range(10)},
+            )
+            for i in range(items)
+        ]
+    )
+
+
+def best_time_ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--list-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = create_config(args.items, args.list_size)
+
+    def dataclasses_json_dumps():
+        return json.dumps(config.to_dict()).encode("utf-8")
+
+    def dataclasses_json_loads(data):
+        return Config.from_dict(json.loads(data))
+
+    runs = [("dataclasses_json", dataclasses_json_dumps, dataclasses_json_loads)]
+    for backend in available_json_backends():
+        runs.append(
+            (
+                backend,
+                lambda backend=backend: config.to_json_bytes(backend=backend),
+                lambda data, backend=backend: Config.from_json(data, backend=backend),
+            )
+        )
+
+    print(f"{args.items} generators with lists of {args.list_size} values")
+    print(f"{'backend':<20}{'dump [ms]':>12}{'load [ms]':>12}{'size [kB]':>12}")
+    for name, dumps, loads in runs:
+        data = dumps()
+        assert loads(data) == config
+        dump_ms = best_time_ms(dumps, args.repeat)
+        load_ms = best_time_ms(lambda: loads(data), args.repeat)
+        print(f"{name:<20}{dump_ms:>12.1f}{load_ms:>12.1f}{len(data) / 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
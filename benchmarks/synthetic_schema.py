@@ -0,0 +1,90 @@
+"""Synthetic schemas of nested pai_dataclasses for the benchmarks.
+
+`Schema(depth, fields, list_length, dict_keys, choices).create()` creates the classes of a tree of the given nesting
+depth. Each class has `fields` primitive fields, and all classes but the leaves have the sub dataclasses
+- `child`: a single dataclass that can be selected from `choices` classes on the command line
+- `items`: a `List` of `list_length` dataclasses
+- `named`: a `Dict[str, ...]` of `dict_keys` dataclasses
+
+The classes are added to this module, so that they can be resolved by their qualified names (e.g. in `from_dict`).
+"""
+import sys
+from dataclasses import field, make_dataclass
+from typing import Dict, List, NamedTuple, Type
+
+from paiargparse import pai_dataclass, pai_meta
+
+_PRIMITIVES = [(int, 1), (float, 0.5), (str, "value"), (bool, False)]
+
+
+class Schema(NamedTuple):
+    depth: int = 3
+    fields: int = 4
+    list_length: int = 2
+    dict_keys: int = 2
+    choices: int = 2
+
+    @property
+    def key(self) -> str:
+        return f"d{self.depth}_f{self.fields}_l{self.list_length}_k{self.dict_keys}_c{self.choices}"
+
+    def num_nodes(self) -> int:
+        """The number of dataclasses of the default tree"""
+        width = 1 + self.list_length + self.dict_keys
+        return sum(width**d for d in range(self.depth + 1))
+
+    def create(self) -> Type:
+        """Create the classes and return the root class"""
+        child_choices: List[Type] = []
+        for level in range(self.depth + 1):
+            classes = [self._create_class(level, choice, child_choices) for choice in range(max(1, self.choices))]
+            child_choices = classes
+        return child_choices[0]
+
+    def _create_class(self, level: int, choice: int, child_choices: List[Type]) -> Type:
+        fields = []
+        for i in range(self.fields):
+            primitive, default = _PRIMITIVES[i % len(_PRIMITIVES)]
+            fields.append((f"p{i}", primitive, field(default=default)))
+        if child_choices:
+            child = child_choices[0]
+            fields += [
+                ("child", child, field(default_factory=child, metadata=pai_meta(choices=child_choices))),
+                ("items", List[child], field(default_factory=lambda: [child() for _ in range(self.list_length)])),
+                (
+                    "named",
+                    Dict[str, child],
+                    field(default_factory=lambda: {f"k{i}": child() for i in range(self.dict_keys)}),
+                ),
+            ]
+
+        name = f"{self.key}_L{level}_C{choice}"
+        # the choices are sub classes of the first class of their level
+        bases = () if choice == 0 else (getattr(_module, f"{self.key}_L{level}_C0"),)
+        cls = make_dataclass(name, fields if choice == 0 else [], bases=bases)
+        cls.__module__ = __name__
+        cls = pai_dataclass(cls)
+        setattr(_module, name, cls)
+        return cls
+
+    def argv(self, root: str = "root") -> List[str]:
+        """Args that select the last choice of all `child` fields and set the first field of all dataclasses"""
+        args: List[str] = []
+        self._node_args(root, self.depth, args)
+        return args
+
+    def _node_args(self, prefix: str, level: int, args: List[str]):
+        if self.fields > 0:
+            args += [f"--{prefix}.p0", "2"]
+        if level == 0:
+            return
+        if self.choices > 1:
+            args += [f"--{prefix}.child", f"{self.key}_L{level - 1}_C{self.choices - 1}"]
+        self._node_args(f"{prefix}.child", level - 1, args)
+        for i in range(self.list_length):
+            self._node_args(f"{prefix}.items.{i}", level - 1, args)
+        for i in range(self.dict_keys):
+            self._node_args(f"{prefix}.named.k{i}", level - 1, args)
+
+
+_module = sys.modules[__name__]
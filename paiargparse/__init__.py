@@ -2,3 +2,8 @@ from paiargparse.version import __version__
 from paiargparse.dataclass_meta import pai_meta, pai_dataclass
 from paiargparse.main_parser import PAIArgumentParser
 from paiargparse.dataclass_parser import RequiredArgumentError
+from paiargparse.json_backend import set_json_backend
+from paiargparse.json_lines import read_json_lines, write_json_lines
+from paiargparse.fingerprint import fingerprint
+from paiargparse.instrumentation import instrument
+from paiargparse.completion import write_completion
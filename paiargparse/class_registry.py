@@ -0,0 +1,106 @@
+"""Registry of the dataclasses that can be selected by name (e.g. on the command line or by `__cls__` in a dict).
+
+Every `pai_dataclass` is registered by its qualified name ("path.to.module:ClassName"), its class name, and its
+alternative name (`pai_dataclass(alt=...)`). The first class of a qualified name is kept, so that e.g. a class with the
+same name that is created later in a function does not shadow the importable class. Names that are resolved by
+importing a module (e.g. classes that are not decorated or are re-exported by another module) are cached, so that a
+name is imported only once. The index of the names of the choices of a field (see `choices_by_name`) is cached, too.
+
+The registry and the caches only store weak references, since classes might be created dynamically.
+"""
+import importlib
+import weakref
+from typing import Dict, Iterator, List, Mapping, Tuple, Type
+
+from paiargparse import instrumentation
+
+# qualified name -> class
+_classes: "weakref.WeakValueDictionary[str, Type]" = weakref.WeakValueDictionary()
+# class name or alternative name -> classes
+_classes_by_name: Dict[str, "weakref.WeakSet[Type]"] = {}
+
+
+def qualified_name(cls: Type) -> str:
+    return f"{cls.__module__}:{cls.__name__}"
+
+
+def names_of_class(cls: Type) -> List[str]:
+    """The class name, and the alternative name if set"""
+    names = [cls.__name__]
+    if getattr(cls, "__alt_name__", None):
+        names.append(cls.__alt_name__)
+    return names
+
+
+def register_class(cls: Type):
+    if _classes.setdefault(qualified_name(cls), cls) is not cls:
+        # keep the first class of the name
+        return
+    for name in names_of_class(cls):
+        _classes_by_name.setdefault(name, weakref.WeakSet()).add(cls)
+
+
+def classes_by_name(name: str) -> List[Type]:
+    """All registered classes with the given class name or alternative name"""
+    return list(_classes_by_name.get(name, ()))
+
+
+def resolve_class(name: str) -> Type:
+    """Get the class of a qualified name 'path.to.module:ClassName'.
+
+    Raises a ValueError if the name is not qualified, or the errors of importing the module or accessing the class.
+    """
+    try:
+        return _classes[name]
+    except KeyError:
+        pass
+
+    module, class_name = name.split(":")
+    instrumentation.count("imports")
+    cls = getattr(importlib.import_module(module), class_name)
+    if isinstance(cls, type):
+        _classes[name] = cls
+    return cls
+
+
+class ChoicesIndex(Mapping):
+    """The choices (see `pai_meta`) by their class names and alternative names, stores weak references only"""
+
+    def __init__(self, choices: Tuple[Type, ...]):
+        self._choices = {name: weakref.ref(choice) for choice in choices for name in names_of_class(choice)}
+
+    def __getitem__(self, name: str) -> Type:
+        choice = self._choices[name]()
+        if choice is None:
+            raise KeyError(name)
+        return choice
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._choices)
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+
+# weak references of the choices -> their index, an entry is removed as soon as one of its choices is deleted
+_choices_indices: Dict[Tuple["weakref.ref[Type]", ...], ChoicesIndex] = {}
+
+
+def choices_by_name(choices: Tuple[Type, ...]) -> ChoicesIndex:
+    """Map the class names and alternative names of the choices (see `pai_meta`) to the choices"""
+    try:
+        return _choices_indices[tuple(weakref.ref(choice) for choice in choices)]
+    except KeyError:
+        pass
+
+    def remove(_):
+        _choices_indices.pop(key, None)
+
+    key = tuple(weakref.ref(choice, remove) for choice in choices)
+    index = _choices_indices[key] = ChoicesIndex(choices)
+    return index
+
+
+def registered_subclasses(base: Type) -> Dict[str, Type]:
+    """All registered classes (by their qualified names) that are subclasses of base"""
+    return {name: cls for name, cls in list(_classes.items()) if isinstance(cls, type) and issubclass(cls, base)}
@@ -0,0 +1,217 @@
+"""Static shell completion of the arguments of a `PAIArgumentParser`, so that completing does not start python.
+
+`write_completion(parser, path)` expands the dataclass arguments (also of every dataclass that can be selected by a
+field) and writes a bash or zsh script, or a json index of all flags and the completions of their values:
+- the class names and alternative names of `pai_meta(choices=...)`, or the qualified names of all registered
+  subclasses, for fields of dataclasses
+- the members of enums, the (enforced) choices of other fields, and True/False for bools
+
+    write_completion(parser, "~/.local/share/my_cli/completion.bash")  # then `source` the file in .bashrc
+
+The file stores a fingerprint of the schema, i.e. of the root arguments (with the content of their defaults) and the
+source files of all modules that define the dataclasses. If it did not change, `write_completion` returns without
+expanding the arguments again, so it can be called on every start of the program.
+"""
+import hashlib
+import os
+import re
+from dataclasses import MISSING
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from paiargparse.class_registry import choices_by_name, qualified_name, registered_subclasses
+from paiargparse.dataclass_parser import DataClassSelectionAction, FieldValueAction
+from paiargparse.schema_cache import dumps, module_source_hash, modules_of_tree
+from paiargparse.version import __version__
+
+SHELLS = ("bash", "zsh", "json")
+
+# Max number of parses to expand the selectable dataclasses
+MAX_EXPANSIONS = 1000
+
+
+class CompletionIndex(NamedTuple):
+    flags: Dict[str, List[str]]  # flag -> completions of its values
+    modules: List[str]  # the modules that define the dataclasses of the schema
+
+
+def _value_completions(action) -> List[str]:
+    if isinstance(action, DataClassSelectionAction):
+        arg_field = action.argument_field
+        if arg_field.dict_type:
+            return []  # key=ClassName pairs
+        choices = arg_field.meta.get("choices") if arg_field.meta else None
+        if choices is not None:
+            names = list(choices_by_name(tuple(choices)).keys())
+        else:
+            names = sorted(registered_subclasses(action.base_type).keys())
+        return names + (["None"] if arg_field.optional else [])
+    if action.choices is not None:
+        return [str(c) for c in action.choices]
+    if isinstance(action, FieldValueAction) and action.argument_field.type is bool:
+        return ["True", "False"] + (["None"] if action.argument_field.optional else [])
+    return []
+
+
+def completion_index(parser, args: Sequence[str] = (), max_expansions=MAX_EXPANSIONS) -> CompletionIndex:
+    """Collect the flags of the arguments for `args` and of all dataclasses that can be selected.
+
+    Every dataclass that can be selected by a field (see `_value_completions`) is expanded once by parsing with this
+    selection, at most `max_expansions` times.
+    """
+    flags: Dict[str, Dict[str, None]] = {}  # ordered sets of the completions
+    modules = set()
+    pending: List[List[str]] = [list(args)]
+    expanded = set()
+    num_parses = 0
+    while pending and num_parses < max_expansions:
+        argv = pending.pop(0)
+        num_parses += 1
+        try:
+            parser.parse_known_args(argv)
+        except (Exception, SystemExit):
+            continue  # e.g. a selected dataclass has required fields
+
+        dc_parser = parser._data_class_parser
+        modules |= modules_of_tree(dc_parser._params_tree)
+        for action in parser._actions + parser._help_actions + dc_parser._actions:
+            completions = _value_completions(action)
+            for option_string in action.option_strings:
+                flags.setdefault(option_string, {}).update(dict.fromkeys(completions))
+                if isinstance(action, DataClassSelectionAction) and not action.argument_field.list:
+                    for name in completions:
+                        if name != "None" and (option_string, name) not in expanded:
+                            expanded.add((option_string, name))
+                            pending.append(argv + [option_string, name])
+
+    return CompletionIndex({flag: list(values) for flag, values in flags.items()}, sorted(modules))
+
+
+def _default_token(default) -> str:
+    """Token of the content of the default of a root argument that is identical in every process"""
+    if default is MISSING:
+        return "MISSING"  # its repr contains the address
+    try:
+        return hashlib.sha256(dumps(default)).hexdigest()
+    except Exception:
+        # can not be pickled, only its class is known
+        return qualified_name(default.__class__)
+
+
+def schema_fingerprint(parser, modules: Iterable[str], shell: str, prog: str, args: Sequence[str] = ()) -> str:
+    """Hash of the root arguments of the parser and of the source files of the modules (does not expand the tree)"""
+    parser._materialize()
+    parts = [__version__, prog, shell, list(args), sorted(o for a in parser._actions for o in a.option_strings)]
+    for param_name, dc_type, default, ignore, flat, config in parser._root_arguments:
+        parts.append((param_name, qualified_name(dc_type), _default_token(default), ignore, flat, config))
+    parts += sorted((module, module_source_hash(module)) for module in modules)
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _bash_words(values: Iterable[str]) -> str:
+    # values with whitespace can not be completed by compgen -W
+    return " ".join(re.sub(r'(["$`\\])', r"\\\1", v) for v in values if v and not re.search(r"\s", v))
+
+
+def render_bash(index: CompletionIndex, prog: str, fingerprint: str, setup: str = "") -> str:
+    """The completion script, `setup` are lines that are inserted after the header (see `_stored_schema`)"""
+    name = re.sub(r"\W", "_", prog)
+    value_cases = "".join(
+        f'            "{flag}") COMPREPLY=($(compgen -W "{_bash_words(values)}" -- "$cur")) ;;\n'
+        for flag, values in index.flags.items()
+        if values
+    )
+    return f"""# paiargparse completion of {prog}
+# schema: {fingerprint}
+# modules: {" ".join(index.modules)}
+{setup}_paiargparse_flags_{name}="{_bash_words(index.flags.keys())}"
+_paiargparse_complete_{name}() {{
+    local cur prev
+    if declare -F _get_comp_words_by_ref >/dev/null; then
+        _get_comp_words_by_ref -n =: cur prev
+    else
+        cur="${{COMP_WORDS[COMP_CWORD]}}"
+        prev="${{COMP_WORDS[COMP_CWORD-1]}}"
+    fi
+    COMPREPLY=()
+    if [[ "$cur" == -* ]]; then
+        COMPREPLY=($(compgen -W "$_paiargparse_flags_{name}" -- "$cur"))
+        return
+    fi
+    case "$prev" in
+{value_cases}            *) COMPREPLY=($(compgen -f -- "$cur")) ;;
+    esac
+    if declare -F __ltrim_colon_completions >/dev/null; then
+        __ltrim_colon_completions "$cur"
+    fi
+}}
+complete -F _paiargparse_complete_{name} {prog}
+"""
+
+
+def render_completion(index: CompletionIndex, shell: str, prog: str, fingerprint: str) -> str:
+    if shell == "bash":
+        return render_bash(index, prog, fingerprint)
+    elif shell == "zsh":
+        return render_bash(index, prog, fingerprint, setup="autoload -U +X bashcompinit && bashcompinit\n")
+    elif shell == "json":
+        import json
+
+        return json.dumps(
+            {"prog": prog, "schema": fingerprint, "modules": index.modules, "flags": index.flags}, indent=1
+        )
+    raise ValueError(f"Unsupported shell {shell}. Supported: {SHELLS}")
+
+
+def _stored_schema(path: str, shell: str) -> Optional[Tuple[str, List[str]]]:
+    """The fingerprint and the modules of an existing completion file"""
+    try:
+        with open(path) as f:
+            if shell == "json":
+                import json
+
+                content = json.load(f)
+                return content["schema"], content["modules"]
+            header = {}
+            for line in f:
+                if not line.startswith("#"):
+                    break
+                key, _, value = line[1:].strip().partition(":")
+                header[key] = value.strip()
+            return header["schema"], header["modules"].split()
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_completion(
+    parser,
+    path: str,
+    shell: Optional[str] = None,
+    prog: Optional[str] = None,
+    args: Sequence[str] = (),
+    force=False,
+) -> bool:
+    """Write the completion of the parser for `args` (e.g. a sub command) if its schema changed.
+
+    The shell is derived from the extension of the path (.json, .zsh, else bash) if not set. Returns True if the file
+    was written.
+    """
+    path = os.path.expanduser(path)
+    if shell is None:
+        ext = os.path.splitext(path)[1].lstrip(".")
+        shell = ext if ext in SHELLS else "bash"
+    if shell not in SHELLS:
+        raise ValueError(f"Unsupported shell {shell}. Supported: {SHELLS}")
+    prog = prog or parser.prog
+
+    if not force:
+        stored = _stored_schema(path, shell)
+        if stored is not None and stored[0] == schema_fingerprint(parser, stored[1], shell, prog, args):
+            return False
+
+    index = completion_index(parser, args)
+    content = render_completion(index, shell, prog, schema_fingerprint(parser, index.modules, shell, prog, args))
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return True
@@ -0,0 +1,90 @@
+"""Load saved configs (see `to_json`) as defaults of the root arguments of a `PAIArgumentParser`.
+
+A config file is the json of a dataclass, its `__cls__` entries select the (sub) dataclasses. The decoded dataclasses
+of a file are cached by its path, modification time and size, so that repeated parses only read and decode a file
+again if it changed. Each call returns a copy, so that modifying a result does not change the cached config.
+
+Usage:
+    parser = PAIArgumentParser(add_config=True)  # adds --config path.json
+    parser.add_root_argument("root", Params, config="base.json")  # or set the config programmatically
+"""
+import copy
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, Type
+
+from paiargparse.json_backend import json_backend
+
+# Max number of decoded configs that are cached
+MAX_CACHED_CONFIGS = 32
+
+# (path, ...) -> (mtime in ns, size, decoded content)
+_decoded_configs: "OrderedDict[Tuple[Hashable, ...], Tuple[int, int, Any]]" = OrderedDict()
+
+
+def _cached(path: str, key: Tuple[Hashable, ...], decode: Callable[[Any], Any]) -> Any:
+    """The cached result of decoding the json content of a file (the cached object itself, do not modify it)"""
+    stat = os.stat(path)
+    cached = _decoded_configs.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        _decoded_configs.move_to_end(key)
+        return cached[2]
+
+    with open(path, "rb") as f:
+        content = decode(json_backend().loads(f.read()))
+    _decoded_configs[key] = (stat.st_mtime_ns, stat.st_size, content)
+    while len(_decoded_configs) > MAX_CACHED_CONFIGS:
+        _decoded_configs.popitem(last=False)
+    return content
+
+
+def _abspath(path: str) -> str:
+    return os.path.abspath(os.path.expanduser(path))
+
+
+def read_config(path: str) -> Any:
+    """The parsed (json) content of a config file"""
+    path = _abspath(path)
+    return copy.deepcopy(_cached(path, (path,), lambda content: content))
+
+
+def load_config(path: str, dc_type: Type) -> Any:
+    """Load the dataclass of a config file, it must be an instance of `dc_type`"""
+    path = _abspath(path)
+    return copy.deepcopy(_cached(path, (path, dc_type), lambda content: config_from_dict(content, dc_type, path)))
+
+
+def load_root_configs(path: str, root_types: Tuple[Tuple[str, Type], ...]) -> Dict[str, Any]:
+    """Load the dataclasses of the root arguments (name, type) of a config file passed by the command line.
+
+    If a single root argument is added, the file is its config. Otherwise, the file maps (some of) the names of the
+    root arguments to their configs.
+    """
+    path = _abspath(path)
+    types = dict(root_types)
+
+    def decode(content):
+        return {name: config_from_dict(c, types[name], path) for name, c in root_configs(content, path, types).items()}
+
+    return copy.deepcopy(_cached(path, (path, root_types), decode))
+
+
+def config_from_dict(kvs: Dict[str, Any], dc_type: Type, path: str) -> Any:
+    from paiargparse.dataclass_json_overrides import _decode_dataclass
+
+    if not isinstance(kvs, dict):
+        raise TypeError(f"The config {path} must be a json object but got {type(kvs).__name__}.")
+    config = _decode_dataclass(dc_type, kvs, False)
+    if not isinstance(config, dc_type):
+        raise TypeError(f"The config {path} is of type {config.__class__} which is not a subclass of {dc_type}.")
+    return config
+
+
+def root_configs(content: Any, path: str, root_names) -> Dict[str, Dict[str, Any]]:
+    """Split the content of a config file passed by the command line into the configs of the root arguments"""
+    root_names = list(root_names)
+    if len(root_names) == 1 and not (isinstance(content, dict) and content.keys() == {root_names[0]}):
+        return {root_names[0]: content}
+    if not isinstance(content, dict) or not set(content.keys()).issubset(root_names):
+        raise ValueError(f"The config {path} must map the names of the root arguments {root_names} to their configs.")
+    return content
@@ -3,9 +3,10 @@
 Use extract_args_from_dataclass(MyDataclass) to return a List[ArgumentField].
 """
 
-from dataclasses import dataclass, MISSING
+import weakref
+from dataclasses import dataclass, MISSING, Field, field, fields
 from enum import Enum
-from typing import Any, List, Type, Optional, Tuple, Union, TypeVar
+from typing import Any, Callable, Dict, List, NamedTuple, Type, Optional, Tuple, Union, TypeVar, get_type_hints
 
 SUPPORTED_ENUM_TYPES = {int, str, float}
 
@@ -35,13 +36,15 @@ class ArgumentField:
         optional=True,
         list=list,
         dataclass=False,
-        default=list(),  # the called factory or the default value
+        default=MISSING,
         required=False,
         enum=None,
         dict_type=None,
+        default_factory=list,
     )
     ```
 
+    Accessing `parsed_field.default` calls the factory once (i.e., it returns `list()`).
     """
 
     name: str
@@ -54,8 +57,18 @@ class ArgumentField:
     required: bool
     enum: Optional[Type[Enum]]  # If set its an enum, this is the type
     dict_type: Any  # If set its a dict, this is the VALUE type, type is the key type
+    # If set, `default` is lazily computed by calling the factory on first access. This prevents constructing (large)
+    # default values if they are never used
+    default_factory: Optional[Callable[[], Any]] = None
+    # The dataclass that defines the field (set by `extract_args_of_dataclass`), the schema cache pickles the field as
+    # reference to the field of this class since the default (factory) might not be picklable
+    owner: Optional[type] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self):
+        if self.default_factory is not None:
+            # remove the default, so that it is created by __getattr__ on first access
+            del self.default
+
         # check if it is a supported type
         if self.list and self.dict_type:
             raise ValueError(f"Only list or dict types are supported. See field {self.name}")
@@ -74,44 +87,154 @@ class ArgumentField:
                 f"enum. (Caused by {self.name} with choices {self.meta['choices']}"
             )
 
+    def __getattr__(self, item):
+        # only called if the attribute does not exist, i.e., the default was not created yet
+        if item == "default" and self.__dict__.get("default_factory") is not None:
+            self.default = self.default_factory()
+            return self.default
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
+
     @staticmethod
-    def from_field(name: str, meta: dict, field) -> "ArgumentField":
-        """Parse the given Dataclass Field `field` with given `name` and `meta`."""
-        is_optional, t = split_optional_type(field.type)
-        is_list, t = split_list_type(t)
-        t, dict_type = split_dict_type(t)
-        enum_class, t = split_enum_type(t)
-        if isinstance(t, TypeVar):
-            if not hasattr(t, "__bound__"):
-                raise ValueError(f"A TypeVar must have field 'bound' set.")
-            else:
-                t = t.__bound__
-
-        if dict_type:
-            is_dataclass = hasattr(dict_type, "__dataclass_fields__")
-        else:
-            is_dataclass = hasattr(t, "__dataclass_fields__")
+    def from_field(name: str, meta: dict, field, field_type: Optional["FieldType"] = None) -> "ArgumentField":
+        """Parse the given Dataclass Field `field` with given `name` and `meta`.
+
+        Pass the (cached) `field_type` of the field to skip the analysis of its type.
+        """
+        if field_type is None:
+            field_type = split_field_type(field.type)
 
-        default = field.default
-        if default == MISSING and field.default_factory != MISSING:
-            default = field.default_factory()
+        default_factory = (
+            field.default_factory if field.default == MISSING and field.default_factory != MISSING else None
+        )
 
         required = is_field_required(field)
 
         return ArgumentField(
             name=name,
-            type=t,
+            type=field_type.type,
             meta=meta,
-            optional=is_optional,
-            list=is_list,
-            dataclass=is_dataclass,
-            enum=enum_class,
-            default=default,
+            optional=field_type.optional,
+            list=field_type.list,
+            dataclass=field_type.dataclass,
+            enum=field_type.enum,
+            default=field.default,
             required=required,
-            dict_type=dict_type,
+            dict_type=field_type.dict_type,
+            default_factory=default_factory,
         )
 
 
+class FieldType(NamedTuple):
+    """The analysed type of a dataclass field, see `ArgumentField` for the meaning of the attributes"""
+
+    optional: bool
+    list: Optional[Union[Type[list], Type[set]]]
+    type: Any
+    dict_type: Any
+    enum: Optional[Type[Enum]]
+    dataclass: bool
+
+
+def split_field_type(ftype) -> FieldType:
+    """Split the type of a field into its components.
+
+    E.g.:
+        split_field_type(Optional[List[int]]) => FieldType(optional=True, list=list, type=int, ...)
+    """
+    is_optional, t = split_optional_type(ftype)
+    is_list, t = split_list_type(t)
+    t, dict_type = split_dict_type(t)
+    enum_class, t = split_enum_type(t)
+    if isinstance(t, TypeVar):
+        if not hasattr(t, "__bound__"):
+            raise ValueError(f"A TypeVar must have field 'bound' set.")
+        else:
+            t = t.__bound__
+
+    if dict_type:
+        is_dataclass = hasattr(dict_type, "__dataclass_fields__")
+    else:
+        is_dataclass = hasattr(t, "__dataclass_fields__")
+
+    return FieldType(
+        optional=is_optional,
+        list=is_list,
+        type=t,
+        dict_type=dict_type,
+        enum=enum_class,
+        dataclass=is_dataclass,
+    )
+
+
+class TypePlan:
+    """Cached analysis of the fields of a dataclass.
+
+    The plan is shared by the argument parser and the dict/json decoder, use `type_plan(cls)` to obtain it.
+    All attributes are computed on first access.
+    """
+
+    def __init__(self, cls):
+        # only store a weak reference, the plan must not keep (dynamically created) classes alive
+        self._cls = weakref.ref(cls)
+        self.dataclass_fields: Tuple[Field, ...] = tuple(cls.__dataclass_fields__.values())  # including pseudo fields
+        self.argument_fields: Tuple[Field, ...] = tuple(
+            field for field in self.dataclass_fields if field.metadata.get("mode", "snake") != "ignore"
+        )  # the fields that are shown in the command line
+        self.fields: Tuple[Field, ...] = fields(cls)
+        self.field_names: Tuple[str, ...] = tuple(field.name for field in self.fields)
+        self._field_types: Optional[Dict[str, FieldType]] = None
+        self._type_hints: Optional[Dict[str, Any]] = None
+        self._derived: Dict[str, Any] = {}
+
+    @property
+    def field_types(self) -> Dict[str, FieldType]:
+        """The analysed types of all fields in `dataclass_fields`"""
+        if self._field_types is None:
+            self._field_types = {field.name: split_field_type(field.type) for field in self.dataclass_fields}
+        return self._field_types
+
+    @property
+    def type_hints(self) -> Dict[str, Any]:
+        """The resolved type hints of the class (see `typing.get_type_hints`)"""
+        if self._type_hints is None:
+            self._type_hints = get_type_hints(self._cls())
+        return self._type_hints
+
+    def derived(self, key: str, compute: Callable[[type], Any]) -> Any:
+        """Memoize a value that is derived from the class by `compute(cls)`, e.g. the overrides of dataclasses_json.
+
+        The value is invalidated together with the plan.
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = compute(self._cls())
+            return value
+
+
+_type_plans: "weakref.WeakKeyDictionary[type, TypePlan]" = weakref.WeakKeyDictionary()
+
+
+def type_plan(cls) -> TypePlan:
+    """Return the cached `TypePlan` of the dataclass `cls`"""
+    try:
+        return _type_plans[cls]
+    except KeyError:
+        plan = _type_plans[cls] = TypePlan(cls)
+        return plan
+
+
+def invalidate_type_plans(cls=None):
+    """Drop the cached `TypePlan` of `cls` (or of all classes if None).
+
+    Required if a class is modified after its plan was created, or if the global config of dataclasses_json changes.
+    """
+    if cls is None:
+        _type_plans.clear()
+    else:
+        _type_plans.pop(cls, None)
+
+
 def split_optional_type(t):
     """Split optional from a type.
 
@@ -206,13 +329,11 @@ def is_field_required(field):
 
 def extract_args_of_dataclass(dc, exclude_ignored=True) -> List[ArgumentField]:
     """Return all Arguments of a dataclass as List[ArgumentField]"""
+    plan = type_plan(dc)
     args = []
-    for name, field in dc.__dataclass_fields__.items():
-        meta: dict = field.metadata
-        if exclude_ignored and meta.get("mode", "snake") == "ignore":
-            continue
-
-        arg = ArgumentField.from_field(name, meta, field)
+    for field in plan.argument_fields if exclude_ignored else plan.dataclass_fields:
+        arg = ArgumentField.from_field(field.name, field.metadata, field, plan.field_types[field.name])
+        arg.owner = dc
         args.append(arg)
 
     return args
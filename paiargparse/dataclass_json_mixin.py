@@ -0,0 +1,65 @@
+"""The dataclass_json api (to_dict, from_dict, to_json, from_json, schema) of a pai_dataclass.
+
+to_json writes the json of dataclasses_json (i.e. of json.dumps with its default formatting) unless a json backend is
+passed explicitly, to_json_bytes writes the compact bytes of the selected json backend (see json_backend).
+from_json uses the selected json backend unless options of json.loads (e.g. parse_float) are passed.
+
+dataclasses_json (and marshmallow) are only imported once a method is called for the first time, so that importing
+paiargparse and parsing the command line only requires the standard library.
+"""
+from abc import ABC
+from typing import Optional, Union
+
+
+def _json_overrides():
+    # import lazily, this imports dataclasses_json and applies the overrides (see dataclass_json_overrides)
+    from paiargparse import dataclass_json_overrides
+
+    return dataclass_json_overrides
+
+
+class PaiDataClassMixin(ABC):
+    def to_json(self, *, backend: Optional[str] = None, **kwargs) -> str:
+        if backend is None or kwargs:
+            # the output of json.dumps (optionally with formatting options, e.g. indent)
+            from dataclasses_json import DataClassJsonMixin
+
+            _json_overrides()
+            return DataClassJsonMixin.to_json(self, **kwargs)
+        return self.to_json_bytes(backend=backend).decode("utf-8")
+
+    def to_json_bytes(self, *, backend: Optional[str] = None) -> bytes:
+        """Encode the dict (see to_dict) using a json backend (see json_backend)"""
+        from paiargparse.json_backend import json_backend
+
+        return json_backend(backend).dumps(self.to_dict())
+
+    @classmethod
+    def from_json(
+        cls, s: Union[str, bytes, bytearray], *, backend: Optional[str] = None, infer_missing=False, **kwargs
+    ):
+        if kwargs:
+            # decoding options (e.g. parse_float) of json.loads
+            from dataclasses_json import DataClassJsonMixin
+
+            _json_overrides()
+            return DataClassJsonMixin.from_json.__func__(cls, s, infer_missing=infer_missing, **kwargs)
+
+        from paiargparse.json_backend import json_backend
+
+        return cls.from_dict(json_backend(backend).loads(s), infer_missing=infer_missing)
+
+    @classmethod
+    def from_dict(cls, kvs, *, infer_missing=False):
+        # Use custom _decode_dataclass with fixed types
+        return _json_overrides()._decode_dataclass(cls, kvs, infer_missing)
+
+    def to_dict(self, encode_json=False, include_cls=True):
+        return _json_overrides()._asdict(self, encode_json=encode_json, include_cls=include_cls)
+
+    @classmethod
+    def schema(cls, **kwargs):
+        from dataclasses_json import DataClassJsonMixin
+
+        _json_overrides()
+        return DataClassJsonMixin.schema.__func__(cls, **kwargs)
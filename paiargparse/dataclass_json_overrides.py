@@ -1,27 +1,38 @@
 """Changes to dataclass_json.
 
 This code inserts the support for the __cls__ field to define the type of a dataclass.
+The module is imported lazily by the methods of `PaiDataClassMixin` on their first call.
 """
 import copy
-import importlib
 import warnings
-from abc import ABC
-from dataclasses import fields, MISSING, is_dataclass, _is_dataclass_instance
-from typing import get_type_hints, Dict, Type, Mapping, Collection, TypeVar
+from dataclasses import MISSING, is_dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Collection, Mapping, NamedTuple, Optional, TypeVar
+from uuid import UUID
 
 from dataclasses_json.core import (
     _user_overrides_or_exts,
     _decode_letter_case_overrides,
     _decode_generic,
     _is_supported_generic,
+    _issubclass_safe,
     _support_extended_types,
     _encode_overrides,
 )
-from dataclasses_json.utils import _handle_undefined_parameters_safe, _is_optional, _is_new_type
-from dataclasses_json.api import A
-from dataclasses_json.core import Json
+from dataclasses_json.utils import (
+    _handle_undefined_parameters_safe,
+    _is_optional,
+    _is_new_type,
+    _undefined_parameter_action_safe,
+)
 import dataclasses_json
 
+from paiargparse.class_registry import resolve_class
+from paiargparse.dataclass_extractor import type_plan
+from paiargparse.dataclass_json_mixin import PaiDataClassMixin
+
 
 def _decode_dataclass(cls, kvs, infer_missing):
     if isinstance(kvs, cls):
@@ -29,59 +40,89 @@ def _decode_dataclass(cls, kvs, infer_missing):
 
     # >>> OVERRIDE TYPE
     if "__cls__" in kvs and kvs["__cls__"] != cls.__module__ + ":" + cls.__name__:
-        module, name = kvs["__cls__"].split(":")
-        cls = getattr(importlib.import_module(module), name)
+        cls = resolve_class(kvs["__cls__"])
     # <<< END
 
-    overrides = _user_overrides_or_exts(cls)
-    kvs = {} if kvs is None and infer_missing else kvs
-    field_names = [field.name for field in fields(cls)]
-    decode_names = _decode_letter_case_overrides(field_names, overrides)
-    kvs = {decode_names.get(k, k): v for k, v in kvs.items()}
-    missing_fields = {field for field in fields(cls) if field.name not in kvs}
-
-    for field in missing_fields:
-        if field.default is not MISSING:
-            kvs[field.name] = field.default
-        elif field.default_factory is not MISSING:
-            kvs[field.name] = field.default_factory()
-        elif infer_missing:
-            kvs[field.name] = None
-
-    # Perform undefined parameter action
-    kvs = _handle_undefined_parameters_safe(cls, kvs, usage="from")
-
-    init_kwargs = {}
-    types = get_type_hints(cls)
-    for field in fields(cls):
+    return type_plan(cls).derived("json_decoder", _compile_decoder)(cls, kvs, infer_missing)
+
+
+def _compile_field_decoder(field_type, decoder):
+    """Create the function that decodes a (not None) value of a field with the (resolved) `field_type`"""
+    if decoder is not None:
+        # FIXME hack
+        return lambda value, infer_missing: value if field_type is type(value) else decoder(value)
+    elif is_dataclass(field_type):
+        # FIXME this is a band-aid to deal with the value already being
+        # serialized when handling nested marshmallow schema
+        # proper fix is to investigate the marshmallow schema generation
+        # code
+        return lambda value, infer_missing: (
+            value if is_dataclass(value) else _decode_dataclass(field_type, value, infer_missing)
+        )
+    elif _is_supported_generic(field_type) and field_type != str:
+        args = getattr(field_type, "__args__", ())
+        origin = getattr(field_type, "__origin__", None)
+        if origin is list and len(args) == 1 and is_dataclass(args[0]):
+            # List[DataClass], shortcut of _decode_generic
+            item_type = args[0]
+            return lambda value, infer_missing: [_decode_dataclass(item_type, x, infer_missing) for x in value]
+        elif origin is dict and len(args) == 2 and args[0] is str and is_dataclass(args[1]):
+            # Dict[str, DataClass], shortcut of _decode_generic
+            item_type = args[1]
+            return lambda value, infer_missing: {
+                str(k): _decode_dataclass(item_type, v, infer_missing) for k, v in value.items()
+            }
+        return lambda value, infer_missing: _decode_generic(field_type, value, infer_missing)
+    for extended_type in (datetime, Decimal, UUID):
+        if _issubclass_safe(field_type, extended_type):
+            return lambda value, infer_missing: (
+                value if isinstance(value, extended_type) else _support_extended_types(field_type, value)
+            )
+    return None  # keep the value
+
+
+class _FieldDecodePlan(NamedTuple):
+    name: str
+    warn_type_var: bool  # the type is a TypeVar without bound
+    optional: bool
+    decode: Optional[Callable[[Any, bool], Any]]  # None to keep the value
+
+
+def _compile_decoder(cls):
+    """Create the function that creates an instance of the dataclass `cls` from a dict (see `_decode_dataclass`).
+
+    Everything that only depends on the class (the names, defaults, overrides and resolved types of the fields, and
+    the handling of undefined parameters) is resolved once. The decoder is called with the class since it must not
+    reference `cls`, as it is cached in the weakly keyed type plan of `cls`.
+    """
+    plan = type_plan(cls)
+    overrides = plan.derived("json_overrides", _user_overrides_or_exts)
+    decode_names = plan.derived(
+        "json_decode_names", lambda _: _decode_letter_case_overrides(plan.field_names, overrides)
+    )
+    # (name, default value or MISSING, default factory or MISSING) of all fields
+    defaults = tuple((field.name, field.default, field.default_factory) for field in plan.fields)
+    has_undefined_parameters = _undefined_parameter_action_safe(cls) is not None
+    cls_name = cls.__name__
+
+    field_plans = []
+    types = plan.type_hints
+    for field in plan.fields:
         # The field should be skipped from being added
         # to init_kwargs as it's not intended as a constructor argument.
         if not field.init:
             continue
 
-        field_value = kvs[field.name]
         field_type = types[field.name]
+        warn_type_var = False
         # >>> Support for Generic Types
         if isinstance(field_type, TypeVar):
             if not hasattr(field_type, "__bound__"):
-                warnings.warn(f"If using TypeVars, set the bound field for obtaining the default type. ")
+                warn_type_var = True
             else:
                 field_type = field_type.__bound__
         # <<< Support for Generic Types
-        if field_value is None and not _is_optional(field_type):
-            warning = f"value of non-optional type {field.name} detected " f"when decoding {cls.__name__}"
-            if infer_missing:
-                warnings.warn(
-                    f"Missing {warning} and was defaulted to None by "
-                    f"infer_missing=True. "
-                    f"Set infer_missing=False (the default) to prevent this "
-                    f"behavior.",
-                    RuntimeWarning,
-                )
-            else:
-                warnings.warn(f"`NoneType` object {warning}.", RuntimeWarning)
-            init_kwargs[field.name] = field_value
-            continue
+        optional = _is_optional(field_type)
 
         while True:
             if not _is_new_type(field_type):
@@ -89,68 +130,120 @@ def _decode_dataclass(cls, kvs, infer_missing):
 
             field_type = field_type.__supertype__
 
-        if field.name in overrides and overrides[field.name].decoder is not None:
-            # FIXME hack
-            if field_type is type(field_value):
-                init_kwargs[field.name] = field_value
-            else:
-                init_kwargs[field.name] = overrides[field.name].decoder(field_value)
-        elif is_dataclass(field_type):
-            # FIXME this is a band-aid to deal with the value already being
-            # serialized when handling nested marshmallow schema
-            # proper fix is to investigate the marshmallow schema generation
-            # code
-            if is_dataclass(field_value):
-                value = field_value
-            else:
-                value = _decode_dataclass(field_type, field_value, infer_missing)
-            init_kwargs[field.name] = value
-        elif _is_supported_generic(field_type) and field_type != str:
-            init_kwargs[field.name] = _decode_generic(field_type, field_value, infer_missing)
+        decoder = overrides[field.name].decoder if field.name in overrides else None
+        field_plans.append(
+            _FieldDecodePlan(field.name, warn_type_var, optional, _compile_field_decoder(field_type, decoder))
+        )
+
+    def decode(cls, kvs, infer_missing):
+        kvs = {} if kvs is None and infer_missing else kvs
+        if decode_names:
+            kvs = {decode_names.get(k, k): v for k, v in kvs.items()}
         else:
-            init_kwargs[field.name] = _support_extended_types(field_type, field_value)
+            kvs = dict(kvs)
+
+        for name, default, default_factory in defaults:
+            if name in kvs:
+                continue
+            if default is not MISSING:
+                kvs[name] = default
+            elif default_factory is not MISSING:
+                kvs[name] = default_factory()
+            elif infer_missing:
+                kvs[name] = None
+
+        # Perform undefined parameter action
+        if has_undefined_parameters:
+            kvs = _handle_undefined_parameters_safe(cls, kvs, usage="from")
+
+        init_kwargs = {}
+        for name, warn_type_var, optional, decode_value in field_plans:
+            field_value = kvs[name]
+            if warn_type_var:
+                warnings.warn(f"If using TypeVars, set the bound field for obtaining the default type. ")
+            if field_value is None and not optional:
+                warning = f"value of non-optional type {name} detected " f"when decoding {cls_name}"
+                if infer_missing:
+                    warnings.warn(
+                        f"Missing {warning} and was defaulted to None by "
+                        f"infer_missing=True. "
+                        f"Set infer_missing=False (the default) to prevent this "
+                        f"behavior.",
+                        RuntimeWarning,
+                    )
+                else:
+                    warnings.warn(f"`NoneType` object {warning}.", RuntimeWarning)
+                init_kwargs[name] = field_value
+            elif decode_value is None:
+                init_kwargs[name] = field_value
+            else:
+                init_kwargs[name] = decode_value(field_value, infer_missing)
+
+        return cls(**init_kwargs)
 
-    return cls(**init_kwargs)
+    return decode
+
+
+# Values of these types are immutable, thus they are not copied
+_IMMUTABLE_TYPES = frozenset(
+    {int, float, bool, str, bytes, complex, type(None), datetime, date, time, timedelta, Decimal, UUID}
+)
+
+
+def _compile_encoder(cls):
+    """Create the function that converts an instance of the dataclass `cls` to a dict (see `_asdict`).
+
+    Everything that only depends on the class (the fields, the overrides of dataclass_json, the handling of undefined
+    parameters and the value of __cls__) is resolved once. The encoder must not reference `cls` since it is cached in
+    the weakly keyed type plan of `cls`.
+    """
+    plan = type_plan(cls)
+    overrides = plan.derived("json_overrides", _user_overrides_or_exts)
+    field_names = plan.field_names
+    # _encode_overrides is only required if a field has an override (exclude, letter case or encoder) or to encode json
+    has_overrides = any(any(o is not None for o in override) for override in overrides.values())
+    has_undefined_parameters = _undefined_parameter_action_safe(cls) is not None
+    cls_name = cls.__module__ + ":" + cls.__name__ if hasattr(cls, "__pai_dataclass__") else None
+
+    def encode(obj, encode_json: bool, include_cls: bool):
+        result = {name: _asdict(getattr(obj, name), encode_json) for name in field_names}
+        if has_undefined_parameters:
+            result = dict(_handle_undefined_parameters_safe(cls=obj, kvs=result, usage="to"))
+        if include_cls and cls_name is not None:
+            result["__cls__"] = cls_name
+        if has_overrides or encode_json or has_undefined_parameters:
+            return _encode_overrides(result, overrides, encode_json=encode_json)
+        return result
+
+    return encode
 
 
 def _asdict(obj, encode_json=False, include_cls=True):
     """
     A re-implementation of `asdict` (based on the original in the `dataclasses`
     source) to support arbitrary Collection and Mapping types.
+
+    Dataclasses are converted by an encoder that is compiled once per class, immutable values are not copied.
     """
-    if _is_dataclass_instance(obj):
-        result = []
-        for field in fields(obj):
-            value = _asdict(getattr(obj, field.name), encode_json=encode_json)
-            result.append((field.name, value))
-
-        result = _handle_undefined_parameters_safe(cls=obj, kvs=dict(result), usage="to")
-
-        # >>> INSERTED HERE
-        if include_cls and hasattr(obj.__class__, "__pai_dataclass__"):
-            result = dict(result)
-            result["__cls__"] = obj.__class__.__module__ + ":" + obj.__class__.__name__
-        # <<< END
-        return _encode_overrides(dict(result), _user_overrides_or_exts(obj), encode_json=encode_json)
+    obj_type = type(obj)
+    if obj_type in _IMMUTABLE_TYPES:
+        return obj
+    elif hasattr(obj_type, "__dataclass_fields__"):
+        return type_plan(obj_type).derived("json_encoder", _compile_encoder)(obj, encode_json, include_cls)
+    elif isinstance(obj, Enum):
+        return obj  # deepcopy returns the member itself
     elif isinstance(obj, Mapping):
-        return dict((_asdict(k, encode_json=encode_json), _asdict(v, encode_json=encode_json)) for k, v in obj.items())
+        return {_asdict(k, encode_json): _asdict(v, encode_json) for k, v in obj.items()}
     elif isinstance(obj, Collection) and not isinstance(obj, str) and not isinstance(obj, bytes):
-        return list(_asdict(v, encode_json=encode_json) for v in obj)
+        # inline the check of immutable values for large lists of e.g. numbers
+        return [v if type(v) in _IMMUTABLE_TYPES else _asdict(v, encode_json) for v in obj]
     else:
         return copy.deepcopy(obj)
 
 
-class PaiDataClassMixin(ABC):
-    @classmethod
-    def from_dict(cls: Type[A], kvs: Json, *, infer_missing=False) -> A:
-        # Use custom _decode_dataclass with fixed types
-        return _decode_dataclass(cls, kvs, infer_missing)
-
-    def to_dict(self, encode_json=False, include_cls=True) -> Dict[str, Json]:
-        d = _asdict(self, encode_json=encode_json, include_cls=include_cls)
-        return d
-
-
 # Override dataclass_json functions to include custom adaptions
 dataclasses_json.core._decode_dataclass = _decode_dataclass
 dataclasses_json.core._asdict = _asdict
+
+# Pai dataclasses are dataclass_json classes, e.g. to build the schema of nested pai dataclasses
+dataclasses_json.DataClassJsonMixin.register(PaiDataClassMixin)
@@ -1,9 +1,9 @@
-from dataclasses import is_dataclass
+from dataclasses import fields, is_dataclass
 from typing import List, Any
 
-from dataclasses_json import dataclass_json
-
-from paiargparse.dataclass_json_overrides import PaiDataClassMixin
+from paiargparse.class_registry import register_class
+from paiargparse.dataclass_json_mixin import PaiDataClassMixin
+from paiargparse.frozen import HASH_ATTRIBUTE, make_frozen
 
 DEFAULT_SEPARATOR = "."
 
@@ -20,6 +20,8 @@ def pai_meta(
     enforce_choices=None,  # if choices are dataclass, defaults to False, else True
     fix_dc=False,  # if True, the dataclass can not be overwritten
     tuple_like=False,  # if True, enable fix dc and enable to set values similar to tuples
+    fingerprint=True,  # if False, the field is excluded from the fingerprint of its dataclass
+    sweep=None,  # if comma separated values are swept, defaults to True for all but str fields
 ):
     """Meta information for a dataclass field.
 
@@ -38,6 +40,8 @@ def pai_meta(
             enforce_choices: Force that the choices must be matched. For dataclasses this is False by default, since the sub class might be derived. See also disable_subclass_check
             fix_dc: (applies only to dataclass fields) force that the type of the dataclass field must not be changed.
             typle_like: allow to set the fields of a dataclass as tuples (see README.md for usage)
+            fingerprint: (default True) set to False to exclude the field (e.g. an output path) from `fingerprint`
+            sweep: (default None) set to True to sweep comma separated values of a str field, or False to never sweep the field (see `PAIArgumentParser.sweep`)
 
     see also dataclass_json metadata for addtional options, e.g. for encoding and decoding to a dict/json
     """
@@ -81,7 +85,40 @@ def set_attr_forbid_unknown(cls):
     return __setattr__
 
 
-def pai_dataclass(_cls=None, alt=None, no_assign_to_unknown=True):
+def _add_slots(cls, extra_slots=()):
+    """Recreate the dataclass `cls` with `__slots__` for its fields (as `dataclass(slots=True)` of Python 3.10).
+
+    Instances have no `__dict__` if all base classes are slotted too, thus assigning unknown attributes fails.
+    `extra_slots` are added for attributes that are not fields (e.g. the cached hash of frozen dataclasses).
+    """
+    own_fields = [f.name for f in fields(cls)] + list(extra_slots)
+    own_fields = [name for name in own_fields if not any(name in getattr(b, "__slots__", ()) for b in cls.__mro__)]
+    cls_dict = dict(cls.__dict__)
+    for name in own_fields:
+        # the default values are class attributes, they must be removed since they conflict with the slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = tuple(own_fields)
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+
+    # zero argument super() of methods refers to the class by the __class__ cell
+    for value in cls_dict.values():
+        if isinstance(value, property):
+            funcs = [value.fget, value.fset, value.fdel]
+        else:
+            funcs = [getattr(value, "__func__", value)]  # (static/class) methods
+        for cell in (cell for func in funcs for cell in getattr(func, "__closure__", None) or ()):
+            try:
+                if cell.cell_contents is cls:
+                    cell.cell_contents = slotted_cls
+            except ValueError:
+                pass  # empty cell
+    return slotted_cls
+
+
+def pai_dataclass(_cls=None, alt=None, no_assign_to_unknown=True, slots=False, frozen=False):
     """
     Based on the code in the `dataclasses` module to handle optional-parens
     decorators. See example below:
@@ -91,14 +128,29 @@ def pai_dataclass(_cls=None, alt=None, no_assign_to_unknown=True):
         ...
 
     alt allows you to specify an alternative name for this class that can be used if listed in pai_meta choices.
+
+    slots creates the class with `__slots__` for its fields, this saves memory and time to set attributes. Assigning
+    unknown attributes fails since the instances have no `__dict__` (if all base classes are slotted, otherwise
+    `no_assign_to_unknown` is applied).
+
+    frozen makes the instances immutable and hashable after `__init__`, lists, sets and dicts are converted to tuples,
+    frozensets and `FrozenDict`s (see `frozen`). Subclasses of frozen classes are frozen too.
+
+    The class is registered in the `class_registry` to quickly resolve its name.
     """
 
     def wrap(cls):
         setattr(cls, "__pai_dataclass__", None)  # Mark this class as a pai dataclass
         setattr(cls, "__alt_name__", alt)
+        is_frozen = frozen or getattr(cls, "__pai_frozen__", False)
+        if slots:
+            cls = _add_slots(cls, extra_slots=[HASH_ATTRIBUTE] if is_frozen else [])
         cls = _process_class(cls)
-        if no_assign_to_unknown:
+        if is_frozen:
+            make_frozen(cls, forbid_unknown=no_assign_to_unknown and cls.__dictoffset__ != 0)
+        elif no_assign_to_unknown and cls.__dictoffset__ != 0:
             setattr(cls, "__setattr__", set_attr_forbid_unknown(cls))
+        register_class(cls)
         return cls
 
     if _cls is None:
@@ -109,10 +161,18 @@ def pai_dataclass(_cls=None, alt=None, no_assign_to_unknown=True):
 def _process_class(cls):
     # apply dataclass_json, dataclass must be assigned manually for intellisense
     assert is_dataclass(cls)
-    cls = dataclass_json(cls)
+    if getattr(cls, "dataclass_json_config", None) is not None:
+        # dataclass_json must handle undefined parameters in __init__
+        from dataclasses_json import dataclass_json
+
+        cls = dataclass_json(cls)
 
-    # override to dict and from dict
+    # the methods of dataclass_json, but only import dataclasses_json when used
+    cls.to_json = PaiDataClassMixin.to_json
+    cls.to_json_bytes = PaiDataClassMixin.to_json_bytes
+    cls.from_json = classmethod(PaiDataClassMixin.from_json.__func__)
     cls.to_dict = PaiDataClassMixin.to_dict
     cls.from_dict = classmethod(PaiDataClassMixin.from_dict.__func__)
+    cls.schema = classmethod(PaiDataClassMixin.schema.__func__)
     PaiDataClassMixin.register(cls)
     return cls
@@ -1,18 +1,27 @@
-import importlib
+import copy
+import hashlib
+import itertools
 import sys
-from argparse import ArgumentParser, Action, SUPPRESS, ArgumentDefaultsHelpFormatter, Namespace
+from argparse import ArgumentParser, Action, SUPPRESS, Namespace, ArgumentError
 from dataclasses import MISSING, is_dataclass
-from typing import Any, Dict, NamedTuple, Optional, List, Union
+from functools import partial
+from typing import Any, Dict, Iterator, NamedTuple, Optional, List, Tuple, Type, Union
 
+from paiargparse import instrumentation
+from paiargparse.class_registry import choices_by_name, names_of_class, resolve_class
 from paiargparse.dataclass_extractor import (
     extract_args_of_dataclass,
     ArgumentField,
+    is_field_required,
+    type_plan,
     str_to_enum,
     enum_choices,
     str_to_bool,
 )
 from paiargparse.dataclass_meta import DEFAULT_SEPARATOR
+from paiargparse.help_formatter import PAIHelpFormatter
 from paiargparse.param_tree import PAINode, PAINodeDataClass
+from paiargparse.schema_cache import SchemaCache, SchemaCacheEntry, dumps
 
 
 class RequiredArgumentError(Exception):
@@ -46,134 +55,328 @@ def default_dict_key_value(arg: "DefaultArg"):
     return arg.arg_name
 
 
-def generate_field_action(pai_node: PAINodeDataClass, arg: PAINode, field: ArgumentField, ignore: List[str]):
-    if field.dict_type and field.dataclass:
-        # if the value type is again a dataclass, handle this differently
-        # The values of the key/value pairs are the type of the dataclass
-        # Create an action that adds new sub files based on the key to allow to set the parameters hierarchically
+class _PicklableAction(Action):
+    """An action that can be stored in the schema cache together with the tree, i.e. without its container"""
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("container", None)
+        return state
+
+
+class FieldValueAction(_PicklableAction):
+    """Base of the actions that only set the value of the field `param_node` of the dataclass node `owner_node`.
+
+    These actions do not change the structure of the tree, thus they can be applied incrementally (see `reparse`).
+    """
+
+    def __init__(
+        self,
+        option_strings,
+        dest,
+        owner_node: PAINodeDataClass,
+        param_node: PAINode,
+        argument_field: ArgumentField,
+        **kwargs,
+    ):
+        super().__init__(option_strings, dest, **kwargs)
+        self.owner_node = owner_node
+        self.param_node = param_node
+        self.argument_field = argument_field
+
+
+class DataClassSelectionAction(_PicklableAction):
+    """Base of the actions that select the dataclass (or the dataclasses of a list or dict) of a field.
+
+    The selected classes must be subclasses of `base_type` (see `completion`).
+    """
 
+    def __init__(
+        self,
+        option_strings,
+        dest,
+        argument_field: ArgumentField,
+        base_type: Type,
+        pai_node: PAINodeDataClass,
+        ignore: List[str],
+        **kwargs,
+    ):
+        super().__init__(option_strings, dest, **kwargs)
+        self.argument_field = argument_field
+        self.base_type = base_type
+        self.pai_node = pai_node  # the node of the field
+        self.ignore = ignore
+
+
+class FieldSetterAction(FieldValueAction):
+    def __call__(self, parser, args, values, option_string=None):
+        arg, field = self.param_node, self.argument_field
+        if field.optional:
+            if is_none(values):
+                arg.value = None
+                setattr(args, self.dest, None)
+                return
+
+        is_str_type = field.enum or field.dict_type or field.type == bool or field.type == str
+
+        if field.type == bool:
+            if isinstance(values, list):
+                values = list(map(str_to_bool, values))
+            else:
+                values = str_to_bool(values)
+        # Simple field, but handle enumerations separately
+        if field.list:
+            if field.enum:
+                arg.value = field.list([str_to_enum(v, field.enum, field.type) for v in values])
+            else:
+                if not is_str_type:
+                    values = map(field.type, values)
+                arg.value = field.list(values)
+        else:
+            if field.enum:
+                arg.value = str_to_enum(values, field.enum, field.type)
+            else:
+                if not is_str_type:
+                    values = field.type(values)
+                arg.value = values
+
+        setattr(args, self.dest, arg.value)
+
+
+class DictParserAction(FieldValueAction):
+    def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
+        arg, field = self.param_node, self.argument_field
+        # Handle as normal parameter, but split key value pairs at '='
+        arg.value = {}
+        for value in values:
+            k, v = value.split("=")
+            k = field.type(k)
+            v = field.dict_type(v)
+            arg.value[k] = v
+
+        setattr(args, self.dest, arg.value)
+
+
+class DictParserDataclassAction(DataClassSelectionAction):
+    """Select the dataclasses of the values of a `Dict[str, DataClass]` field by key=ClassName pairs"""
+
+    def __init__(self, option_strings, dest, param_node: PAINode, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.param_node = param_node
+
+    def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
+        pai_node, arg, field, ignore = self.pai_node, self.param_node, self.argument_field, self.ignore
         sep = field.meta.get("separator", DEFAULT_SEPARATOR)
+        if len(values) == 1 and values[0] in parser._default_data_classes_to_set_after_next_run:
+            # Parse default (if set)
+            values = values[0]
+            defaults = parser._default_data_classes_to_set_after_next_run[values]
+            del parser._default_data_classes_to_set_after_next_run[values]
+            if defaults.value:
+                defaults = defaults.value
+                dict_values = {k: v.__class__ for k, v in defaults.items()}
+            else:
+                defaults = {}
+                dict_values = {}
+        else:
+            # Parse values
+            dict_values = {}
+            defaults = {}
+            for value in values:
+                if "=" not in value:
+                    k, v = value, field.dict_type
+                else:
+                    k, v = value.split("=")
+                    v = resolve_class(v)
+
+                defaults[k] = None
+                dict_values[k] = v
+
+                if not field.meta.get("disable_subclass_check", False) and not issubclass(v, field.dict_type):
+                    raise TypeError(
+                        f"Data class {v} must inherit {field.dict_type} to allow usage as "
+                        f"replacement. But parents are {v.__mro__}"
+                    )
+
+        # Add new root args for this argument in the params tree,
+        # this is basically another 'dataclass' (key to value mapping)
+        # However, to not register as dataclass to the arguments (since it already exists = self)
+        pai_node.dcs[arg.name] = PAINodeDataClass(
+            name=arg.name,
+            arg_name=f"{arg.arg_name}{sep}",
+            parsed_type=dict,
+            default_value=MISSING,
+            value=MISSING,
+        )
+        root_dcs = pai_node.dcs[arg.name].dcs
+
+        for k, v in dict_values.items():
+            # Add the sub data classes (key k) and add them as parameters (p1, ..., pn)
+            # ...root.k.p1 = ...
+            # ...root.k.p2 = ...
+            dc_type = v
+            root_dcs[k] = PAINodeDataClass(
+                name=k,
+                arg_name=f"{arg.arg_name}{sep}",
+                parsed_type=dc_type,
+                default_value=defaults[k],
+                value=None,
+            )
+            add_dataclass_field(
+                parser,
+                root_dcs[k],
+                f"{arg.arg_name}{sep}",
+                root_dcs[k].dcs,
+                values=None,
+                dc_type=dc_type,
+                ignore=ignore,
+            )
+
+
+class DataClassAsTupleAction(_PicklableAction):
+    """Set the fields of a (fixed) dataclass like a tuple"""
+
+    def __init__(self, option_strings, dest, dc_type: Type, pai_node: PAINodeDataClass, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.dc_type = dc_type
+        self.pai_node = pai_node
+
+    def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
+        dc_type, pai_node = self.dc_type, self.pai_node
+        fields = extract_args_of_dataclass(dc_type)
+        if len(values) > len(pai_node.params):
+            raise ValueError(
+                f"Got {len(values)} arguments but only {len(fields)} are available. \n"
+                f"  Available: {[t.name for t in fields]}\n"
+                f"     Parsed: {values}"
+            )
+        for src, t in zip(values, fields):
+            is_str_type = t.enum or t.dict_type or t.type == bool or t.type == str
+            target = pai_node.params[t.name]
+            if t.optional and is_none(src):
+                target.value = None
+            elif t.enum:
+                target.value = str_to_enum(src, t.enum, t.type)
+            else:
+                if not is_str_type:
+                    src = t.type(src)
+                target.value = src
+
+
+class ListDataClassAction(DataClassSelectionAction):
+    """Select the dataclasses of a `List[DataClass]` field"""
+
+    def __init__(self, option_strings, dest, prefix: str, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.prefix = prefix
 
-        class DictParserDataclassAction(Action):
-            def __call__(self, parser: PAIDataClassArgumentParser, args, values, option_string=None):
-                if len(values) == 1 and values[0] in parser._default_data_classes_to_set_after_next_run:
-                    # Parse default (if set)
-                    values = values[0]
-                    defaults = parser._default_data_classes_to_set_after_next_run[values]
-                    del parser._default_data_classes_to_set_after_next_run[values]
-                    if defaults.value:
-                        defaults = defaults.value
-                        dict_values = {k: v.__class__ for k, v in defaults.items()}
-                    else:
-                        defaults = {}
-                        dict_values = {}
+    def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
+        arg_field, pai_node, prefix, ignore = self.argument_field, self.pai_node, self.prefix, self.ignore
+        param_name, sep = arg_field.name, arg_field.meta.get("separator", DEFAULT_SEPARATOR)
+        meta = arg_field.meta
+        if len(values) == 1 and values[0] in parser._default_data_classes_to_set_after_next_run:
+            values = values[0]
+            defaults = parser._default_data_classes_to_set_after_next_run[values]
+            del parser._default_data_classes_to_set_after_next_run[values]
+            if defaults.value:
+                dc_types = [v.__class__ for v in defaults.value]
+                defaults = defaults.value
+            else:
+                dc_types = []
+                defaults = []
+        else:
+            dc_types = []
+            choices = {}
+            if arg_field is not None and meta.get("choices", None) is not None:
+                choices = choices_by_name(tuple(meta["choices"]))
+            for i, value in enumerate(values):
+                if value in choices:
+                    sub_dc_type = choices[value]
                 else:
-                    # Parse values
-                    dict_values = {}
-                    defaults = {}
-                    for value in values:
-                        if "=" not in value:
-                            k, v = value, field.dict_type
+                    try:
+                        sub_dc_type = resolve_class(value)
+                    except ValueError as e:
+                        if len(choices) > 0:
+                            raise ValueError(
+                                f"Invalid class name {value}. Must either be 'module_path:class_name' "
+                                f"or in {set(choices.keys())}"
+                            ) from e
                         else:
-                            k, v = value.split("=")
-                            module, class_name = v.split(":")
-                            v = getattr(importlib.import_module(module), class_name)
+                            raise ValueError(
+                                f"Invalid class name {value}. Must be 'module_path:class_name' since no "
+                                f"choices (metadata=pai_meta(choices=[...])) are defined."
+                            ) from e
+
+                    if not meta.get("disable_subclass_check", False) and not issubclass(sub_dc_type, arg_field.type):
+                        raise TypeError(
+                            f"Data class {sub_dc_type} must inherit {arg_field.type} to allow usage as "
+                            f"replacement. But parents are {sub_dc_type.__mro__}"
+                        )
+                dc_types.append(sub_dc_type)
+            defaults = [None] * len(dc_types)
+
+        for i, (dc_type, default) in enumerate(zip(dc_types, defaults)):
+            root_dcs = pai_node.dcs
+            root_dcs[str(i)] = PAINodeDataClass(
+                name=str(i),
+                arg_name=f"{prefix}{param_name}{sep}",
+                parsed_type=dc_type,
+                default_value=default,
+                value=None,
+            )
+            add_dataclass_field(
+                parser,
+                root_dcs[str(i)],
+                f"{prefix}{param_name}{sep}",
+                root_dcs[str(i)].dcs,
+                values=None,
+                dc_type=dc_type,
+                ignore=ignore,
+            )
 
-                        defaults[k] = None
-                        dict_values[k] = v
+        setattr(args, self.dest, " ".join(pai_node.dcs[str(i)].value for i, _ in enumerate(dc_types)))
 
-                        if not field.meta.get("disable_subclass_check", False) and not issubclass(v, field.dict_type):
-                            raise TypeError(
-                                f"Data class {v} must inherit {field.dict_type} to allow usage as "
-                                f"replacement. But parents are {v.__mro__}"
-                            )
 
-                # Add new root args for this argument in the params tree,
-                # this is basically another 'dataclass' (key to value mapping)
-                # However, to not register as dataclass to the arguments (since it already exists = self)
-                pai_node.dcs[arg.name] = PAINodeDataClass(
-                    name=arg.name,
-                    arg_name=f"{arg.arg_name}{sep}",
-                    parsed_type=dict,
-                    default_value=MISSING,
-                    value=MISSING,
-                )
-                root_dcs = pai_node.dcs[arg.name].dcs
-
-                for k, v in dict_values.items():
-                    # Add the sub data classes (key k) and add them as parameters (p1, ..., pn)
-                    # ...root.k.p1 = ...
-                    # ...root.k.p2 = ...
-                    dc_type = v
-                    root_dcs[k] = PAINodeDataClass(
-                        name=k,
-                        arg_name=f"{arg.arg_name}{sep}",
-                        parsed_type=dc_type,
-                        default_value=defaults[k],
-                        value=None,
-                    )
-                    add_dataclass_field(
-                        parser,
-                        root_dcs[k],
-                        f"{arg.arg_name}{sep}",
-                        root_dcs[k].dcs,
-                        values=None,
-                        dc_type=dc_type,
-                        ignore=ignore,
-                    )
+class DataClassAction(DataClassSelectionAction):
+    """Select the dataclass of a field"""
 
-        return DictParserDataclassAction
-    elif field.dict_type:
+    def __init__(self, option_strings, dest, prefix: str, **kwargs):
+        super().__init__(option_strings, dest, **kwargs)
+        self.prefix = prefix
 
-        class DictParserAction(Action):
-            def __call__(self, parser: PAIDataClassArgumentParser, args, values, option_string=None):
-                # Handle as normal parameter, but split key value pairs at '='
-                arg.value = {}
-                for value in values:
-                    k, v = value.split("=")
-                    k = field.type(k)
-                    v = field.dict_type(v)
-                    arg.value[k] = v
+    def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
+        arg_field, pai_node, prefix, ignore = self.argument_field, self.pai_node, self.prefix, self.ignore
+        add_dataclass_field(parser, pai_node, prefix, pai_node.dcs, values, arg_field=arg_field, ignore=ignore)
+        setattr(args, self.dest, pai_node.value)
 
-                setattr(args, self.dest, arg.value)
 
-        return DictParserAction
+def generate_field_action(pai_node: PAINodeDataClass, arg: PAINode, field: ArgumentField, ignore: List[str]):
+    if field.dict_type and field.dataclass:
+        # if the value type is again a dataclass, handle this differently
+        # The values of the key/value pairs are the type of the dataclass
+        # Create an action that adds new sub files based on the key to allow to set the parameters hierarchically
+        return partial(
+            DictParserDataclassAction,
+            argument_field=field,
+            base_type=field.dict_type,
+            pai_node=pai_node,
+            param_node=arg,
+            ignore=ignore,
+        )
+    elif field.dict_type:
+        return partial(DictParserAction, owner_node=pai_node, param_node=arg, argument_field=field)
     else:
+        return partial(FieldSetterAction, owner_node=pai_node, param_node=arg, argument_field=field)
 
-        class FieldSetterAction(Action):
-            def __call__(self, parser, args, values, option_string=None):
-                if field.optional:
-                    if is_none(values):
-                        arg.value = None
-                        setattr(args, self.dest, None)
-                        return
-
-                is_str_type = field.enum or field.dict_type or field.type == bool or field.type == str
-
-                if field.type == bool:
-                    if isinstance(values, list):
-                        values = list(map(str_to_bool, values))
-                    else:
-                        values = str_to_bool(values)
-                # Simple field, but handle enumerations separately
-                if field.list:
-                    if field.enum:
-                        arg.value = field.list([str_to_enum(v, field.enum, field.type) for v in values])
-                    else:
-                        if not is_str_type:
-                            values = map(field.type, values)
-                        arg.value = field.list(values)
-                else:
-                    if field.enum:
-                        arg.value = str_to_enum(values, field.enum, field.type)
-                    else:
-                        if not is_str_type:
-                            values = field.type(values)
-                        arg.value = values
 
-                setattr(args, self.dest, arg.value)
+def default_of_field(pai_node: PAINodeDataClass, arg: ArgumentField) -> Any:
+    """The default of a field is the value in the default of its parent, or (if not available) the field's default.
 
-        return FieldSetterAction
+    Note that the default of the field is only created if required since calling its factory might be expensive.
+    """
+    if hasattr(pai_node.default_value, arg.name):
+        return getattr(pai_node.default_value, arg.name)
+    return arg.default
 
 
 def add_dataclass_field(
@@ -199,9 +402,7 @@ def add_dataclass_field(
     meta = arg_field.meta if arg_field and arg_field.meta else {}
     data_class_choices = None
     if meta.get("choices", None) is not None:
-        data_class_choices = list(
-            filter(lambda x: x, sum([parser.alt_names_of_choice(cls) for cls in arg_field.meta["choices"]], []))
-        )
+        data_class_choices = choices_by_name(tuple(meta["choices"]))
 
     # Add new args for this argument
     if dc_type is None:
@@ -221,16 +422,12 @@ def add_dataclass_field(
                 else:
                     return  # Optional field, with default None
         else:
-            choices = {}
-            if arg_field is not None and meta.get("choices", None) is not None:
-                for choice in meta["choices"]:
-                    for name in parser.alt_names_of_choice(choice):
-                        choices[name] = choice
+            choices = data_class_choices if arg_field is not None and data_class_choices is not None else {}
             if values in choices:
                 dc_type = choices[values]
             else:
                 try:
-                    module, class_name = values.split(":")
+                    dc_type = resolve_class(values)
                 except ValueError:
                     if choices:
                         raise ValueError(
@@ -241,7 +438,6 @@ def add_dataclass_field(
                         f"As developer set pai_meta(tuple_like=True) if you want this field to behave "
                         f"similar to a tuple."
                     )
-                dc_type = getattr(importlib.import_module(module), class_name)
 
         if not is_dataclass(dc_type):
             raise TypeError(
@@ -283,7 +479,7 @@ def add_dataclass_field(
                 name=arg.name,
                 arg_name=full_arg_name,
                 parsed_type=arg.list if arg.list else arg.type,
-                default_value=getattr(pai_node.default_value, arg.name, arg.default),
+                default_value=default_of_field(pai_node, arg),
                 value=MISSING,
             )
             parser.add_dc_argument(
@@ -305,20 +501,20 @@ def add_dataclass_field(
                 choices = arg.meta.get("choices")
             if choices is not None:
                 choices = list(map(str, choices))  # always string
-            parser.add_argument(
+            parser._register_option(
                 f"--{full_arg_name}",
+                generate_field_action(pai_node, root_params[arg.name], arg, ignore=ignore),
                 default=None if isinstance(arg.default, MISSING.__class__) else arg.default,
                 help=arg.meta.get("help", "Missing help string"),
                 type=str,  # always str, parse type in actual handler
                 choices=choices,
-                action=generate_field_action(pai_node, root_params[arg.name], arg, ignore=ignore),
                 nargs=arg.meta.get("nargs", "*") if arg.list or arg.dict_type else None,
             )
 
             if arg.dict_type and arg.dataclass:
                 default = DefaultArg(
                     dict,
-                    getattr(pai_node.default_value, arg.name, arg.default),
+                    default_of_field(pai_node, arg),
                     full_arg_name,
                 )
                 parser._default_data_classes_to_set_after_next_run[default_dict_key_value(default)] = default
@@ -331,13 +527,32 @@ class DefaultArg(NamedTuple):
     override_missing: bool = False
 
 
+def _num_nodes(node: PAINodeDataClass) -> int:
+    """The number of dataclass nodes below node"""
+    return sum(1 + _num_nodes(v) for v in node.dcs.values())
+
+
+class _OptionGroup(NamedTuple):
+    index: int  # position of the option string in the args
+    arg_string: str  # the option string, possibly with an explicit arg, e.g. "--arg.p=1"
+    option_string: str  # the option string without explicit arg, e.g. "--arg.p"
+    explicit_arg: Optional[str]  # the explicit arg, e.g. "1", None if not set
+    values: List[str]  # the args following the option string
+
+
 class PAIDataClassArgumentParser(ArgumentParser):
     """
     Argument parser based on hierarchical dataclasses
     """
 
     def __init__(
-        self, formatter_class=ArgumentDefaultsHelpFormatter, ignore_required=False, add_help=True, *args, **kwargs
+        self,
+        formatter_class=PAIHelpFormatter,
+        ignore_required=False,
+        add_help=True,
+        schema_cache_dir: Optional[str] = None,
+        *args,
+        **kwargs,
     ):
         super(PAIDataClassArgumentParser, self).__init__(
             formatter_class=formatter_class, add_help=False, *args, **kwargs
@@ -349,12 +564,19 @@ class PAIDataClassArgumentParser(ArgumentParser):
             parsed_type=None, default_value=MISSING, name="", arg_name="", value=None
         )  # Root
         self.ignore_required = ignore_required
+        self._num_parse_passes = 0  # number of passes required by the last call of parse_known_args
+        self._schema_cache = SchemaCache(schema_cache_dir) if schema_cache_dir else None
+        self._root_arguments = []  # arguments of all calls of add_root_argument, part of the key of the schema cache
+        self._node_parents: Optional[Dict[int, Optional[PAINodeDataClass]]] = None  # see reparse
 
     def _tree_to_data_class(self, node: PAINodeDataClass):
         for k, v in node.dcs.items():
             node.dcs[k].value = self._tree_to_data_class(v)
 
-        # construct actual dataclass
+        return self._instantiate(node)
+
+    def _instantiate(self, node: PAINodeDataClass):
+        """Construct the dataclass of a node whose sub dataclasses (`node.dcs`) are already constructed"""
         param_values = node.all_param_values()
         if node.value is None or (node.value == MISSING and node.default_value is None):
             # User set to None and None by default
@@ -365,8 +587,8 @@ class PAIDataClassArgumentParser(ArgumentParser):
             if issubclass(node.parsed_type, node.default_value.__class__):
                 # set defaults, but only if we are sure that the types are compatible
                 if node.parsed_type not in {set, list, tuple}:
-                    for arg in extract_args_of_dataclass(node.default_value.__class__, exclude_ignored=False):
-                        name = arg.name
+                    for field in type_plan(node.default_value.__class__).dataclass_fields:
+                        name = field.name
                         if name in param_values:
                             # already set from cmd
                             continue
@@ -381,10 +603,11 @@ class PAIDataClassArgumentParser(ArgumentParser):
             return param_values
         else:
             # Check for missing required fields (these MUST ALWAYS be set, cause they have no default value in init)
+            argument_fields = type_plan(node.parsed_type).argument_fields
             missing_required = [
                 f"--{node.params[field.name].arg_name}"
-                for field in extract_args_of_dataclass(node.parsed_type)
-                if field.name not in param_values and field.required
+                for field in argument_fields
+                if field.name not in param_values and is_field_required(field)
             ]
             if len(missing_required) > 0:
                 raise RequiredArgumentError(
@@ -395,8 +618,8 @@ class PAIDataClassArgumentParser(ArgumentParser):
             if not self.ignore_required:
                 missing_meta_required = [
                     f"--{node.params[field.name].arg_name}"
-                    for field in extract_args_of_dataclass(node.parsed_type)
-                    if field.name not in param_values and field.meta and field.meta.get("required")
+                    for field in argument_fields
+                    if field.name not in param_values and field.metadata.get("required")
                 ]
                 if len(missing_meta_required) > 0:
                     raise RequiredArgumentError(
@@ -408,16 +631,28 @@ class PAIDataClassArgumentParser(ArgumentParser):
 
         return dc
 
+    @staticmethod
+    def check_root_type(dc_type: Any):
+        if not isinstance(dc_type, type):
+            raise TypeError(
+                "Not passing a type to dc_type. If you want to pass default values, use the default argument."
+            )
+
     def add_root_argument(
         self, param_name: str, dc_type: Any, default: Any = MISSING, ignore: List[str] = None, flat=False
     ):
         if ignore is None:
             ignore = []
 
-        if not isinstance(dc_type, type):
-            raise TypeError(
-                "Not passing a type to dc_type. If you want to pass default values, use the default argument."
-            )
+        self.check_root_type(dc_type)
+        if self._schema_cache is not None:
+            try:
+                default_hash = hashlib.sha256(dumps(default)).hexdigest()
+            except Exception:
+                # The default can not be pickled, thus the tree can not be cached
+                self._schema_cache = None
+            else:
+                self._root_arguments.append((param_name, type_to_str(dc_type), default_hash, tuple(ignore), flat))
         self._params_tree.dcs[param_name] = PAINodeDataClass(
             name=param_name,
             arg_name=param_name,
@@ -479,106 +714,9 @@ class PAIDataClassArgumentParser(ArgumentParser):
     ):
         param_name = arg_field.name
         dc_type = arg_field.type
-        sep = arg_field.meta.get("separator", DEFAULT_SEPARATOR)
         nargs = arg_field.meta.get("nargs", "*")
         pai_node = parent[param_name]
 
-        class DataClassAsTupleAction(Action):
-            def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
-                fields = extract_args_of_dataclass(dc_type)
-                if len(values) > len(pai_node.params):
-                    raise ValueError(
-                        f"Got {len(values)} arguments but only {len(fields)} are available. \n"
-                        f"  Available: {[t.name for t in fields]}\n"
-                        f"     Parsed: {values}"
-                    )
-                for src, t in zip(values, fields):
-                    is_str_type = t.enum or t.dict_type or t.type == bool or t.type == str
-                    target = pai_node.params[t.name]
-                    if t.optional and is_none(src):
-                        target.value = None
-                    elif t.enum:
-                        target.value = str_to_enum(src, t.enum, t.type)
-                    else:
-                        if not is_str_type:
-                            src = t.type(src)
-                        target.value = src
-
-        class ListDataClassAction(Action):
-            def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
-                meta = arg_field.meta
-                if len(values) == 1 and values[0] in parser._default_data_classes_to_set_after_next_run:
-                    values = values[0]
-                    defaults = parser._default_data_classes_to_set_after_next_run[values]
-                    del parser._default_data_classes_to_set_after_next_run[values]
-                    if defaults.value:
-                        dc_types = [v.__class__ for v in defaults.value]
-                        defaults = defaults.value
-                    else:
-                        dc_types = []
-                        defaults = []
-                else:
-                    dc_types = []
-                    for i, value in enumerate(values):
-                        choices = {}
-                        if arg_field is not None and meta.get("choices", None) is not None:
-                            for choice in meta["choices"]:
-                                for name in parser.alt_names_of_choice(choice):
-                                    choices[name] = choice
-                        if value in choices:
-                            sub_dc_type = choices[value]
-                        else:
-                            try:
-                                module, class_name = value.split(":")
-                            except ValueError as e:
-                                if len(choices) > 0:
-                                    raise ValueError(
-                                        f"Invalid class name {value}. Must either be 'module_path:class_name' "
-                                        f"or in {set(choices.keys())}"
-                                    ) from e
-                                else:
-                                    raise ValueError(
-                                        f"Invalid class name {value}. Must be 'module_path:class_name' since no "
-                                        f"choices (metadata=pai_meta(choices=[...])) are defined."
-                                    ) from e
-
-                            sub_dc_type = getattr(importlib.import_module(module), class_name)
-                            if not meta.get("disable_subclass_check", False) and not issubclass(
-                                sub_dc_type, arg_field.type
-                            ):
-                                raise TypeError(
-                                    f"Data class {sub_dc_type} must inherit {arg_field.type} to allow usage as "
-                                    f"replacement. But parents are {sub_dc_type.__mro__}"
-                                )
-                        dc_types.append(sub_dc_type)
-                    defaults = [None] * len(dc_types)
-
-                for i, (dc_type, default) in enumerate(zip(dc_types, defaults)):
-                    root_dcs = pai_node.dcs
-                    root_dcs[str(i)] = PAINodeDataClass(
-                        name=str(i),
-                        arg_name=f"{prefix}{param_name}{sep}",
-                        parsed_type=dc_type,
-                        default_value=default,
-                        value=None,
-                    )
-                    add_dataclass_field(
-                        parser,
-                        root_dcs[str(i)],
-                        f"{prefix}{param_name}{sep}",
-                        root_dcs[str(i)].dcs,
-                        values=None,
-                        dc_type=dc_type,
-                        ignore=ignore,
-                    )
-
-                setattr(args, self.dest, " ".join(pai_node.dcs[str(i)].value for i, _ in enumerate(dc_types)))
-
-        class DataClassAction(Action):
-            def __call__(self, parser: "PAIDataClassArgumentParser", args, values, option_string=None):
-                add_dataclass_field(parser, pai_node, prefix, root, values, arg_field=arg_field, ignore=ignore)
-                setattr(args, self.dest, pai_node.value)
-
         flag = f"{prefix}{param_name}"
         if any(flag.startswith(ignore_prefixes) for ignore_prefixes in ignore):
             return
@@ -591,14 +729,6 @@ class PAIDataClassArgumentParser(ArgumentParser):
         )
         self._default_data_classes_to_set_after_next_run[default_dict_key_value(default)] = default
 
-        def make_action():
-            if arg_field.list:
-                return ListDataClassAction, nargs
-            elif arg_field.dict_type:
-                raise NotImplementedError
-            else:
-                return DataClassAction, None
-
         if arg_field.meta.get("fix_dc", False):
             # if the dataclass is fixed, just add it right away,
             # add the option to set as tuple instead
@@ -608,53 +738,393 @@ class PAIDataClassArgumentParser(ArgumentParser):
                 self, pai_node, prefix, root, default_dict_key_value(default), arg_field=arg_field, ignore=ignore
             )
             if arg_field.meta.get("tuple_like", False):
-                self.add_argument("--" + flag, action=DataClassAsTupleAction, nargs="*", type=str)
+                self._register_option(
+                    "--" + flag,
+                    partial(DataClassAsTupleAction, dc_type=dc_type, pai_node=pai_node),
+                    nargs="*",
+                    type=str,
+                )
+        elif arg_field.dict_type:
+            raise NotImplementedError
         else:
-            action, nargs = make_action()
-            self.add_argument(
+            action = partial(
+                ListDataClassAction if arg_field.list else DataClassAction,
+                argument_field=arg_field,
+                base_type=dc_type,
+                pai_node=pai_node,
+                ignore=ignore,
+                prefix=prefix,
+            )
+            self._register_option(
                 "--" + flag,
-                action=action,
+                action,
                 type=str,
-                nargs=nargs,
+                nargs=nargs if arg_field.list else None,
             )
 
+    def reparse(self, namespace: Namespace, args: List[str]) -> Optional[Namespace]:
+        """Apply args that only set values of fields (e.g. `--root.sub.p 1`) to the result of the last parse.
+
+        Only the dataclasses that contain a changed field and their parents are constructed again, all other
+        dataclasses of `namespace` are reused. The tree of this parser is unchanged, so that the result of the last
+        parse can be reparsed any number of times. The result is the same as parsing the previous args followed by
+        `args`. Returns None if this is not possible incrementally, i.e. if `args` select dataclasses, or contain
+        positional or unknown args.
+        """
+        results = self.sweep(namespace, [[args]])
+        return None if results is None else next(results)
+
+    def sweep(self, namespace: Namespace, dimensions: List[List[List[str]]]) -> Optional[Iterator[Namespace]]:
+        """Lazily reparse the result of the last parse with all combinations of the alternative args of each dimension.
+
+        E.g. `[[["--a.p", "1"], ["--a.p", "2"]], [["--b.q", "x"], ["--b.q", "y"]]]` yields the four combinations. As
+        in `reparse`, the alternatives must only set values of fields. A dataclass is constructed once per
+        combination of the dimensions it depends on and shared by all results, dataclasses that do not depend on any
+        dimension are reused from `namespace`. Returns None if this is not possible incrementally.
+        """
+        dim_actions = []
+        for alternatives in dimensions:
+            alt_actions = [self._field_value_actions(args) for args in alternatives]
+            if any(actions is None for actions in alt_actions):
+                return None
+            dim_actions.append(alt_actions)
+
+        if self._node_parents is None:
+            self._node_parents = {}
+            self._collect_node_parents(self._params_tree)
+
+        # ids of the nodes that must be constructed again -> the dimensions that they depend on
+        node_dims: Dict[int, List[int]] = {}
+        for dim, alt_actions in enumerate(dim_actions):
+            for actions in alt_actions:
+                for group, action in actions:
+                    node = action.owner_node
+                    while node is not None and dim not in node_dims.setdefault(id(node), []):
+                        node_dims[id(node)].append(dim)
+                        node = self._node_parents[id(node)]
+
+        return self._sweep(namespace, dim_actions, node_dims)
+
+    def _sweep(self, namespace: Namespace, dim_actions, node_dims: Dict[int, List[int]]) -> Iterator[Namespace]:
+        # (node id, indices of the alternatives of its dimensions) -> constructed dataclass
+        shared: Dict[Tuple[int, Tuple[int, ...]], Any] = {}
+        for indices in itertools.product(*[range(len(alt_actions)) for alt_actions in dim_actions]):
+            result = Namespace(**vars(namespace))
+            undo: List[Tuple[PAINode, Any]] = []  # (node, value) to restore the tree
+            try:
+                for alt_actions, index in zip(dim_actions, indices):
+                    for group, action in alt_actions[index]:
+                        undo.append((action.param_node, action.param_node.value))
+                        try:
+                            self._consume_option_group(
+                                result, action, group.option_string, group.explicit_arg, group.values
+                            )
+                        except ArgumentError as err:
+                            if not getattr(self, "exit_on_error", True):
+                                raise
+                            self.error(str(err))
+
+                for name, v in self._params_tree.dcs.items():
+                    if id(v) in node_dims:
+                        setattr(result, name, self._reconstruct_shared(v, node_dims, indices, shared, undo))
+            finally:
+                for node, value in reversed(undo):
+                    node.value = value
+
+            yield result
+
+    def _field_value_actions(self, args: List[str]) -> Optional[List[Tuple["_OptionGroup", FieldValueAction]]]:
+        """The actions of args that only set values of fields, None if args contain any other (or unknown) arg"""
+        groups, extras = self._split_option_groups(list(args))
+        if extras:
+            return None
+        actions = []
+        for group in groups:
+            action = self._option_string_actions.get(group.option_string)
+            if not isinstance(action, FieldValueAction):
+                return None
+            if group.explicit_arg is None:
+                try:
+                    if self._match_argument(action, "A" * len(group.values)) != len(group.values):
+                        return None  # some values are positionals
+                except ArgumentError:
+                    return None  # let the full parse report the error
+            actions.append((group, action))
+        return actions
+
+    def _collect_node_parents(self, node: PAINodeDataClass):
+        for v in node.dcs.values():
+            # the root arguments have no parent dataclass
+            self._node_parents[id(v)] = node if node is not self._params_tree else None
+            self._collect_node_parents(v)
+
+    def _reconstruct_shared(self, node: PAINodeDataClass, node_dims, indices, shared, undo):
+        """Construct the dataclass of a node again unless it was constructed for the same values of its dimensions.
+
+        The sub dataclasses that do not depend on any dimension are reused.
+        """
+        dims = node_dims[id(node)]
+        key = (id(node), tuple(indices[dim] for dim in dims))
+        if key in shared:
+            return shared[key]
+
+        for v in node.dcs.values():
+            if id(v) in node_dims:
+                undo.append((v, v.value))
+                v.value = self._reconstruct_shared(v, node_dims, indices, shared, undo)
+        value = self._instantiate(node)
+        if len(dims) < len(indices):
+            # nodes that depend on all dimensions are unique for each result
+            shared[key] = value
+        return value
+
     def parse_known_args(self, args=None, namespace=None):
         args = sys.argv[1:] if args is None else list(args)
         if namespace is None:
             namespace = Namespace()
 
-        orig_args = args[:]
-        prev_args = args
-        while len(args) > 0 or len(self._default_data_classes_to_set_after_next_run) > 0:
-            for k, v in list(self._default_data_classes_to_set_after_next_run.items()):
-                v: DefaultArg = v
-                # Check if the parameter is set from the cmd line, then ignore it
-                # Not that a parameter might also be set by --dataclass=ClassName, so split at '=' and match the first
-                # arg.
-                if f"--{k}" not in [a.split("=")[0] for a in orig_args]:
-                    # Not found in args, set it to default by adding it as a arg
-                    args += ["--" + k, default_dict_key_value(v)]
-                else:
+        cache_key, cache_entry = None, None
+        if self._schema_cache is not None:
+            cache_key = SchemaCache.key([self.prefix_chars, self.allow_abbrev, *self._root_arguments])
+            with instrumentation.phase("schema_cache"):
+                cache_entry = self._schema_cache.load(cache_key)
+            if cache_entry is not None and not self._restore_schema(cache_entry, args):
+                cache_entry = None
+
+        if cache_entry is not None:
+            # The tree is expanded with the default dataclasses, only set the values of the fields
+            for dest, value in cache_entry.option_values.items():
+                setattr(namespace, dest, value)
+        elif cache_key is not None:
+            # Expand the tree with the default dataclasses (i.e. without args) for the next calls
+            # MISSING is compared by identity, so it must not be copied
+            replica, replica_namespace = copy.deepcopy(self, {id(MISSING): MISSING}), Namespace()
+            try:
+                replica._parse_dataclass_args([], replica_namespace)
+            except Exception:
+                # e.g. an invalid default, the error is reported by parsing the args below
+                pass
+            else:
+                entry = SchemaCacheEntry(replica._params_tree, vars(replica_namespace), list(replica._actions))
+                self._schema_cache.store(cache_key, entry)
+
+        try:
+            with instrumentation.phase("expand"):
+                args = self._parse_dataclass_args(args, namespace)
+        except ArgumentError as err:
+            if not getattr(self, "exit_on_error", True):
+                raise
+            self.error(str(err))
+
+        with instrumentation.phase("instantiate"):
+            for name, v in self._params_tree.dcs.items():
+                setattr(namespace, name, self._tree_to_data_class(v))
+
+        if instrumentation.is_active():
+            instrumentation.count("parse_passes", self._num_parse_passes)
+            instrumentation.count("actions", len(self._actions))
+            instrumentation.count("nodes", _num_nodes(self._params_tree))
+        return namespace, args
+
+    def _restore_schema(self, entry: SchemaCacheEntry, args: List[str]) -> bool:
+        """Replace the tree and the actions by the expanded ones of the schema cache.
+
+        This is only possible if `args` do not select any dataclass (or set a field of a dataclass that is not
+        selected by default, which is unknown in both cases). Returns False (and keeps the parser unchanged) otherwise.
+        """
+        actions = list(self._actions)
+        self._reset_actions(entry.actions)
+        groups, _ = self._split_option_groups(args)
+        for group in groups:
+            action = self._option_string_actions.get(group.option_string)
+            if action is None:
+                # an abbreviation might select a dataclass
+                applicable = not (
+                    self.allow_abbrev
+                    and group.option_string.startswith(self.prefix_chars[0] * 2)
+                    and self._get_option_tuples(group.option_string)
+                )
+            else:
+                applicable = isinstance(action, FieldValueAction)
+            if not applicable:
+                self._reset_actions(actions)
+                return False
+
+        self._params_tree = entry.params_tree
+        self._default_data_classes_to_set_after_next_run.clear()
+        return True
+
+    def _reset_actions(self, actions: List[Action]):
+        """Replace all registered actions (the containers and the groups share the registry)"""
+        self._actions.clear()
+        self._option_string_actions.clear()
+        self._has_negative_number_optionals.clear()
+        for group in self._action_groups:
+            group._group_actions.clear()
+        for action in actions:
+            self._add_action(action)
+
+    def _parse_dataclass_args(self, args: List[str], namespace: Namespace) -> List[str]:
+        """Walk the dataclass tree once and consume every token of `args` at most once.
+
+        The args are split into groups of an option string and its following values. The groups are dispatched in
+        passes: each pass calls the actions of all groups whose option is registered (in the order of `args`) and
+        afterwards selects the defaults of the dataclasses that are not set in `args`. Since selecting a dataclass
+        registers the options of its fields, the number of passes is bounded by the nesting depth.
+
+        Returns the unknown args in their original order.
+        """
+        groups, extras = self._split_option_groups(args)
+        # Dispatch index of the groups that are not matched to an action yet, keyed by their option string
+        waiting_groups: Dict[str, List[_OptionGroup]] = {}
+        for group in groups:
+            waiting_groups.setdefault(group.option_string, []).append(group)
+        # Note that a parameter might also be set by --dataclass=ClassName, so split at '='
+        flags_in_args = {a.split("=")[0] for a in args}
+
+        self._num_parse_passes = 0
+        num_registered_actions = 0
+        while True:
+            # Match the waiting groups to all actions that were registered in the previous pass
+            matched_groups = []
+            for action in self._actions[num_registered_actions:]:
+                if (
+                    action.dest is not SUPPRESS
+                    and action.default is not SUPPRESS
+                    and not hasattr(namespace, action.dest)
+                ):
+                    setattr(namespace, action.dest, action.default)
+                for option_string in action.option_strings:
+                    for group in waiting_groups.pop(option_string, []):
+                        matched_groups.append((group, action, option_string))
+            num_registered_actions = len(self._actions)
+            if self.allow_abbrev:
+                matched_groups += self._match_abbreviations(waiting_groups)
+            matched_groups.sort(key=lambda x: x[0].index)
+
+            defaults = list(self._default_data_classes_to_set_after_next_run.items())
+            if len(matched_groups) == 0 and len(defaults) == 0:
+                break
+
+            progress = len(matched_groups) > 0
+            for group, action, option_string in matched_groups:
+                n_unused = self._consume_option_group(
+                    namespace, action, option_string, group.explicit_arg, group.values
+                )
+                end = group.index + len(group.values) + 1
+                extras.extend(zip(range(end - n_unused, end), group.values[len(group.values) - n_unused :]))
+
+            for k, v in defaults:
+                if k not in self._default_data_classes_to_set_after_next_run:
+                    # already consumed by an action of this pass
+                    continue
+                if f"--{k}" in flags_in_args:
                     # Found in args, do not set
                     del self._default_data_classes_to_set_after_next_run[k]
-            namespace, args = super(PAIDataClassArgumentParser, self).parse_known_args(args, namespace)
-            if args == prev_args:
-                # No changes, stop parsing
+                    progress = True
+                    continue
+
+                # Not found in args, set it to default by calling its action
+                action = self._option_string_actions.get(f"--{k}")
+                if action is None:
+                    continue
+                self._consume_option_group(namespace, action, f"--{k}", None, [default_dict_key_value(v)])
+                progress = True
+
+            if not progress:
                 break
-            prev_args = args
-
-            # If help string is set, break, but only if nothing is left to process
-            if (
-                len(args) > 0
-                and args[0] in {"-h", "--help"}
-                and len(self._default_data_classes_to_set_after_next_run) == 0
-            ):
+            self._num_parse_passes += 1
+
+        for flag_groups in waiting_groups.values():
+            for group in flag_groups:
+                extras.append((group.index, group.arg_string))
+                extras.extend(zip(range(group.index + 1, group.index + len(group.values) + 1), group.values))
+
+        return [arg_string for _, arg_string in sorted(extras, key=lambda x: x[0])]
+
+    def _split_option_groups(self, args: List[str]) -> Tuple[List["_OptionGroup"], List[Tuple[int, str]]]:
+        """Split args into option strings and their following values.
+
+        Returns the groups and the (index, arg) pairs that do not belong to any option (e.g. positionals)
+        """
+        groups: List[_OptionGroup] = []
+        extras: List[Tuple[int, str]] = []
+        for i, arg_string in enumerate(args):
+            if arg_string == "--":
+                # all following args are positionals which are not handled by this parser
+                extras.extend(enumerate(args[i:], start=i))
                 break
+            elif self._is_option_string(arg_string):
+                if "=" in arg_string and arg_string not in self._option_string_actions:
+                    option_string, explicit_arg = arg_string.split("=", 1)
+                else:
+                    option_string, explicit_arg = arg_string, None
+                groups.append(_OptionGroup(i, arg_string, option_string, explicit_arg, []))
+            elif groups and groups[-1].index + len(groups[-1].values) + 1 == i:
+                groups[-1].values.append(arg_string)
+            else:
+                extras.append((i, arg_string))
+
+        return groups, extras
+
+    def _is_option_string(self, arg_string: str) -> bool:
+        """Check if arg_string is an option (compare ArgumentParser._parse_optional)"""
+        if len(arg_string) < 2 or arg_string[0] not in self.prefix_chars:
+            return False
+        if arg_string in self._option_string_actions:
+            return True
+        if self._negative_number_matcher.match(arg_string) and not self._has_negative_number_optionals:
+            return False
+        return " " not in arg_string.split("=")[0]
+
+    def _match_abbreviations(self, waiting_groups: Dict[str, List["_OptionGroup"]]):
+        """Match waiting groups to actions by unique prefixes of the option strings (if allow_abbrev is set).
+
+        This scans all registered option strings, the dispatch of exact option strings does not call this.
+        """
+        matched_groups = []
+        for option_prefix in list(waiting_groups.keys()):
+            if not option_prefix.startswith(self.prefix_chars[0] * 2):
+                continue
+            option_tuples = self._get_option_tuples(option_prefix)
+            if len(option_tuples) > 1:
+                options = ", ".join(option_tuple[1] for option_tuple in option_tuples)
+                self.error(f"ambiguous option: {option_prefix} could match {options}")
+            elif len(option_tuples) == 1:
+                action, option_string = option_tuples[0][:2]
+                matched_groups += [(group, action, option_string) for group in waiting_groups.pop(option_prefix)]
+
+        return matched_groups
+
+    def _register_option(self, option_string: str, action_cls: Type[Action], **kwargs) -> Action:
+        """Fast path of `add_argument` for the generated options of the dataclass fields.
+
+        Skips the generic checks of `add_argument` (e.g., constructing a help formatter to verify the metavar), since
+        the generated options are valid by construction. Conflicting option strings are still detected.
+        """
+        dest = option_string.lstrip(self.prefix_chars).replace("-", "_")
+        if "default" not in kwargs:
+            kwargs["default"] = self._defaults.get(dest, self.argument_default)
+        action = action_cls(option_strings=[option_string], dest=dest, **kwargs)
+        return self._add_action(action)
+
+    def _consume_option_group(self, namespace, action, option_string, explicit_arg, values: List[str]) -> int:
+        """Call the action with its values (compare consume_optional in ArgumentParser._parse_known_args).
+
+        Returns the number of values at the end of `values` that were not consumed.
+        """
+        if explicit_arg is not None:
+            if self._match_argument(action, "A") != 1:
+                raise ArgumentError(action, f"ignored explicit argument {explicit_arg!r}")
+            arg_strings = [explicit_arg]
+            n_unused = len(values)
+        else:
+            arg_count = self._match_argument(action, "A" * len(values))
+            arg_strings = values[:arg_count]
+            n_unused = len(values) - arg_count
 
-        for name, v in self._params_tree.dcs.items():
-            setattr(namespace, name, self._tree_to_data_class(v))
-
-        return namespace, args
+        action(self, namespace, self._get_values(action, arg_strings), option_string)
+        return n_unused
 
     def parse_args(self, args=None, namespace=None):
         args, argv = self.parse_known_args(args, namespace)
@@ -667,8 +1137,4 @@ class PAIDataClassArgumentParser(ArgumentParser):
         return args
 
     def alt_names_of_choice(self, choice) -> List[str]:
-        names = [choice.__name__]
-        if hasattr(choice, "__alt_name__") and choice.__alt_name__:
-            names.append(choice.__alt_name__)
-
-        return names
+        return names_of_class(choice)
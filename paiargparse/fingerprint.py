@@ -0,0 +1,187 @@
+"""Stable content fingerprints of (pai) dataclasses, e.g. to look up results by their config.
+
+The fingerprint is the sha256 digest of a canonical binary encoding of the config, which is streamed into the hash in
+a single pass over the fields (no json is created). Every value is encoded with a type tag and its length, so that
+different configs can not result in the same encoding:
+- dataclasses by their qualified name (as `__cls__`, also for sub classes) and the names and values of their fields
+- lists and tuples by their items, sets and dicts independent of their order
+- numbers, strings, enums, datetimes, ... by their canonical (text) representation
+
+The encoding does not depend on the process (e.g. the hash seed of strings) or the python version.
+Fields marked by `pai_meta(fingerprint=False)` (e.g. output paths) are skipped unless `exclude_marked=False`.
+"""
+import hashlib
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from paiargparse.class_registry import qualified_name
+from paiargparse.dataclass_extractor import type_plan
+
+# Size of the buffer that is passed to the hash at once
+_CHUNK_SIZE = 1 << 16
+
+
+def _encode_str(s: str) -> bytes:
+    data = s.encode("utf-8")
+    return b"%d:" % len(data) + data
+
+
+def _compile_fields(cls) -> Tuple[bytes, Tuple[Tuple[str, bytes], ...], Tuple[Tuple[str, bytes], ...]]:
+    """The encoded class name, and (name, encoded name) of all fields and of the fields that are not excluded"""
+    all_fields = tuple((f.name, _encode_str(f.name)) for f in type_plan(cls).fields)
+    included = tuple(
+        (f.name, _encode_str(f.name)) for f in type_plan(cls).fields if f.metadata.get("fingerprint", True)
+    )
+    return _encode_str(qualified_name(cls)), all_fields, included
+
+
+class _Encoder:
+    def __init__(self, hasher, exclude_marked: bool):
+        self.hasher = hasher
+        self.exclude_marked = exclude_marked
+        self.buffer = bytearray()
+        self.encoders = _encoders()
+        self.fields_of_class: Dict[type, Tuple[bytes, Tuple[Tuple[str, bytes], ...]]] = {}
+
+    def flush(self):
+        self.hasher.update(self.buffer)
+        self.buffer.clear()
+
+    def encode(self, value: Any, buffer: bytearray):
+        value_type = type(value)
+        # inline the most frequent types
+        if value_type is str:
+            data = value.encode("utf-8")
+            buffer += b"s%d:" % len(data)
+            buffer += data
+            return
+        elif value_type is int:
+            buffer += b"i%d;" % value
+            return
+
+        encode = self.encoders.get(value_type)
+        if encode is not None:
+            encode(self, value, buffer)
+        elif hasattr(value_type, "__dataclass_fields__"):
+            self.encode_dataclass(value, buffer)
+        elif isinstance(value, Enum):
+            buffer += b"e" + _encode_str(qualified_name(value_type))
+            self.encode(value.value, buffer)
+        else:
+            for base, encode in self.encoders.items():
+                if isinstance(value, base):
+                    encode(self, value, buffer)
+                    break
+            else:
+                if isinstance(value, Mapping):
+                    self.encode_mapping(value, buffer)
+                else:
+                    raise TypeError(f"Can not compute a fingerprint of {value!r} of type {value_type}")
+        if len(buffer) > _CHUNK_SIZE and buffer is self.buffer:
+            self.flush()
+
+    def encode_dataclass(self, value, buffer: bytearray):
+        value_type = type(value)
+        try:
+            cls_name, fields = self.fields_of_class[value_type]
+        except KeyError:
+            cls_name, all_fields, included = type_plan(value_type).derived("fingerprint_fields", _compile_fields)
+            fields = included if self.exclude_marked else all_fields
+            self.fields_of_class[value_type] = cls_name, fields
+        buffer += b"d" + cls_name + b"%d:" % len(fields)
+        for name, encoded_name in fields:
+            buffer += encoded_name
+            self.encode(getattr(value, name), buffer)
+
+    def encode_list(self, value, buffer: bytearray):
+        buffer += b"l%d:" % len(value)
+        for v in value:
+            self.encode(v, buffer)
+
+    def encode_unordered(self, items, buffer: bytearray):
+        # encode each item separately to sort them
+        encoded = []
+        for item in items:
+            item_buffer = bytearray()
+            self.encode(item, item_buffer)
+            encoded.append(bytes(item_buffer))
+        for item in sorted(encoded):
+            buffer += item
+
+    def encode_set(self, value, buffer: bytearray):
+        if all(type(v) is str for v in value):
+            # sort strings directly (tagged differently since the order differs from sorting their encodings)
+            buffer += b"U%d:" % len(value)
+            for v in sorted(value):
+                self.encode(v, buffer)
+        else:
+            buffer += b"S%d:" % len(value)
+            self.encode_unordered(value, buffer)
+
+    def encode_mapping(self, value, buffer: bytearray):
+        if all(type(k) is str for k in value.keys()):
+            # sort string keys directly (see encode_set)
+            buffer += b"M%d:" % len(value)
+            for k in sorted(value.keys()):
+                self.encode(k, buffer)
+                self.encode(value[k], buffer)
+        else:
+            buffer += b"m%d:" % len(value)
+            # (key, value) tuples
+            self.encode_unordered(value.items(), buffer)
+
+
+def _encode_text(tag: bytes) -> Callable[[_Encoder, Any, bytearray], None]:
+    def encode(encoder: _Encoder, value: Any, buffer: bytearray):
+        buffer += tag + _encode_str(value if type(value) is str else str(value))
+
+    return encode
+
+
+def _encode_bytes(encoder: _Encoder, value: bytes, buffer: bytearray):
+    buffer += b"b%d:" % len(value) + value
+
+
+def _encode_iso(encoder: _Encoder, value, buffer: bytearray):
+    buffer += b"t" + _encode_str(value.isoformat())
+
+
+@lru_cache(maxsize=1)
+def _encoders() -> Dict[type, Callable[[_Encoder, Any, bytearray], None]]:
+    """Encoders of the supported types (the modules of datetime, Decimal and UUID are imported on first use)"""
+    from datetime import date, datetime, time, timedelta
+    from decimal import Decimal
+    from uuid import UUID
+
+    return {
+        type(None): lambda encoder, value, buffer: buffer.extend(b"N"),
+        bool: lambda encoder, value, buffer: buffer.extend(b"T" if value else b"F"),
+        int: lambda encoder, value, buffer: buffer.extend(b"i%d;" % value),
+        float: lambda encoder, value, buffer: buffer.extend(b"f" + repr(value).encode() + b";"),
+        str: _encode_text(b"s"),
+        bytes: _encode_bytes,
+        list: _Encoder.encode_list,
+        tuple: _Encoder.encode_list,
+        set: _Encoder.encode_set,
+        frozenset: _Encoder.encode_set,
+        dict: _Encoder.encode_mapping,
+        datetime: _encode_iso,
+        date: _encode_iso,
+        time: _encode_iso,
+        timedelta: lambda encoder, value, buffer: buffer.extend(b"r" + repr(value.total_seconds()).encode() + b";"),
+        Decimal: _encode_text(b"D"),
+        UUID: _encode_text(b"u"),
+    }
+
+
+def fingerprint(config: Any, *, exclude_marked=True) -> bytes:
+    """The sha256 digest of the content of a (pai) dataclass (or any value consisting of the supported types)
+
+    Fields that are marked by `pai_meta(fingerprint=False)` are excluded unless `exclude_marked` is False.
+    """
+    hasher = hashlib.sha256()
+    encoder = _Encoder(hasher, exclude_marked)
+    encoder.encode(config, encoder.buffer)
+    encoder.flush()
+    return hasher.digest()
@@ -0,0 +1,98 @@
+"""Immutable and hashable pai_dataclasses, see `pai_dataclass(frozen=True)`.
+
+After `__init__`, the values of the fields are frozen (lists and tuples to tuples, sets to frozensets, dicts to
+`FrozenDict`s) and assigning any attribute raises a `FrozenInstanceError`. The hash is computed on first use and is
+cached in the instance (`_pai_hash`), so that frozen configs are cheap keys of dicts or caches.
+"""
+from dataclasses import FrozenInstanceError, fields
+from typing import Any
+
+# Name of the attribute that stores the cached hash, it is _UNFROZEN while __init__ is running
+HASH_ATTRIBUTE = "_pai_hash"
+_UNFROZEN = object()
+
+
+class FrozenDict(dict):
+    """An immutable and hashable dict"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{self.__class__.__name__}' object is immutable")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict.__repr__(self)})"
+
+
+def freeze(value: Any) -> Any:
+    """Convert (nested) lists, sets and dicts to their immutable counterparts"""
+    value_type = type(value)
+    if value_type is list or value_type is tuple:
+        return tuple(freeze(v) for v in value)
+    elif value_type is set or value_type is frozenset:
+        return frozenset(freeze(v) for v in value)
+    elif value_type is dict or value_type is FrozenDict:
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    return value
+
+
+def _restore(cls, values):
+    # unpickle (or copy) a frozen instance without calling __init__
+    obj = cls.__new__(cls)
+    for name, value in values.items():
+        object.__setattr__(obj, name, value)
+    object.__setattr__(obj, HASH_ATTRIBUTE, None)
+    return obj
+
+
+def make_frozen(cls, forbid_unknown=True):
+    """Make the instances of the (pai) dataclass `cls` immutable and hashable after __init__"""
+    field_names = [f.name for f in fields(cls)]
+    # the fields that are compared by __eq__ define the hash, as for dataclass(frozen=True)
+    hash_field_names = [f.name for f in fields(cls) if (f.compare if f.hash is None else f.hash)]
+    known_fields = set(field_names)
+    init = cls.__init__
+
+    def __init__(self, *args, **kwargs):
+        object.__setattr__(self, HASH_ATTRIBUTE, _UNFROZEN)
+        init(self, *args, **kwargs)
+        for name in field_names:
+            object.__setattr__(self, name, freeze(getattr(self, name)))
+        object.__setattr__(self, HASH_ATTRIBUTE, None)
+
+    def __setattr__(self, key, value):
+        if getattr(self, HASH_ATTRIBUTE, _UNFROZEN) is not _UNFROZEN:
+            raise FrozenInstanceError(f"cannot assign to field '{key}' of frozen {self.__class__.__name__}")
+        if forbid_unknown and key not in known_fields:
+            raise AttributeError(
+                f"Class {self.__class__} has no attribute {key}. Available fields: {', '.join(field_names)}"
+            )
+        object.__setattr__(self, key, value)
+
+    def __delattr__(self, key):
+        raise FrozenInstanceError(f"cannot delete field '{key}' of frozen {self.__class__.__name__}")
+
+    def __hash__(self):
+        h = getattr(self, HASH_ATTRIBUTE)
+        if h is None:
+            h = hash((self.__class__, tuple(getattr(self, name) for name in hash_field_names)))
+            object.__setattr__(self, HASH_ATTRIBUTE, h)
+        return h
+
+    def __reduce__(self):
+        # the cached hash must not be stored since hashes of e.g. strings differ between processes
+        return _restore, (self.__class__, {name: getattr(self, name) for name in field_names})
+
+    __init__.__wrapped__ = init
+    for func in [__init__, __setattr__, __delattr__, __hash__, __reduce__]:
+        func.__qualname__ = f"{cls.__qualname__}.{func.__name__}"
+        setattr(cls, func.__name__, func)
+    cls.__pai_frozen__ = True
+    return cls
@@ -0,0 +1,74 @@
+"""Help formatting for large schemas.
+
+`PAIHelpFormatter` shows the defaults of the arguments as `ArgumentDefaultsHelpFormatter`, but large defaults (e.g. a
+list with 10^5 items) are truncated. Only the displayed items are converted to strings, when the help of the argument
+is rendered.
+
+`help_key_parts` are the inputs of the help of actions (with truncated defaults), `PAIArgumentParser.format_help` uses
+them as key to cache the rendered help in memory and in the schema cache dir.
+"""
+import copy
+import reprlib
+from argparse import SUPPRESS, Action, ArgumentDefaultsHelpFormatter
+from typing import Any, Iterable, List, Tuple
+
+# Max number of characters of a displayed default
+MAX_DEFAULT_LENGTH = 80
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxfrozenset = _repr.maxdeque = 8
+_repr.maxdict = 4
+_repr.maxstring = _repr.maxother = MAX_DEFAULT_LENGTH
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= MAX_DEFAULT_LENGTH else text[: MAX_DEFAULT_LENGTH - 3] + "..."
+
+
+def short_default(value: Any) -> str:
+    """The text of a default value (as `str`) truncated to about MAX_DEFAULT_LENGTH characters"""
+    if isinstance(value, str):
+        return _truncate(value)
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        # only convert the displayed items
+        text = _truncate(_repr.repr(value))
+        if len(value) > (_repr.maxdict if isinstance(value, dict) else _repr.maxlist) or text.endswith("..."):
+            text += f" ({len(value)} items)"
+        return text
+    return _truncate(str(value))
+
+
+class PAIHelpFormatter(ArgumentDefaultsHelpFormatter):
+    """Help message formatter which adds (truncated) default values to argument help."""
+
+    def _expand_help(self, action):
+        if action.default is not None and action.default is not SUPPRESS:
+            action = copy.copy(action)
+            action.default = short_default(action.default)
+        return super()._expand_help(action)
+
+
+def help_key_parts(actions: Iterable[Action]) -> List[Tuple]:
+    """Everything of the actions that is displayed in the help"""
+    parts = []
+    for action in actions:
+        default = action.default
+        if default is not None and default is not SUPPRESS:
+            default = short_default(default)
+        choices = None if action.choices is None else tuple(map(str, action.choices))
+        parts.append(
+            (
+                type(action).__name__,
+                tuple(action.option_strings),
+                action.dest,
+                action.help,
+                action.metavar,
+                action.nargs,
+                action.required,
+                default,
+                choices,
+                tuple(a.help for a in getattr(action, "_choices_actions", ())),  # help of sub commands
+            )
+        )
+    return parts
@@ -0,0 +1,143 @@
+"""Opt-in timings and counters of the phases of parsing, e.g. to find out why the launch of a CLI is slow.
+
+    with instrument() as stats:
+        parser.parse_args()
+    print(stats.to_dict())
+    stats.write_chrome_trace("parse_trace.json")  # open in chrome://tracing or https://ui.perfetto.dev
+
+The phases are
+- `parse`: a call of `PAIArgumentParser.parse_known_args` (nested for sub parsers)
+- `argparse`: the args that are handled by argparse itself (e.g. positionals and sub commands)
+- `build`: adding the root arguments (and loading their configs) to a new data class parser
+- `schema_cache`: loading the expanded tree from the schema cache
+- `expand`: the passes that register the actions of the selected dataclasses and consume the args
+- `instantiate`: constructing the dataclasses of the tree (`_tree_to_data_class`)
+
+The counters are the number of parse passes (`parse_passes`), of registered actions (`actions`), of classes that were
+resolved by importing a module (`imports`) and of constructed dataclasses (`nodes`).
+
+Set the environment variable PAIARGPARSE_TRACE to a path to write the trace of each call of `parse_args` of a
+`PAIArgumentParser` to this file. If nothing is instrumented, each phase only costs the check of a global variable.
+"""
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+ENV_VARIABLE = "PAIARGPARSE_TRACE"
+
+
+class Phase(NamedTuple):
+    name: str
+    start_ns: int  # relative to the start of the instrumentation
+    duration_ns: int
+    depth: int  # number of enclosing phases
+
+
+class ParseStats:
+    """The phases and counters that were recorded while instrumented"""
+
+    def __init__(self):
+        self.start_ns = time.perf_counter_ns()
+        self.phases: List[Phase] = []
+        self.counters: Dict[str, int] = {}
+        self._depth = 0
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start_ns = time.perf_counter_ns()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            end_ns = time.perf_counter_ns()
+            self.phases.append(Phase(name, start_ns - self.start_ns, end_ns - start_ns, self._depth))
+
+    def phase_times_ms(self) -> Dict[str, float]:
+        """The total wall time of each phase in ms (nested calls of the same phase are only counted once)"""
+        times: Dict[str, float] = {}
+        for phase in self.phases:
+            if not any(p.name == phase.name and p.depth < phase.depth and _contains(p, phase) for p in self.phases):
+                times[phase.name] = times.get(phase.name, 0) + phase.duration_ns / 1e6
+        return times
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases_ms": self.phase_times_ms(),
+            "counters": dict(self.counters),
+            "events": [
+                {"name": p.name, "start_ms": p.start_ns / 1e6, "duration_ms": p.duration_ns / 1e6, "depth": p.depth}
+                for p in sorted(self.phases, key=lambda p: p.start_ns)
+            ],
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The phases as complete events and the counters as metadata of the Chrome trace event format"""
+        pid = os.getpid()
+        events = [
+            {"name": p.name, "ph": "X", "ts": p.start_ns / 1e3, "dur": p.duration_ns / 1e3, "pid": pid, "tid": 0}
+            for p in sorted(self.phases, key=lambda p: p.start_ns)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": dict(self.counters)}
+
+    def write_chrome_trace(self, path: str):
+        import json
+
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _contains(outer: Phase, inner: Phase) -> bool:
+    return outer.start_ns <= inner.start_ns and inner.start_ns + inner.duration_ns <= outer.start_ns + outer.duration_ns
+
+
+# The stats of the innermost `instrument`
+_active: Optional[ParseStats] = None
+
+
+@contextmanager
+def instrument() -> Iterator[ParseStats]:
+    """Record the phases and counters of all parses in this context"""
+    global _active
+    previous, _active = _active, ParseStats()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+_NO_PHASE = nullcontext()
+
+
+def phase(name: str):
+    """Context of a phase, it is only recorded if instrumented"""
+    if _active is None:
+        return _NO_PHASE
+    return _active.phase(name)
+
+
+def count(name: str, n: int = 1):
+    if _active is not None:
+        _active.count(name, n)
+
+
+def is_active() -> bool:
+    return _active is not None
+
+
+@contextmanager
+def trace_from_environment() -> Iterator[None]:
+    """Write the chrome trace of this context to the path of the environment variable (if set and not instrumented)"""
+    path = os.environ.get(ENV_VARIABLE)
+    if not path or _active is not None:
+        yield
+        return
+    with instrument() as stats:
+        try:
+            yield
+        finally:
+            stats.write_chrome_trace(path)
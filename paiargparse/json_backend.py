@@ -0,0 +1,116 @@
+"""JSON backends to write and read the dicts of pai_dataclasses (see `to_json_bytes` and `from_json`).
+
+`to_json` only uses a backend if it is passed explicitly, by default it writes the same json as dataclasses_json.
+
+The backend is selected by name:
+- "orjson": https://github.com/ijl/orjson, a fast encoder/decoder that directly writes bytes (optional dependency)
+- "json": the standard library
+
+By default, "orjson" is used if it is installed, otherwise "json". Both write the same compact json (e.g. datetimes as
+timestamps as dataclasses_json does, non ascii characters as utf-8), so the output does not depend on whether orjson is
+installed. Only non finite floats differ: orjson writes null for NaN and infinity, json writes NaN and Infinity.
+
+Usage:
+    set_json_backend("json")  # select the backend globally, None to select it automatically
+    data = params.to_json_bytes(backend="orjson")  # or per call
+"""
+import importlib.util
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+
+class JsonBackend:
+    name: str = None
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, s: Union[str, bytes, bytearray]) -> Any:
+        raise NotImplementedError
+
+
+_encoder = None  # the encoder of dataclasses_json, created on first use
+
+
+def _default(obj):
+    # Handle the types that are not supported by json as dataclasses_json does (e.g. datetime, Decimal)
+    global _encoder
+    if _encoder is None:
+        from dataclasses_json.core import _ExtendedEncoder
+
+        _encoder = _ExtendedEncoder()
+    return _encoder.default(obj)
+
+
+class StdJsonBackend(JsonBackend):
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        import json
+
+        # the same formatting as orjson
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, s: Union[str, bytes, bytearray]) -> Any:
+        import json
+
+        return json.loads(s)
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        # datetimes are passed to `_default` to write timestamps instead of ISO strings
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=_default, option=self._options)
+
+    def loads(self, s: Union[str, bytes, bytearray]) -> Any:
+        return self._orjson.loads(s)
+
+
+_backend_types = {backend.name: backend for backend in [StdJsonBackend, OrjsonBackend]}
+_backends: Dict[str, JsonBackend] = {}
+_selected_backend: Optional[str] = None
+
+
+def available_json_backends():
+    """Names of the backends that are installed"""
+    return [name for name in _backend_types if name == "json" or importlib.util.find_spec(name) is not None]
+
+
+@lru_cache(maxsize=1)
+def _fastest_json_backend() -> str:
+    return "orjson" if "orjson" in available_json_backends() else "json"
+
+
+def set_json_backend(name: Optional[str]):
+    """Select the backend that is used if no backend is passed, None to select the fastest installed one"""
+    global _selected_backend
+    if name is not None:
+        json_backend(name)  # check that it is available
+    _selected_backend = name
+
+
+def json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Get the backend with the given name or the selected one (see `set_json_backend`)"""
+    if name is None:
+        name = _selected_backend or _fastest_json_backend()
+    try:
+        return _backends[name]
+    except KeyError:
+        pass
+
+    if name not in _backend_types:
+        raise ValueError(f"Unknown json backend '{name}'. Available backends: {list(_backend_types.keys())}")
+    try:
+        backend = _backend_types[name]()
+    except ImportError as e:
+        raise ValueError(f"Json backend '{name}' is not installed.") from e
+    _backends[name] = backend
+    return backend
@@ -0,0 +1,80 @@
+"""Stream collections of pai_dataclasses (e.g. the configs of a sweep) from and to JSON Lines files.
+
+Each line is the json of one dataclass (see `to_json_bytes`). Both functions process one line at a time, so the
+memory does not depend on the number of configs:
+
+    write_json_lines("sweep.jsonl", (Params(lr=lr) for lr in learning_rates))
+    for params in read_json_lines("sweep.jsonl", Params, where=lambda d: d["lr"] < 0.01):
+        ...
+
+`where` is called with the raw dict of a line, only lines that match are decoded to dataclasses.
+"""
+import io
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Type, TypeVar, Union
+
+from paiargparse.class_registry import resolve_class
+from paiargparse.json_backend import json_backend
+
+T = TypeVar("T")
+File = Union[str, os.PathLike, io.IOBase]
+
+
+@contextmanager
+def _open(file: File, mode: str):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode + "b") as f:
+            yield f
+    else:
+        yield file  # do not close files of the caller
+
+
+def write_json_lines(file: File, dataclasses: Iterable[Any], *, append=False, backend: Optional[str] = None) -> int:
+    """Write the dataclasses to a path or an (opened binary or text) file, return the number of written lines"""
+    backend = json_backend(backend)
+    num_lines = 0
+    with _open(file, "a" if append else "w") as f:
+        text = isinstance(f, io.TextIOBase)
+        for dc in dataclasses:
+            line = backend.dumps(dc.to_dict()) + b"\n"
+            f.write(line.decode("utf-8") if text else line)
+            num_lines += 1
+    return num_lines
+
+
+def read_json_lines(
+    file: File,
+    cls: Optional[Type[T]] = None,
+    *,
+    where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    infer_missing=False,
+    backend: Optional[str] = None,
+) -> Iterator[T]:
+    """Lazily read the dataclasses of a path or an (opened binary or text) file.
+
+    Each line is decoded as the class that is stored in its `__cls__`, or as `cls` if it is not set. The classes are
+    resolved once per stream. Lines for which `where(dict)` returns False are skipped without decoding them.
+    """
+    backend = json_backend(backend)
+    from paiargparse.dataclass_json_overrides import _decode_dataclass
+
+    classes: Dict[str, Type] = {}
+    with _open(file, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            kvs = backend.loads(line)
+            if where is not None and not where(kvs):
+                continue
+
+            cls_name = kvs.get("__cls__")
+            if cls_name is None:
+                if cls is None:
+                    raise ValueError(f"Line {line_number} has no __cls__ and no default class was passed.")
+                line_cls = cls
+            else:
+                line_cls = classes.get(cls_name)
+                if line_cls is None:
+                    line_cls = classes[cls_name] = resolve_class(cls_name)
+            yield _decode_dataclass(line_cls, kvs, infer_missing)
@@ -1,11 +1,40 @@
-from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter, _SubParsersAction, SUPPRESS, Action
+import copy
+import shutil
+import sys
+import weakref
+from argparse import (
+    ArgumentParser,
+    _SubParsersAction,
+    SUPPRESS,
+    Action,
+    _HelpAction,
+    Namespace,
+)
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import MISSING, is_dataclass
 from functools import partial
-from typing import Any, List, Type
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Type
 
-import editdistance
+from paiargparse import instrumentation
+from paiargparse.config_file import load_config, load_root_configs
+from paiargparse.dataclass_parser import (
+    DataClassSelectionAction,
+    FieldValueAction,
+    PAIDataClassArgumentParser,
+    RequiredArgumentError,
+    UnknownArgumentError,
+)
+from paiargparse.help_formatter import PAIHelpFormatter, help_key_parts
+from paiargparse.schema_cache import SchemaCache, modules_of_tree
+from paiargparse.suggestions import suggestion_index
+from paiargparse.sweep import split_sweep_args
 
-from paiargparse.dataclass_parser import PAIDataClassArgumentParser, UnknownArgumentError
+# Number of results of parse_args that can be reparsed (see PAIArgumentParser.reparse), each keeps its parser alive
+MAX_REPARSE_STATES = 4
+
+# Number of rendered help texts that are cached in memory by each parser (see PAIArgumentParser.format_help)
+MAX_HELP_CACHE_ENTRIES = 8
 
 
 class PAIArgumentParser(ArgumentParser):
@@ -13,16 +42,34 @@ class PAIArgumentParser(ArgumentParser):
     Argument parser based on hierarchical dataclasses
 
     Call `add_root_argument("arg", DataClass)` to add a dataclass to the arguments
+
+    The dataclass arguments are only expanded once the parser is used (parsing or help), so unused sub parsers
+    (e.g. sub commands that are not selected) are cheap. Pass a `builder` to also defer the `add_root_argument` calls.
+
+    The parser stores the root arguments and a template, i.e. a `PAIDataClassArgumentParser` whose tree is expanded
+    with the default dataclasses once (and again after adding root arguments). A call of `parse_known_args` whose
+    args only set values of fields is applied to the template without changing it (see `reparse`), only the result is
+    created per call. Other calls (e.g. selecting dataclasses or loading a config) expand the root arguments in a new
+    `PAIDataClassArgumentParser`. Thus, a parser can be reused to parse any number of args.
+
+    Use `reparse(namespace, args)` to apply additional args (e.g. overrides of single values) to the result of
+    `parse_args` without parsing all args again.
+
+    Set `add_config` to add `--config path.json` to load a saved config (see `to_json`) as default of the root
+    arguments which is overridden by the other command line arguments (see `config_file`).
     """
 
     def __init__(
         self,
         add_help=True,
         add_show=True,
-        formatter_class=ArgumentDefaultsHelpFormatter,
+        formatter_class=PAIHelpFormatter,
         ignore_required=False,
         root_parser: "PAIArgumentParser" = None,
         allow_abbrev=False,
+        schema_cache_dir: Optional[str] = None,
+        builder: Optional[Callable[["PAIArgumentParser"], None]] = None,
+        add_config=False,
         *args,
         **kwargs,
     ):
@@ -30,13 +77,60 @@ class PAIArgumentParser(ArgumentParser):
             add_help=False, formatter_class=formatter_class, allow_abbrev=allow_abbrev, *args, **kwargs
         )
         self.root_parser = root_parser if root_parser else self
+        # to construct the same parser in the processes of parse_many
+        self._init_kwargs = dict(
+            kwargs,
+            add_help=add_help,
+            add_show=add_show,
+            formatter_class=formatter_class,
+            ignore_required=ignore_required,
+            allow_abbrev=allow_abbrev,
+            schema_cache_dir=schema_cache_dir,
+            add_config=add_config,
+        )
         self._all_actions = []
         self._add_help = add_help  # store if help should be set
         self._add_show = add_show  # store if show should be added as valid command
 
-        self._data_class_parser = self._data_class_argument_parser_cls()(
-            add_help=False, formatter_class=formatter_class, ignore_required=ignore_required, allow_abbrev=allow_abbrev
+        self._builder = builder  # called with this parser before it is used for the first time
+        # data class parser of the last call, see `_data_class_parser`
+        self._dc_parser: Optional[PAIDataClassArgumentParser] = None
+        self._dc_parser_delta: List[str] = []  # the args of the last call that are not applied to its tree
+        self._template: Optional[_Template] = None  # see `_template_of_call`
+        self._dc_parser_kwargs = dict(
+            add_help=False,
+            formatter_class=formatter_class,
+            ignore_required=ignore_required,
+            allow_abbrev=allow_abbrev,
+            schema_cache_dir=schema_cache_dir,
         )
+        self._root_arguments = []  # root arguments that are expanded by every data class parser
+        self._config_path: Optional[str] = None  # the config passed by --config in the current call
+        # id of a result of parse_args -> state to reparse it, the most recently used MAX_REPARSE_STATES are kept
+        self._reparse_states: "OrderedDict[int, _ReparseState]" = OrderedDict()
+        # key of the displayed arguments -> rendered help, see `format_help`
+        self._help_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._help_actions: List[Action] = []
+        if add_show:
+            self._help_actions.append(
+                _ShowParametersAction(
+                    option_strings=["--show"], dest=SUPPRESS, default=SUPPRESS, help="show the parsed parameters"
+                )
+            )
+        if add_help:
+            self._help_actions.append(
+                _HelpAction(option_strings=["-h", "--help"], default=SUPPRESS, help="show this help message and exit")
+            )
+
+        if add_config:
+            self.add_argument(
+                "--config",
+                action=_ConfigAction,
+                dest=SUPPRESS,
+                default=SUPPRESS,
+                metavar="PATH",
+                help="json file of a config to use as defaults of the arguments (see to_json)",
+            )
 
         # Register the custom subparser that stores the root parser
         self._registries["action"]["parsers"] = partial(_SubParsersActionWithRoot, root_parser=self.root_parser)
@@ -45,37 +139,137 @@ class PAIArgumentParser(ArgumentParser):
     def _data_class_argument_parser_cls(self) -> Type[PAIDataClassArgumentParser]:
         return PAIDataClassArgumentParser
 
+    def _create_data_class_parser(self) -> PAIDataClassArgumentParser:
+        dc_parser = self._data_class_argument_parser_cls()(**self._dc_parser_kwargs)
+        cli_configs = {}
+        if self._config_path is not None:
+            cli_configs = load_root_configs(self._config_path, tuple((a[0], a[1]) for a in self._root_arguments))
+        for param_name, dc_type, default, ignore, flat, config in self._root_arguments:
+            if param_name in cli_configs:
+                default = cli_configs[param_name]
+            elif config is not None:
+                default = load_config(config, dc_type)
+            dc_parser.add_root_argument(param_name, dc_type, default, ignore=ignore, flat=flat)
+        return dc_parser
+
+    def _template_of_call(self) -> Optional["_Template"]:
+        """The template of the data class parsers, None if it can not be used for this call.
+
+        The template is only valid for the defaults of the root arguments, so it is not used if a config is loaded.
+        """
+        if self._config_path is not None or any(config is not None for *_, config in self._root_arguments):
+            return None
+        if self._template is None:
+            dc_parser = self._create_data_class_parser()
+            try:
+                base, _ = dc_parser.parse_known_args([], Namespace())
+            except (Exception, SystemExit):
+                # e.g. a field is required, then every call is parsed completely
+                self._template = _Template(None, None)
+            else:
+                self._template = _Template(dc_parser, base)
+        return self._template if self._template.dc_parser is not None else None
+
+    @property
+    def _data_class_parser(self) -> PAIDataClassArgumentParser:
+        """The data class parser of the last call of `parse_known_args` (used to display the help)"""
+        if self._dc_parser is None:
+            self._dc_parser = self._create_data_class_parser()
+        return self._dc_parser
+
+    @contextmanager
+    def _with_help_actions(self):
+        """Register --show and --help only while they shall be handled, so that they are not called before the
+        data class arguments are expanded
+        """
+        for action in self._help_actions:
+            self._add_action(action)
+        try:
+            yield
+        finally:
+            for action in self._help_actions:
+                self._optionals._remove_action(action)
+                for option_string in action.option_strings:
+                    del self._option_string_actions[option_string]
+
+    def _materialize(self):
+        """Run the deferred builder (once) before the parser is used"""
+        if self._builder is not None:
+            builder, self._builder = self._builder, None
+            builder(self)
+
     def add_root_argument(
-        self, param_name: str, dc_type: Any, default: Any = MISSING, ignore: List[str] = None, flat=False
+        self,
+        param_name: str,
+        dc_type: Any,
+        default: Any = MISSING,
+        ignore: List[str] = None,
+        flat=False,
+        config: Optional[str] = None,
     ):
-        self._data_class_parser.add_root_argument(param_name, dc_type, default, ignore=ignore, flat=flat)
+        """Add a dataclass argument.
+
+        `config` is the path of a json file (see `to_json`) that is loaded as default (on each parse, if it changed).
+        """
+        PAIDataClassArgumentParser.check_root_type(dc_type)
+        if config is not None and default is not MISSING:
+            raise ValueError("Pass either a default or a config.")
+        if self._dc_parser is not None:
+            if config is not None:
+                default = load_config(config, dc_type)
+            self._dc_parser.add_root_argument(param_name, dc_type, default, ignore=ignore, flat=flat)
+        # Only record the argument, the dataclass tree is expanded when the parser is used
+        self._root_arguments.append((param_name, dc_type, default, ignore, flat, config))
+        self._template = None
 
     def parse_known_args(self, args=None, namespace=None):
+        with instrumentation.phase("parse"):
+            return self._parse_known_dataclass_args(args, namespace)
+
+    def _parse_known_dataclass_args(self, args, namespace):
+        self._materialize()
+        if self.root_parser is self:
+            # (sub) parsers collect their actions of this call
+            self._all_actions = []
+        self._config_path = None
+
         # parse args that match the default arg parser, first this, because these actions are allowed to add
         # additional "dataclass args"
         try:
-            namespace, args = super(PAIArgumentParser, self).parse_known_args(args, namespace)
+            with instrumentation.phase("argparse"):
+                namespace, args = super(PAIArgumentParser, self).parse_known_args(args, namespace)
         except SystemExit as e:
             # store if an exception occurred
             exception = e
         else:
             exception = None
 
-        # (recursively) parse args that match the data class arg parser
-        namespace, args = self._data_class_parser.parse_known_args(args, namespace)
+        # (recursively) parse args that match the data class arg parser. Args that only set values of fields are
+        # applied to the template, otherwise the state of the parsing is stored in a new data class parser, so that
+        # calls do not affect each other
+        template, result = None, None
+        if exception is None:
+            with instrumentation.phase("build"):
+                template = self._template_of_call()
+        if template is not None:
+            result = template.dc_parser.reparse(template.base, args)
+        if result is not None:
+            # the result must not share any (mutable) value with the template or the results of other calls
+            for name, value in copy.deepcopy(vars(result)).items():
+                setattr(namespace, name, value)
+            self._dc_parser, self._dc_parser_delta, args = template.dc_parser, args, []
+        else:
+            with instrumentation.phase("build"):
+                self._dc_parser = self._create_data_class_parser()
+            self._dc_parser_delta = []
+            namespace, args = self._dc_parser.parse_known_args(args, namespace)
 
         # Collect all known args, since now the args might have changes after parsing
         self._collect_all_actions()
 
-        if self._add_show:
-            # add help as last
-            self.add_argument("--show", action="show", default=SUPPRESS, help="show the parsed parameters")
-            if len(args) > 0 and args[0] in {"--show"}:
-                return super(PAIArgumentParser, self).parse_known_args(args, namespace)
-        if self._add_help:
-            # add help as last
-            self.add_argument("-h", "--help", action="help", default=SUPPRESS, help="show this help message and exit")
-            if len(args) > 0 and args[0] in {"-h", "--help"}:
+        if len(args) > 0 and args[0] in {o for a in self._help_actions for o in a.option_strings}:
+            # show or help as last
+            with self._with_help_actions():
                 return super(PAIArgumentParser, self).parse_known_args(args, namespace)
 
         if exception:
@@ -85,13 +279,197 @@ class PAIArgumentParser(ArgumentParser):
         return namespace, args
 
     def parse_args(self, args=None, namespace=None):
-        args, argv = self.parse_known_args(args, namespace)
+        args = sys.argv[1:] if args is None else list(args)
+        with instrumentation.trace_from_environment():
+            result, argv = self.parse_known_args(args, namespace)
         if argv:
             # unknown arguments, but search for nearest matches
             alt_actions = find_alt_actions([a for a in argv if a.startswith("--")], self._all_actions, n_best=3)
             help_str = ["\n" + f"\t{arg} ==> {', '.join(alt)}" for arg, alt in zip(argv, alt_actions)]
             raise UnknownArgumentError(f"Unknown Arguments {' '.join(argv)}. Possible alternatives:{''.join(help_str)}")
-        return args
+        if namespace is None:
+            self._store_reparse_state(result, args, self._dc_parser, delta=self._dc_parser_delta)
+        return result
+
+    def reparse(self, namespace: Namespace, args: List[str]) -> Namespace:
+        """Apply `args` to a result of `parse_args` (or `reparse`), the same as `parse_args(previous_args + args)`.
+
+        If `args` only set values of fields (e.g. `--root.sub.p 1`), only the dataclasses that contain these fields
+        (and their parents) are constructed again, all other dataclasses are shared with `namespace`. Otherwise
+        (e.g. selecting another dataclass), all args are parsed again.
+        """
+        state = self._reparse_states.get(id(namespace))
+        if state is None or state.namespace() is not namespace:
+            raise ValueError(
+                f"Can only reparse one of the last {MAX_REPARSE_STATES} results of parse_args or reparse of this parser."
+            )
+        self._reparse_states.move_to_end(id(namespace))
+
+        args = list(args)
+        base = namespace if state.base is None else state.base()
+        if state.dc_parser is not None and base is not None:
+            # the tree of the dc parser is unchanged by reparse, so apply all args that were applied to its result
+            delta = state.delta + args
+            result = state.dc_parser.reparse(base, delta)
+            if result is not None:
+                self._store_reparse_state(result, state.args + args, state.dc_parser, weakref.ref(base), delta)
+                return result
+
+        return self.parse_args(state.args + args)
+
+    def sweep(self, args: Optional[List[str]] = None) -> Iterator[Namespace]:
+        """Lazily parse all combinations of a sweep, e.g. `--trainer.lr 1e-3,1e-4 --model.depth 4,8` yields four results.
+
+        An option followed by a single value with commas is a dimension of the sweep, the results are the Cartesian
+        product of all dimensions (see `sweep.py`). The values of str fields (and of other options without a type) are
+        not split, unless the field is marked by `pai_meta(sweep=True)`. The args are parsed once, the dataclasses
+        that do not depend on any swept value are shared by all results, the others are constructed once per
+        combination of the values they depend on. If a swept value selects a dataclass, each combination is parsed
+        separately.
+        """
+        args = sys.argv[1:] if args is None else list(args)
+        sweep_args = split_sweep_args(args, self._is_option_string)
+        combinations = sweep_args.combinations()
+        base = self.parse_args(next(combinations))
+        if sweep_args.dimensions:
+            # the actions of the options are only known after parsing, split again if an option is not sweepable
+            resolved = split_sweep_args(args, self._is_option_string, self._is_sweepable_option)
+            if resolved != sweep_args:
+                sweep_args = resolved
+                combinations = sweep_args.combinations()
+                base = self.parse_args(next(combinations))
+        dc_parser = self._dc_parser
+        results = None
+        if dc_parser is not None and sweep_args.dimensions:
+            # the args that are not applied to the tree of the parser (see `_template_of_call`) are a fixed dimension
+            fixed = [[self._dc_parser_delta]] if self._dc_parser_delta else []
+            results = dc_parser.sweep(base, fixed + sweep_args.dimensions)
+
+        if results is None:
+            yield base
+            for combination in combinations:
+                yield self.parse_args(combination)
+        else:
+            yield from results
+
+    def _is_sweepable_option(self, option_string: str) -> bool:
+        """If comma separated values of the option are swept (unknown options are)"""
+        action = self._option_string_actions.get(option_string)
+        if action is None and self._dc_parser is not None:
+            action = self._dc_parser._option_string_actions.get(option_string)
+        if action is None:
+            return True
+        if isinstance(action, DataClassSelectionAction):
+            sweepable = True
+        elif isinstance(action, FieldValueAction):
+            sweepable = action.argument_field.type is not str
+        else:
+            sweepable = action.type not in {None, str}
+        arg_field = getattr(action, "argument_field", None)
+        if arg_field is not None and arg_field.meta and arg_field.meta.get("sweep") is not None:
+            sweepable = arg_field.meta["sweep"]
+        return sweepable
+
+    def parse_many(self, argvs: Sequence[List[str]], processes: Optional[int] = None) -> List[Namespace]:
+        """Parse each of `argvs`, the same as `[parse_args(argv) for argv in argvs]`.
+
+        The dataclass arguments are only expanded once for each distinct selection of dataclasses, the values of the
+        fields of each argv are then applied incrementally (see `reparse`), so results with the same selection share
+        the dataclasses whose fields are not set.
+
+        With `processes`, the argvs are split into consecutive chunks that are parsed in a process pool, the results
+        are returned in order. The parser is constructed again in each process, so it must only consist of root
+        arguments (with picklable types and defaults) and no other arguments or sub parsers.
+        """
+        argvs = [list(argv) for argv in argvs]
+        if not processes or processes <= 1 or len(argvs) <= 1:
+            return self._parse_many(argvs)
+
+        self._materialize()
+        if self._subparsers is not None or any(not isinstance(a, _ConfigAction) for a in self._actions):
+            raise ValueError("Parsing in processes is only supported by parsers that only have root arguments.")
+        chunk_size = -(-len(argvs) // processes)
+        chunks = [argvs[i : i + chunk_size] for i in range(0, len(argvs), chunk_size)]
+        from concurrent.futures import ProcessPoolExecutor  # only import if required, it is slow to import
+
+        with ProcessPoolExecutor(len(chunks)) as executor:
+            parsed_chunks = executor.map(
+                _parse_many_in_process,
+                [self.__class__] * len(chunks),
+                [self._init_kwargs] * len(chunks),
+                [self._root_arguments] * len(chunks),
+                chunks,
+            )
+            return [result for results in parsed_chunks for result in results]
+
+    def _parse_many(self, argvs: List[List[str]]) -> List[Namespace]:
+        self._materialize()
+        if self._subparsers is not None:
+            return [self.parse_args(argv) for argv in argvs]
+
+        selectors: Set[str] = set()  # option strings that select dataclasses in any of the expanded trees
+        # the args that select dataclasses -> data class parser and result of only these args, None if the args of
+        # the selection alone can not be parsed (e.g. a field is required), then each argv is parsed completely
+        bases: Dict[Tuple[str, ...], Optional[Tuple[PAIDataClassArgumentParser, Namespace]]] = {}
+        results = []
+        for argv in argvs:
+            selections, values = self._split_selections(argv, selectors)
+            result = None
+            if bases.get(tuple(selections)) is not None:
+                dc_parser, base = bases[tuple(selections)]
+                result = dc_parser.reparse(base, values)
+            if result is None:
+                result = self.parse_args(argv)
+                dc_parser = self._dc_parser
+                selectors.update(
+                    o for a in dc_parser._actions if not isinstance(a, FieldValueAction) for o in a.option_strings
+                )
+                selections, values = self._split_selections(argv, selectors)
+                if tuple(selections) not in bases:
+                    bases[tuple(selections)] = self._parse_base(result, selections, values)
+                    if bases[tuple(selections)] is not None and values:
+                        # share the dataclasses with the following results of the same selection
+                        dc_parser, base = bases[tuple(selections)]
+                        result = dc_parser.reparse(base, values) or result
+            results.append(result)
+        return results
+
+    def _parse_base(
+        self, result: Namespace, selections: List[str], values: List[str]
+    ) -> Optional[Tuple[PAIDataClassArgumentParser, Namespace]]:
+        """The data class parser and result of only the args that select dataclasses (`result` of all args)"""
+        if not values:
+            return self._dc_parser, result
+        try:
+            base = self.parse_args(selections)
+        except RequiredArgumentError:
+            return None
+        return self._dc_parser, base
+
+    def _split_selections(self, argv: List[str], selectors: Set[str]) -> Tuple[List[str], List[str]]:
+        """Split argv into the args of the `selectors` (and their values) and all other args"""
+        selections, others = [], []
+        target = others
+        for i, arg in enumerate(argv):
+            if arg == "--":
+                others += argv[i:]
+                break
+            if self._is_option_string(arg):
+                target = selections if arg.split("=", 1)[0] in selectors else others
+            target.append(arg)
+        return selections, others
+
+    def _is_option_string(self, arg_string: str) -> bool:
+        return (
+            len(arg_string) > 1
+            and arg_string[0] in self.prefix_chars
+            and not self._negative_number_matcher.match(arg_string)
+        )
+
+    def _store_reparse_state(self, namespace: Namespace, args: List[str], dc_parser, base=None, delta=()):
+        self._reparse_states[id(namespace)] = _ReparseState(weakref.ref(namespace), args, dc_parser, base, list(delta))
+        while len(self._reparse_states) > MAX_REPARSE_STATES:
+            self._reparse_states.popitem(last=False)
 
     def _collect_all_actions(self):
         """
@@ -101,6 +479,53 @@ class PAIArgumentParser(ArgumentParser):
         self.root_parser._all_actions.extend(self._actions + self._data_class_parser._actions)
 
     def format_help(self):
+        """The help of the arguments of the last call (the root arguments if nothing was parsed yet).
+
+        The rendered help is cached in memory and in the schema cache dir (if set), keyed by everything that is
+        displayed, i.e. the (truncated) defaults, help strings and choices of all arguments, and the terminal width.
+        """
+        self._materialize()
+        if not any(action in self._actions for action in self._help_actions):
+            with self._with_help_actions():
+                return self.format_help()
+
+        dc_parser = self._data_class_parser
+        action_groups = self._action_groups + dc_parser._action_groups
+        key = SchemaCache.key(
+            [
+                "help",
+                self.prog,
+                self.usage,
+                self.description,
+                self.epilog,
+                # a partial has no qualified name, its repr contains an id, so its help is only reused in memory
+                getattr(self.formatter_class, "__qualname__", repr(self.formatter_class)),
+                getattr(self.formatter_class, "__module__", None),
+                shutil.get_terminal_size().columns,
+                [[a.dest for a in g._group_actions] for g in self._mutually_exclusive_groups],
+            ]
+            + [(g.title, g.description, help_key_parts(g._group_actions)) for g in action_groups]
+        )
+        help_text = self._help_cache.get(key)
+        if help_text is not None:
+            self._help_cache.move_to_end(key)
+            return help_text
+
+        schema_cache_dir = self._dc_parser_kwargs["schema_cache_dir"]
+        schema_cache = SchemaCache(schema_cache_dir) if schema_cache_dir else None
+        if schema_cache is not None:
+            help_text = schema_cache.load_help(key)
+        if help_text is None:
+            help_text = self._format_help(action_groups)
+            if schema_cache is not None:
+                schema_cache.store_help(key, help_text, modules_of_tree(dc_parser._params_tree))
+
+        self._help_cache[key] = help_text
+        while len(self._help_cache) > MAX_HELP_CACHE_ENTRIES:
+            self._help_cache.popitem(last=False)
+        return help_text
+
+    def _format_help(self, action_groups) -> str:
         formatter = self._get_formatter()
 
         # usage
@@ -110,7 +535,7 @@ class PAIArgumentParser(ArgumentParser):
         formatter.add_text(self.description)
 
         # positionals, optionals and user-defined groups
-        for action_group in self._action_groups + self._data_class_parser._action_groups:
+        for action_group in action_groups:
             formatter.start_section(action_group.title)
             formatter.add_text(action_group.description)
             formatter.add_arguments(action_group._group_actions)
@@ -123,42 +548,38 @@ class PAIArgumentParser(ArgumentParser):
         return formatter.format_help()
 
 
-def _find_most_common_options(arg: str, all_option_strings: List[str]) -> List[str]:
-    """Filter commands that (after splitting at '.' have the most common parts)
+def find_alt_actions(argv: List[str], actions, n_best=1) -> List[str]:
+    """Find alternative actions for a given list of args.
 
-    e.g. arg="test.cmd.1" and all_option_string=["test.cmd.12" and "test.asdf.fasdf.asdf"] will only return "test.cmd.12"
+    Note, argv should only contain "--" args
     """
-    cmd1 = set(arg.split("."))
+    index = suggestion_index(tuple(dict.fromkeys(option_string for a in actions for option_string in a.option_strings)))
+    if len(index) == 0:
+        return ["No alternative available."] * len(argv)
 
-    all_common_cmds = []
-    max_common_cnt = 0
-    for option_string in all_option_strings:
-        cmd2 = set(option_string.split("."))
-        common_cmds = cmd1.intersection(cmd2)
-        all_common_cmds.append((option_string, common_cmds))
-        max_common_cnt = max(max_common_cnt, len(common_cmds))
+    return [index.suggest(arg, n_best) for arg in argv]
 
-    # also allow max_comon_cnt -1 to add a bit more variance
-    return [option_string for option_string, common_cmds in all_common_cmds if len(common_cmds) >= max_common_cnt - 1]
 
+def _parse_many_in_process(parser_cls, init_kwargs, root_arguments, argvs: List[List[str]]) -> List[Namespace]:
+    parser = parser_cls(**init_kwargs)
+    for param_name, dc_type, default, ignore, flat, config in root_arguments:
+        if isinstance(default, type(MISSING)):
+            default = MISSING  # unpickled as a new instance
+        parser.add_root_argument(param_name, dc_type, default, ignore=ignore, flat=flat, config=config)
+    return parser._parse_many(argvs)
 
-def find_alt_actions(argv: List[str], actions, n_best=1) -> List[str]:
-    """Find alternative actions for a given list of args.
 
-    Note, argv should only contain "--" args
-    """
-    all_option_strings = sum([a.option_strings for a in actions], [])
-    if len(all_option_strings) == 0:
-        return ["No alternative available."] * len(argv)
+class _Template(NamedTuple):
+    dc_parser: Optional[PAIDataClassArgumentParser]  # expanded with the default dataclasses, None if not possible
+    base: Optional[Namespace]  # the result of dc_parser without args
 
-    distances = [
-        [(option, editdistance.eval(arg, option)) for option in _find_most_common_options(arg, all_option_strings)]
-        for arg in argv
-    ]
-    for distance in distances:
-        distance.sort(key=lambda x: x[1])
 
-    return [[x[0] for x in s[:n_best]] for s in distances]
+class _ReparseState(NamedTuple):
+    namespace: "weakref.ref[Namespace]"  # the result, to check that the id is not reused
+    args: List[str]  # all args that were parsed
+    dc_parser: Optional[PAIDataClassArgumentParser]  # the parser of the (base) parse, None if not available
+    base: Optional["weakref.ref[Namespace]"]  # the result of dc_parser if this is the result of a reparse
+    delta: List[str]  # the args that were applied to the base
 
 
 class _SubParsersActionWithRoot(_SubParsersAction):
@@ -168,8 +589,22 @@ class _SubParsersActionWithRoot(_SubParsersAction):
         super(_SubParsersActionWithRoot, self).__init__(*args, **kwargs)
         self.root_parser = root_parser
 
-    def add_parser(self, *args, **kwargs):
-        return super(_SubParsersActionWithRoot, self).add_parser(*args, root_parser=self.root_parser, **kwargs)
+    def add_parser(self, *args, builder: Optional[Callable[[PAIArgumentParser], None]] = None, **kwargs):
+        """Add a sub parser.
+
+        `builder` is called with the new parser only if the sub command is selected (or its help is shown), use it to
+        add the root arguments of the sub command without paying for them on every startup.
+        """
+        return super(_SubParsersActionWithRoot, self).add_parser(
+            *args, root_parser=self.root_parser, builder=builder, **kwargs
+        )
+
+
+class _ConfigAction(Action):
+    """Store the path of --config in the parser, the config is loaded when the data class parser is created"""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser._config_path = values
 
 
 class _ShowParametersAction(Action):
@@ -0,0 +1,198 @@
+"""Opt-in persistent cache of the expanded argument tree of a `PAIDataClassArgumentParser`.
+
+Expanding the dataclass tree (extracting the fields of every dataclass, registering an action per field and
+selecting the default dataclasses) is repeated on every process start, although the result only changes if the
+code or the root arguments change.
+The cache stores the tree that is expanded with the default dataclasses together with its registered actions and the
+values of all options. An entry is keyed by the schema (the root arguments and the settings of the parser) only, so a
+command line that only sets values of fields restores the entry and applies its args to the restored actions.
+An entry is only valid as long as the source files of all modules that define the dataclasses of the tree are
+unchanged. The cache dir holds at most `MAX_ENTRIES` files, the least recently used ones are removed.
+The rendered help of a parser is stored in the same way (see `PAIArgumentParser.format_help`).
+
+Usage:
+    parser = PAIArgumentParser(schema_cache_dir="~/.cache/paiargparse")
+"""
+import hashlib
+import io
+import os
+import pickle
+import sys
+from dataclasses import MISSING, is_dataclass
+from importlib.util import find_spec
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from paiargparse.dataclass_extractor import ArgumentField, extract_args_of_dataclass
+from paiargparse.param_tree import PAINodeDataClass
+from paiargparse.version import __version__
+
+CACHE_FORMAT_VERSION = 2
+MAX_ENTRIES = 256  # default of the maximum number of files in the cache dir
+
+
+class SchemaCacheEntry(NamedTuple):
+    params_tree: PAINodeDataClass  # the tree expanded with the default dataclasses before instantiating them
+    option_values: Dict[str, Any]  # values of all registered options (dest -> value) as set in the namespace
+    actions: List[Any]  # the registered actions (without their container) that refer to the nodes of the tree
+
+
+class _Pickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        # MISSING must be restored as the identical object, since the tree compares it by identity
+        if obj is MISSING:
+            return "MISSING"
+        # the fields of a dataclass are extracted again, their defaults (factories) might not be picklable
+        if isinstance(obj, ArgumentField) and obj.owner is not None:
+            return "ArgumentField", obj.owner, obj.name
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._argument_fields: Dict[type, Dict[str, ArgumentField]] = {}
+
+    def persistent_load(self, pid):
+        if pid == "MISSING":
+            return MISSING
+        if isinstance(pid, tuple) and pid[0] == "ArgumentField":
+            _, owner, name = pid
+            if owner not in self._argument_fields:
+                self._argument_fields[owner] = {
+                    f.name: f for f in extract_args_of_dataclass(owner, exclude_ignored=False)
+                }
+            return self._argument_fields[owner][name]
+        raise pickle.UnpicklingError(f"Unsupported persistent id {pid}")
+
+
+def dumps(obj) -> bytes:
+    f = io.BytesIO()
+    _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return f.getvalue()
+
+
+def loads(data: bytes):
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+def module_source_hash(module_name: str) -> Optional[str]:
+    """Hash of the source file of a module, None if the module has no source file (e.g. a builtin module)"""
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if path is None and module_name != "__main__":
+        try:
+            spec = find_spec(module_name)
+        except (ImportError, ValueError):
+            spec = None
+        path = spec.origin if spec is not None and spec.has_location else None
+    if path is None or not os.path.isfile(path):
+        return None
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def modules_of_tree(node: PAINodeDataClass, modules: Optional[Set[str]] = None) -> Set[str]:
+    """All modules that define a dataclass (or one of its bases) that is used in the tree"""
+    if modules is None:
+        modules = set()
+    for t in (node.parsed_type, node.default_value.__class__):
+        if isinstance(t, type) and is_dataclass(t):
+            modules.update(c.__module__ for c in t.__mro__)
+    for child in node.dcs.values():
+        modules_of_tree(child, modules)
+    return modules
+
+
+class SchemaCache:
+    """Store and load `SchemaCacheEntry`s in `cache_dir`.
+
+    Entries that can not be written (e.g. since a default value can not be pickled) or read (e.g. since a class was
+    renamed) are silently skipped and the parser falls back to expanding the tree.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = MAX_ENTRIES):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(parts: Iterable[Any]) -> str:
+        """Create a key from strings (or objects with a deterministic repr), e.g. the root arguments"""
+        return hashlib.sha256(repr((CACHE_FORMAT_VERSION, __version__, *parts)).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str = ".pkl") -> str:
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def load(self, key: str) -> Optional[SchemaCacheEntry]:
+        data = self._load_data(key, ".pkl")
+        if data is None:
+            return None
+
+        try:
+            return loads(data)
+        except Exception:
+            # e.g. a class is not available anymore
+            return None
+
+    def store(self, key: str, entry: SchemaCacheEntry):
+        try:
+            data = dumps(entry)
+        except Exception:
+            # e.g. a default value or a dynamically created class can not be pickled, do not cache
+            return
+
+        self._store_data(key, data, modules_of_tree(entry.params_tree), ".pkl")
+
+    def load_help(self, key: str) -> Optional[str]:
+        """The rendered help of a parser, see `PAIArgumentParser.format_help`"""
+        data = self._load_data(key, ".help")
+        return None if data is None else data.decode("utf-8")
+
+    def store_help(self, key: str, help_text: str, modules: Iterable[str]):
+        self._store_data(key, help_text.encode("utf-8"), modules, ".help")
+
+    def _load_data(self, key: str, suffix: str) -> Optional[bytes]:
+        path = self._path(key, suffix)
+        try:
+            with open(path, "rb") as f:
+                source_hashes, data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+
+        if any(module_source_hash(module) != h for module, h in source_hashes.items()):
+            # code changed, rebuild
+            return None
+
+        try:
+            # mark as recently used, see _prune
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _store_data(self, key: str, data: bytes, modules: Iterable[str], suffix: str):
+        source_hashes = {module: module_source_hash(module) for module in modules}
+        import tempfile  # only import if required, it is slow to import
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temporary file first, so that concurrent processes never read a partially written entry
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+            pickle.dump((source_hashes, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self._path(key, suffix))
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used (i.e. loaded or stored) entries if the cache dir holds too many files"""
+        paths = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith((".pkl", ".help")):
+                try:
+                    paths.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    pass  # removed by a concurrent process
+        paths.sort()
+        for _, path in paths[: max(0, len(paths) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
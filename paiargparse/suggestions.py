@@ -0,0 +1,168 @@
+"""Index of option strings to suggest alternatives for unknown arguments.
+
+An unknown argument is compared to the options that share the most '.' separated components with it (e.g.
+"--root.levle.p1" and "--root.level.p1" share "--root" and "p1"), the closest options (edit distance) are suggested.
+The components are stored in an inverted index so that only options sharing a component are visited.
+
+If no option shares more than one component (except the ones that are part of every option), all options are
+candidates. In this case, the distances to the options that share a component give an upper bound d of the distance
+of the suggestions. Since each edit changes at most three trigrams, only options that share enough trigrams with the
+argument are compared. Without such a bound, the options are visited sorted by their difference in length to the
+argument (a lower bound of the edit distance) until no closer option can follow.
+
+The index is built lazily (on the first unknown argument) and is reused as long as the options do not change.
+"""
+import bisect
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def edit_distance(a: str, b: str) -> int:
+    # import lazily, suggestions are only required if an error occurred
+    import editdistance
+
+    return editdistance.eval(a, b)
+
+
+def _trigrams(s: str) -> Set[str]:
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class _InvertedIndex:
+    """Map keys (e.g. components or trigrams) to the indices of the options that contain them"""
+
+    def __init__(self, keys_of_options: Iterable[Set[str]]):
+        self.num_options = 0
+        self.postings: Dict[str, List[int]] = {}
+        for i, keys in enumerate(keys_of_options):
+            self.num_options += 1
+            for key in keys:
+                self.postings.setdefault(key, []).append(i)
+
+    def count(self, keys: Set[str]) -> Tuple[Counter, int]:
+        """Count the keys that each option shares with the given ones.
+
+        Keys that are part of every option are not counted (they do not change the ranking), their number is
+        returned as second value.
+        """
+        common = Counter()
+        num_shared_by_all = 0
+        for key in keys:
+            posting = self.postings.get(key, [])
+            if len(posting) == self.num_options:
+                num_shared_by_all += 1
+            else:
+                common.update(posting)
+        return common, num_shared_by_all
+
+
+class _NearestOptions:
+    """The n_best closest options to arg that were visited so far"""
+
+    def __init__(self, arg: str, option_strings: List[str], n_best: int):
+        self.arg = arg
+        self.option_strings = option_strings
+        self.n_best = n_best
+        self.best: List[Tuple[int, int]] = []  # max heap of (-distance, -index)
+        self.visited: Set[int] = set()
+
+    def max_distance(self) -> Optional[int]:
+        """Upper bound of the distance of the n_best closest options (None if less than n_best were visited)"""
+        return -self.best[0][0] if len(self.best) == self.n_best else None
+
+    def visit(self, i: int):
+        if i in self.visited:
+            return
+        self.visited.add(i)
+        d = edit_distance(self.arg, self.option_strings[i])
+        if len(self.best) < self.n_best:
+            heapq.heappush(self.best, (-d, -i))
+        elif (d, i) < (-self.best[0][0], -self.best[0][1]):
+            heapq.heapreplace(self.best, (-d, -i))
+
+    def result(self) -> List[int]:
+        return [-i for _, i in sorted(self.best, key=lambda x: (-x[0], -x[1]))]
+
+
+class SuggestionIndex:
+    """Suggest the most similar option strings to a given (unknown) argument."""
+
+    def __init__(self, option_strings: Iterable[str]):
+        self.option_strings: List[str] = list(dict.fromkeys(option_strings))  # unique, but keep the order
+        self._components = _InvertedIndex(set(o.split(".")) for o in self.option_strings)
+        self._trigrams: Optional[_InvertedIndex] = None
+        self._by_length: Optional[List[Tuple[int, int]]] = None  # (length, index) of all options, sorted
+
+    def __len__(self):
+        return len(self.option_strings)
+
+    def suggest(self, arg: str, n_best=1) -> List[str]:
+        common, _ = self._components.count(set(arg.split(".")))
+        max_common = max(common.values(), default=0)
+        if max_common <= 1:
+            # also options with max_common - 1 (= 0) common components are candidates, i.e. all options
+            nearest = _NearestOptions(arg, self.option_strings, n_best)
+            for i in common:
+                nearest.visit(i)
+            self._visit_by_trigrams(nearest)
+            self._visit_by_length(nearest)
+            return [self.option_strings[i] for i in nearest.result()]
+
+        # also allow max_common - 1 to add a bit more variance
+        candidates = [i for i, c in common.items() if c >= max_common - 1]
+        distances = sorted((edit_distance(arg, self.option_strings[i]), i) for i in candidates)
+        return [self.option_strings[i] for _, i in distances[:n_best]]
+
+    def _visit_by_trigrams(self, nearest: _NearestOptions):
+        """Visit all options that share enough trigrams with arg to be within the current max distance"""
+        max_distance = nearest.max_distance()
+        arg_trigrams = _trigrams(nearest.arg)
+        if max_distance is None or len(arg_trigrams) <= 3 * max_distance:
+            # no bound for the number of common trigrams
+            return
+
+        if self._trigrams is None:
+            self._trigrams = _InvertedIndex(_trigrams(o) for o in self.option_strings)
+        common, num_shared_by_all = self._trigrams.count(arg_trigrams)
+        min_common = len(arg_trigrams) - 3 * max_distance - num_shared_by_all
+        for i, c in common.items():
+            if c >= min_common:
+                nearest.visit(i)
+        if min_common > 0:
+            # all remaining options are farther
+            nearest.visited.update(range(len(self.option_strings)))
+
+    def _visit_by_length(self, nearest: _NearestOptions):
+        """Visit the options sorted by their difference in length to arg until no closer option can follow"""
+        if len(nearest.visited) == len(self.option_strings):
+            return
+        if self._by_length is None:
+            self._by_length = sorted((len(o), i) for i, o in enumerate(self.option_strings))
+
+        # walk to shorter (left) and longer (right) options starting at the length of arg
+        length = len(nearest.arg)
+        right = bisect.bisect_left(self._by_length, (length, -1))
+        left = right - 1
+        while left >= 0 or right < len(self._by_length):
+            left_diff = length - self._by_length[left][0] if left >= 0 else None
+            right_diff = self._by_length[right][0] - length if right < len(self._by_length) else None
+            if right_diff is None or (left_diff is not None and left_diff <= right_diff):
+                length_diff, i = left_diff, self._by_length[left][1]
+                left -= 1
+            else:
+                length_diff, i = right_diff, self._by_length[right][1]
+                right += 1
+
+            max_distance = nearest.max_distance()
+            if max_distance is not None and length_diff > max_distance:
+                # the edit distance is at least the difference in length
+                break
+            nearest.visit(i)
+
+
+@lru_cache(maxsize=8)
+def suggestion_index(option_strings: Tuple[str, ...]) -> SuggestionIndex:
+    """Cached index, to reuse it for several parses with the same options"""
+    return SuggestionIndex(option_strings)
@@ -0,0 +1,91 @@
+"""Expand the command line of a sweep into the args of all its combinations, see `PAIArgumentParser.sweep`.
+
+An option that is followed by a single value with commas (e.g. `--trainer.lr 1e-3,1e-4` or `--trainer.lr=1e-3,1e-4`)
+is a dimension of the sweep, the results are the Cartesian product of all dimensions (the last one varies fastest).
+Use `\\,` for a comma in a swept value that does not separate values (e.g. `--a.p x\\,y,z` sweeps `x,y` and `z`).
+Values of options that are not sweepable (e.g. str fields, see `PAIArgumentParser.sweep`) are never split, they and all
+other args that are not swept are passed unchanged, as to `parse_args`.
+
+As when parsing, the last occurrence of a repeated option wins: if any occurrence of an option is swept, only its last
+occurrence is kept, so `--trainer.lr 1,2 --trainer.lr 5` does not sweep.
+"""
+import itertools
+import re
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+_SEPARATOR = re.compile(r"(?<!\\),")
+
+
+class SweepArgs(NamedTuple):
+    fixed: List[str]  # the args that are the same for all combinations
+    dimensions: List[List[List[str]]]  # the alternative args of each dimension
+    positions: List[int]  # index in `fixed` where the args of each dimension are inserted to keep the original order
+
+    def combinations(self) -> Iterator[List[str]]:
+        """The full args of all combinations"""
+        for alternatives in itertools.product(*self.dimensions):
+            args = []
+            start = 0
+            for position, alternative in zip(self.positions, alternatives):
+                args += self.fixed[start:position] + alternative
+                start = position
+            yield args + self.fixed[start:]
+
+    def num_combinations(self) -> int:
+        n = 1
+        for alternatives in self.dimensions:
+            n *= len(alternatives)
+        return n
+
+
+def _unescape(arg: str) -> str:
+    return arg.replace("\\,", ",")
+
+
+def split_sweep_args(
+    args: List[str], is_option: Callable[[str], bool], is_sweepable: Callable[[str], bool] = lambda option: True
+) -> SweepArgs:
+    """Split args into the fixed args and the dimensions of the sweep"""
+    fixed: List[str] = []
+    dimensions: List[List[List[str]]] = []
+    positions: List[int] = []
+
+    # option strings and the args that follow them
+    groups: List[Tuple[str, List[str]]] = []
+    for i, arg in enumerate(args):
+        if arg == "--":
+            # all following args are positionals
+            groups.append((arg, args[i + 1 :]))
+            break
+        elif is_option(arg) or not groups:
+            groups.append((arg, []))
+        else:
+            groups[-1][1].append(arg)
+
+    # the option, explicit value (--option=value) and the swept values of each group (None if not swept)
+    parsed: List[Tuple[str, Optional[str], Optional[List[str]]]] = []
+    for arg, values in groups:
+        option, explicit = arg.split("=", 1) if is_option(arg) and "=" in arg else (arg, None)
+        swept = None
+        if arg != "--" and is_option(arg) and is_sweepable(option):
+            if explicit is not None and not values and _SEPARATOR.search(explicit):
+                swept = _SEPARATOR.split(explicit)
+            elif explicit is None and len(values) == 1 and _SEPARATOR.search(values[0]):
+                swept = _SEPARATOR.split(values[0])
+        parsed.append((option, explicit, swept))
+
+    swept_options = {option for option, _, swept in parsed if swept is not None}
+    last_group = {option: i for i, (option, _, _) in enumerate(parsed) if option in swept_options}
+    for i, ((arg, values), (option, explicit, swept)) in enumerate(zip(groups, parsed)):
+        if option in last_group and last_group[option] != i:
+            continue  # overridden by a later occurrence
+        if swept is not None:
+            if explicit is not None:
+                dimensions.append([[f"{option}={_unescape(v)}"] for v in swept])
+            else:
+                dimensions.append([[option, _unescape(v)] for v in swept])
+            positions.append(len(fixed))
+        else:
+            fixed.append(arg)
+            fixed.extend(values)
+    return SweepArgs(fixed, dimensions, positions)
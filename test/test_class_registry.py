@@ -0,0 +1,84 @@
+import gc
+import importlib
+import unittest
+import weakref
+from dataclasses import dataclass, make_dataclass
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse import class_registry
+from paiargparse.class_registry import choices_by_name, classes_by_name, registered_subclasses, resolve_class
+from test.dataclasse_setup import Level1, Level2a, Level3a, Level3aa
+
+
+@dataclass
+class NotRegistered:
+    p: int = 0
+
+
+class TestClassRegistry(unittest.TestCase):
+    def test_lookup_registered(self):
+        self.assertIs(Level3aa, resolve_class("test.dataclasse_setup:Level3aa"))
+        self.assertDictEqual({"test.dataclasse_setup:Level3aa": Level3aa}, registered_subclasses(Level3aa))
+
+    def test_resolve_imports_once(self):
+        with mock.patch.object(
+            class_registry.importlib, "import_module", wraps=importlib.import_module
+        ) as import_module:
+            for _ in range(3):
+                self.assertIs(Level3aa, resolve_class("test.dataclasse_setup:Level3aa"))
+                self.assertIs(NotRegistered, resolve_class("test.test_class_registry:NotRegistered"))
+                # re-exported class
+                self.assertIs(Level2a, resolve_class("test.test_class_registry:Level2a"))
+        self.assertLessEqual(import_module.call_count, 2)
+
+    def test_resolve_errors(self):
+        with self.assertRaises(ValueError):
+            resolve_class("Level3aa")
+        with self.assertRaises(AttributeError):
+            resolve_class("test.dataclasse_setup:DoesNotExist")
+
+    def test_lookup_by_name(self):
+        self.assertListEqual([Level3aa], classes_by_name("Level3aa"))
+        self.assertListEqual([Level3aa], classes_by_name("AlternativeLevel3"))
+        self.assertListEqual([], classes_by_name("DoesNotExist"))
+
+    def test_keep_first_class_of_name(self):
+        shadow = make_dataclass("Level3aa", [("p", int, 0)])
+        shadow.__module__ = "test.dataclasse_setup"
+        pai_dataclass(shadow)
+        self.assertIs(Level3aa, resolve_class("test.dataclasse_setup:Level3aa"))
+        self.assertListEqual([Level3aa], classes_by_name("Level3aa"))
+
+    def test_choices_by_name(self):
+        choices = choices_by_name((Level3a, Level3aa))
+        self.assertDictEqual({"Level3a": Level3a, "Level3aa": Level3aa, "AlternativeLevel3": Level3aa}, dict(choices))
+        # the index is cached
+        self.assertIs(choices, choices_by_name((Level3a, Level3aa)))
+        self.assertIsNot(choices, choices_by_name((Level3aa, Level3a)))
+
+    def test_registry_does_not_keep_classes_alive(self):
+        cls = pai_dataclass(make_dataclass("DynamicClass", [("p", int, 0)]))
+        self.assertIs(cls, resolve_class(f"{cls.__module__}:DynamicClass"))
+        self.assertIs(cls, choices_by_name((cls,))["DynamicClass"])
+        ref = weakref.ref(cls)
+        del cls
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertNotIn("types:DynamicClass", class_registry._classes)
+        self.assertListEqual([], classes_by_name("DynamicClass"))
+        self.assertEqual(0, sum(len(key) == 1 and key[0]() is None for key in class_registry._choices_indices))
+
+    def test_parse_without_import(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("arg", Level1)
+        with mock.patch.object(class_registry.importlib, "import_module", side_effect=AssertionError):
+            arg = parser.parse_args(
+                ["--arg.l", "test.dataclasse_setup:Level2a", "--arg.l.lvl3", "AlternativeLevel3"]
+            ).arg
+        self.assertIsInstance(arg.l, Level2a)
+        self.assertIsInstance(arg.l.lvl3, Level3aa)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse.completion import completion_index, schema_fingerprint, write_completion
+from test.dataclasse_setup import Level1, Level2a
+
+
+class Color(str, Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@pai_dataclass
+@dataclass
+class Settings:
+    color: Color = Color.RED
+    verbose: bool = False
+
+
+@pai_dataclass
+@dataclass
+class SettingsList:
+    settings: List[Settings] = field(default_factory=lambda: [Settings()])
+
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+
+
+def create_parser(prog="my_cli"):
+    parser = PAIArgumentParser(prog=prog)
+    parser.add_root_argument("root", Level1)
+    parser.add_root_argument("settings", Settings)
+    return parser
+
+
+class TestCompletion(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_index(self):
+        flags = completion_index(create_parser()).flags
+        self.assertIn("--help", flags)
+        self.assertIn("test.dataclasse_setup:Level2b", flags["--root.l"])
+        # choices with alternative names
+        self.assertEqual(["Level3a", "Level3aa", "AlternativeLevel3"], flags["--root.l.lvl3"])
+        # fields of dataclasses that are not selected by default
+        self.assertIn("--root.l.p1a", flags)
+        self.assertIn("--root.l.lvl3.q", flags)
+        self.assertEqual(["True", "False"], flags["--root.l.pb"])
+        self.assertEqual(["RED", "GREEN", "red", "green"], flags["--settings.color"])
+        self.assertEqual(["True", "False"], flags["--settings.verbose"])
+        self.assertEqual([], flags["--root.p1"])
+
+    def test_index_of_args(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Level1, default=Level1(l=Level2a()))
+        self.assertIn("--root.l.p1a", completion_index(parser, ["--root.l", "test.dataclasse_setup:Level2a"]).flags)
+
+    def test_regenerate_if_schema_changed(self):
+        path = self.path("completion.bash")
+        self.assertTrue(write_completion(create_parser(), path))
+        self.assertFalse(write_completion(create_parser(), path))
+        self.assertTrue(write_completion(create_parser(), path, force=True))
+        self.assertTrue(write_completion(create_parser(prog="other"), path))
+
+        parser = create_parser(prog="other")
+        parser.add_root_argument("other", Settings)
+        self.assertTrue(write_completion(parser, path))
+        self.assertFalse(write_completion(parser, path))
+
+        with mock.patch("paiargparse.completion.module_source_hash", return_value="changed"):
+            self.assertTrue(write_completion(parser, path))
+
+    def test_regenerate_zsh(self):
+        path = self.path("completion.zsh")
+        self.assertTrue(write_completion(create_parser(), path))
+        self.assertFalse(write_completion(create_parser(), path))
+        with mock.patch("paiargparse.completion.module_source_hash", return_value="changed"):
+            self.assertTrue(write_completion(create_parser(), path))
+
+    def test_regenerate_in_other_process(self):
+        code = (
+            "import sys; from paiargparse.completion import write_completion; "
+            "from test.test_completion import create_parser; print(write_completion(create_parser(), sys.argv[1]))"
+        )
+        for shell in ["bash", "zsh", "json"]:
+            path = self.path(f"completion.{shell}")
+            written = [
+                subprocess.run(
+                    [sys.executable, "-c", code, path],
+                    cwd=os.path.join(this_dir, ".."),
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+                for _ in range(2)
+            ]
+            self.assertEqual(["True", "False"], written, shell)
+
+    def test_fingerprint_of_default(self):
+        def fingerprint(default):
+            parser = PAIArgumentParser(prog="my_cli")
+            parser.add_root_argument("root", SettingsList, default)
+            return schema_fingerprint(parser, [], "bash", "my_cli")
+
+        self.assertEqual(fingerprint(SettingsList()), fingerprint(SettingsList()))
+        self.assertNotEqual(fingerprint(SettingsList()), fingerprint(SettingsList(settings=[Settings(), Settings()])))
+
+    def test_json_index(self):
+        path = self.path("completion.json")
+        self.assertTrue(write_completion(create_parser(), path))
+        self.assertFalse(write_completion(create_parser(), path))
+        with open(path) as f:
+            content = json.load(f)
+        self.assertEqual("my_cli", content["prog"])
+        self.assertIn("test.dataclasse_setup", content["modules"])
+        self.assertEqual(["RED", "GREEN", "red", "green"], content["flags"]["--settings.color"])
+
+    def test_invalid_shell(self):
+        self.assertRaises(ValueError, write_completion, create_parser(), self.path("completion"), shell="fish")
+
+    @unittest.skipIf(shutil.which("bash") is None, "bash is not installed")
+    def test_bash(self):
+        path = self.path("completion.bash")
+        write_completion(create_parser(), path)
+
+        def complete(*words):
+            script = (
+                f"source {path}; COMP_WORDS=(my_cli {' '.join(words)}); COMP_CWORD={len(words)}; "
+                f'_paiargparse_complete_my_cli; echo "${{COMPREPLY[@]}}"'
+            )
+            return subprocess.run(["bash", "-c", script], capture_output=True, text=True, check=True).stdout.split()
+
+        self.assertEqual(["--settings.color"], complete("--settings.c"))
+        self.assertEqual(["--root.l.lvl3.p", "--root.l.lvl3.t", "--root.l.lvl3.q"], complete("--root.l.lvl3."))
+        self.assertEqual(["green"], complete("--settings.color", "g"))
+        self.assertEqual(["Level3a", "Level3aa"], complete("--root.p1", "1", "--root.l.lvl3", "Level"))
+
+
+if __name__ == "__main__":
+    unittest.main()
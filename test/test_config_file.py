@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse import config_file
+from test.dataclasse_setup import Level1, Level2, Level2a, Level3aa
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    p: int = 0
+    values: List[int] = field(default_factory=lambda: [1, 2])
+    level1: Level1 = field(default_factory=Level1)
+
+
+@pai_dataclass
+@dataclass
+class Other:
+    q: float = 0.5
+
+
+class TestConfigFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "config.json")
+        self.config = Root(p=3, values=[4], level1=Level1(p1=5, l=Level2a(p1a=0.5, lvl3=Level3aa(q=7))))
+        self.write(self.config.to_json())
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write(self, content: str):
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    def parse(self, args, add_config=True, **kwargs):
+        parser = PAIArgumentParser(add_config=add_config)
+        parser.add_root_argument("root", Root, **kwargs)
+        return parser.parse_args(args)
+
+    def test_config_from_command_line(self):
+        args = self.parse(["--config", self.path])
+        self.assertEqual(self.config, args.root)
+        self.assertNotIn("config", vars(args))
+        self.assertIsInstance(args.root.level1.l.lvl3, Level3aa)
+
+    def test_command_line_overrides_config(self):
+        args = self.parse(["--root.p", "8", "--config", self.path, "--root.level1.l.p1a", "0.25"])
+        self.assertEqual(8, args.root.p)
+        self.assertEqual([4], args.root.values)
+        self.assertEqual(0.25, args.root.level1.l.p1a)
+        self.assertEqual(Level3aa(q=7), args.root.level1.l.lvl3)
+
+        args = self.parse(["--config", self.path, "--root.level1.l", "test.dataclasse_setup:Level2"])
+        self.assertIs(Level2, type(args.root.level1.l))
+        self.assertEqual(5, args.root.level1.p1)
+
+    def test_programmatic_config(self):
+        self.assertEqual(self.config, self.parse([], add_config=False, config=self.path).root)
+        self.assertEqual(9, self.parse(["--root.p", "9"], config=self.path).root.p)
+        self.assertRaises(ValueError, self.parse, [], config=self.path, default=Root())
+
+        other_path = os.path.join(self.tmp_dir.name, "other.json")
+        with open(other_path, "w") as f:
+            f.write(Root(p=10).to_json())
+        self.assertEqual(10, self.parse(["--config", other_path], config=self.path).root.p)
+
+    def test_several_root_arguments(self):
+        self.write(json.dumps({"root": self.config.to_dict(), "other": {"q": 1.5}}))
+        parser = PAIArgumentParser(add_config=True)
+        parser.add_root_argument("root", Root)
+        parser.add_root_argument("other", Other)
+        parser.add_root_argument("default", Other)
+        args = parser.parse_args(["--config", self.path])
+        self.assertEqual(self.config, args.root)
+        self.assertEqual(Other(q=1.5), args.other)
+        self.assertEqual(Other(), args.default)
+
+        self.write(self.config.to_json())
+        self.assertRaises(ValueError, parser.parse_args, ["--config", self.path])
+
+    def test_invalid_type(self):
+        self.write(Other().to_json())
+        self.assertRaises(TypeError, self.parse, ["--config", self.path])
+
+    def test_parsed_file_is_cached(self):
+        with mock.patch.object(config_file, "json_backend", wraps=config_file.json_backend) as backend:
+            self.parse(["--config", self.path])
+            self.parse(["--config", self.path])
+            self.assertEqual(1, backend.call_count)
+
+            # the changed file is read again
+            self.write(Root(p=11).to_json() + " ")
+            self.assertEqual(11, self.parse(["--config", self.path]).root.p)
+            self.assertEqual(2, backend.call_count)
+
+    def test_decoded_config_is_cached(self):
+        with mock.patch.object(config_file, "config_from_dict", wraps=config_file.config_from_dict) as decode:
+            for _ in range(3):
+                self.assertEqual(self.config, self.parse(["--config", self.path]).root)
+                self.assertEqual(self.config, self.parse([], add_config=False, config=self.path).root)
+            self.assertEqual(2, decode.call_count)
+
+    def test_modified_result_does_not_change_cache(self):
+        content = config_file.read_config(self.path)
+        content["p"] = 100
+        self.assertEqual(3, config_file.read_config(self.path)["p"])
+
+        config = config_file.load_config(self.path, Root)
+        config.values.append(100)
+        config.level1.p1 = 100
+        self.assertEqual(self.config, config_file.load_config(self.path, Root))
+
+        args = self.parse(["--config", self.path])
+        args.root.values.append(100)
+        self.assertEqual(self.config, self.parse(["--config", self.path]).root)
+
+    def test_help(self):
+        parser = PAIArgumentParser(add_config=True)
+        parser.add_root_argument("root", Root)
+        self.assertIn("--config PATH", parser.format_help())
+
+
+if __name__ == "__main__":
+    unittest.main()
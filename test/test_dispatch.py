@@ -0,0 +1,65 @@
+import unittest
+from dataclasses import make_dataclass, field
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse.dataclass_parser import PAIDataClassArgumentParser, UnknownArgumentError
+
+NUM_FIELDS = 2000
+
+LargeDC = pai_dataclass(make_dataclass("LargeDC", [(f"f{i}", int, field(default=i)) for i in range(NUM_FIELDS)]))
+AbbrevDC = pai_dataclass(make_dataclass("AbbrevDC", [("long_name", int, field(default=0))]))
+
+
+class TestDispatch(unittest.TestCase):
+    def test_large_schema(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", LargeDC)
+        with mock.patch.object(PAIDataClassArgumentParser, "_get_option_tuples", side_effect=AssertionError):
+            root = parser.parse_args(["--root.f3", "-3", f"--root.f{NUM_FIELDS - 1}=-1"]).root
+
+        self.assertEqual(root.f0, 0)
+        self.assertEqual(root.f3, -3)
+        self.assertEqual(getattr(root, f"f{NUM_FIELDS - 1}"), -1)
+
+    def test_unknown_without_scanning(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", LargeDC)
+        with mock.patch.object(PAIDataClassArgumentParser, "_get_option_tuples", side_effect=AssertionError):
+            namespace, argv = parser.parse_known_args(["--root.f1", "1", f"--root.f{NUM_FIELDS}", "2", "--root.f2=3"])
+        self.assertListEqual(argv, [f"--root.f{NUM_FIELDS}", "2"])
+        self.assertEqual(namespace.root.f1, 1)
+        self.assertEqual(namespace.root.f2, 3)
+
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", LargeDC)
+        with self.assertRaises(UnknownArgumentError):
+            parser.parse_args([f"--root.f{NUM_FIELDS}=2"])
+
+    def test_dispatch_consumes_the_values_of_an_option_once(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", LargeDC)
+        with self.assertRaises(SystemExit):
+            # expected exactly one argument
+            parser.parse_args(["--root.f1"])
+
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", LargeDC)
+        namespace, argv = parser.parse_known_args(["--root.f1", "1", "2"])
+        self.assertListEqual(argv, ["2"])
+
+    def test_abbreviations(self):
+        parser = PAIArgumentParser(allow_abbrev=True)
+        parser.add_root_argument("root", AbbrevDC)
+        root = parser.parse_args(["--root.long", "2"]).root
+        self.assertEqual(root.long_name, 2)
+
+        parser = PAIArgumentParser(allow_abbrev=True)
+        parser.add_root_argument("root", LargeDC)
+        with self.assertRaises(SystemExit):
+            # ambiguous option
+            parser.parse_args(["--root.f1999", "1", "--root.f", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
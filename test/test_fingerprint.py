@@ -0,0 +1,121 @@
+import datetime
+import os
+import subprocess
+import sys
+import unittest
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from paiargparse import fingerprint, pai_dataclass, pai_meta
+from test.dataclasse_setup import Level1, Level2, Level2a
+
+
+class Mode(Enum):
+    TRAIN = "train"
+    EVAL = "eval"
+
+
+@pai_dataclass
+@dataclass
+class Experiment:
+    lr: float = 0.001
+    epochs: int = 10
+    name: str = "exp"
+    mode: Mode = Mode.TRAIN
+    tags: Set[str] = field(default_factory=lambda: {"a", "b", "c"})
+    weights: Dict[str, float] = field(default_factory=lambda: {"x": 1.0, "y": 2.0})
+    layers: List[int] = field(default_factory=lambda: [1, 2, 3])
+    level1: Level1 = field(default_factory=Level1)
+    seed: Optional[int] = None
+    start: datetime.datetime = datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+    decimal: Decimal = Decimal("1.5")
+    uuid: UUID = UUID(int=1)
+    output_dir: str = field(default="out", metadata=pai_meta(fingerprint=False))
+
+
+CODE = """
+import sys
+sys.path.insert(0, {root!r})
+from paiargparse import fingerprint
+from test.test_fingerprint import Experiment
+print(fingerprint(Experiment()).hex())
+"""
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertEqual(fingerprint(Experiment()), fingerprint(Experiment()))
+        self.assertEqual(32, len(fingerprint(Experiment())))
+        # the order of sets and dicts does not matter
+        self.assertEqual(
+            fingerprint(Experiment()),
+            fingerprint(Experiment(tags={"c", "b", "a"}, weights={"y": 2.0, "x": 1.0})),
+        )
+
+    def test_stable_across_processes(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        fingerprints = {
+            subprocess.run(
+                [sys.executable, "-c", CODE.format(root=root)],
+                env=dict(os.environ, PYTHONHASHSEED=str(seed)),
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+            for seed in range(3)
+        }
+        self.assertEqual({fingerprint(Experiment()).hex()}, fingerprints)
+
+    def test_stable_encoding(self):
+        # the fingerprint must only change if the encoding is changed deliberately, this is sha256 of
+        # b"l6:i1;f1.5;s1:aNTM1:s1:kl1:i2;"
+        self.assertEqual(
+            "5ffaf1432b2a41d3035acf2aaf48c3048820c42cadb572aeb7a8677822dd360f",
+            fingerprint([1, 1.5, "a", None, True, {"k": (2,)}]).hex(),
+        )
+
+    def test_changes(self):
+        base = fingerprint(Experiment())
+        changed = [
+            Experiment(lr=0.002),
+            Experiment(epochs=11),
+            Experiment(name="exp2"),
+            Experiment(mode=Mode.EVAL),
+            Experiment(tags={"a", "b"}),
+            Experiment(weights={"x": 1.0, "y": 3.0}),
+            Experiment(layers=[1, 3, 2]),
+            Experiment(level1=Level1(p1=1)),
+            Experiment(seed=0),
+            Experiment(decimal=Decimal("1.50")),
+        ]
+        fingerprints = [fingerprint(e) for e in changed]
+        self.assertNotIn(base, fingerprints)
+        self.assertEqual(len(fingerprints), len(set(fingerprints)))
+
+        # types are distinguished
+        self.assertNotEqual(fingerprint(1), fingerprint(1.0))
+        self.assertNotEqual(fingerprint(1), fingerprint("1"))
+        self.assertNotEqual(fingerprint(["ab", "c"]), fingerprint(["a", "bc"]))
+        self.assertNotEqual(fingerprint({"1": 1}), fingerprint({1: 1}))
+        self.assertEqual(fingerprint({1: "a", "b": 2}), fingerprint({"b": 2, 1: "a"}))
+
+    def test_cls(self):
+        self.assertNotEqual(fingerprint(Level1(l=Level2())), fingerprint(Level1(l=Level2a())))
+        self.assertEqual(fingerprint(Level1(l=Level2a())), fingerprint(Level1(l=Level2a())))
+
+    def test_exclude_marked(self):
+        self.assertEqual(fingerprint(Experiment()), fingerprint(Experiment(output_dir="other")))
+        self.assertNotEqual(
+            fingerprint(Experiment(), exclude_marked=False),
+            fingerprint(Experiment(output_dir="other"), exclude_marked=False),
+        )
+
+    def test_unsupported_type(self):
+        self.assertRaises(TypeError, fingerprint, object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import copy
+import pickle
+import unittest
+from dataclasses import FrozenInstanceError, dataclass, field
+from typing import Dict, List, Set
+
+from paiargparse import PAIArgumentParser, pai_dataclass, pai_meta
+from paiargparse.frozen import FrozenDict, freeze
+
+
+@pai_dataclass(frozen=True)
+@dataclass
+class Layer:
+    units: int = 10
+    activation: str = "relu"
+
+
+@pai_dataclass(frozen=True)
+@dataclass
+class Conv(Layer):
+    kernel: List[int] = field(default_factory=lambda: [3, 3])
+
+
+@pai_dataclass(frozen=True)
+@dataclass
+class Model:
+    layers: List[Layer] = field(default_factory=lambda: [Layer(), Conv()])
+    tags: Set[str] = field(default_factory=set)
+    options: Dict[str, List[int]] = field(default_factory=lambda: {"a": [1, 2]})
+    head: Layer = field(default_factory=Layer, metadata=pai_meta(choices=[Layer, Conv]))
+    name: str = "model"
+
+
+@pai_dataclass(frozen=True, slots=True)
+@dataclass
+class SlottedModel:
+    layers: List[Layer] = field(default_factory=lambda: [Layer()])
+
+
+class TestFrozen(unittest.TestCase):
+    def test_immutable(self):
+        model = Model()
+        self.assertIsInstance(model.layers, tuple)
+        self.assertIsInstance(model.layers[1].kernel, tuple)
+        self.assertIsInstance(model.tags, frozenset)
+        self.assertIsInstance(model.options, FrozenDict)
+        self.assertEqual((1, 2), model.options["a"])
+        with self.assertRaises(FrozenInstanceError):
+            model.name = "other"
+        with self.assertRaises(FrozenInstanceError):
+            del model.name
+        with self.assertRaises(TypeError):
+            model.options["b"] = (1,)
+        with self.assertRaises(FrozenInstanceError):
+            SlottedModel().layers = ()
+
+    def test_hash(self):
+        self.assertEqual(hash(Model()), hash(Model()))
+        self.assertNotEqual(hash(Model()), hash(Model(name="other")))
+        self.assertNotEqual(Layer(), Conv(kernel=[]))
+        cache = {Model(): 1, SlottedModel(): 2}
+        self.assertEqual(1, cache[Model(layers=[Layer(), Conv(kernel=(3, 3))])])
+        self.assertEqual(2, cache[SlottedModel()])
+
+    def test_hash_is_cached(self):
+        model = Model(tags={"a"})
+        h = hash(model)
+        object.__setattr__(model, "name", "changed")  # bypass the frozen check
+        self.assertEqual(h, hash(model))
+
+    def test_serialization(self):
+        model = Model(tags={"a", "b"}, head=Conv(units=2))
+        self.assertEqual(model, Model.from_dict(model.to_dict()))
+        self.assertEqual(model, Model.from_json(model.to_json()))
+        for m in [model, SlottedModel()]:
+            for copied in [pickle.loads(pickle.dumps(m)), copy.deepcopy(m), copy.copy(m)]:
+                self.assertEqual(m, copied)
+                self.assertEqual(hash(m), hash(copied))
+                with self.assertRaises(FrozenInstanceError):
+                    copied.layers = ()
+
+    def test_parse(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("model", Model, default=Model(tags={"x"}))
+        model = parser.parse_args(
+            ["--model.layers.1.kernel", "5", "5", "--model.head", "Conv", "--model.head.units", "3"]
+        ).model
+        self.assertEqual(Model(layers=[Layer(), Conv(kernel=[5, 5])], tags={"x"}, head=Conv(units=3)), model)
+        self.assertIsInstance(model.layers, tuple)
+        self.assertIsInstance(model.layers[1].kernel, tuple)
+        self.assertEqual(
+            hash(Model(layers=[Layer(), Conv(kernel=[5, 5])], tags={"x"}, head=Conv(units=3))), hash(model)
+        )
+
+    def test_freeze(self):
+        self.assertEqual(FrozenDict(a=(1, frozenset({2}))), freeze({"a": [1, {2}]}))
+        self.assertEqual(FrozenDict(a=1), pickle.loads(pickle.dumps(FrozenDict(a=1))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import List
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass, schema_cache
+from paiargparse.help_formatter import MAX_DEFAULT_LENGTH, short_default
+from paiargparse.main_parser import MAX_HELP_CACHE_ENTRIES
+from test.dataclasse_setup import Level1
+
+
+@pai_dataclass
+@dataclass
+class Huge:
+    values: List[int] = field(default_factory=lambda: list(range(100000)))
+    text: str = "x" * 1000
+    level: Level1 = field(default_factory=Level1)
+
+
+def make_parser(**kwargs) -> PAIArgumentParser:
+    parser = PAIArgumentParser(**kwargs)
+    parser.add_root_argument("root", Huge)
+    return parser
+
+
+class TestShortDefault(unittest.TestCase):
+    def test_short_values(self):
+        self.assertEqual("5", short_default(5))
+        self.assertEqual("abc", short_default("abc"))
+        self.assertEqual("[1, 2]", short_default([1, 2]))
+
+    def test_truncate(self):
+        self.assertEqual(MAX_DEFAULT_LENGTH, len(short_default("x" * 1000)))
+        self.assertTrue(short_default("x" * 1000).endswith("..."))
+        self.assertTrue(short_default(list(range(100000))).endswith("(100000 items)"))
+        self.assertTrue(short_default({i: i for i in range(100)}).endswith("(100 items)"))
+        self.assertLess(len(short_default([list(range(1000))] * 1000)), 3 * MAX_DEFAULT_LENGTH)
+
+
+class TestHelp(unittest.TestCase):
+    def test_truncated_defaults(self):
+        parser = make_parser()
+        parser.parse_args([])
+        help_text = parser.format_help()
+        self.assertIn("(100000 items)", help_text)
+        self.assertNotIn("99999", help_text)
+        self.assertNotIn("x" * (MAX_DEFAULT_LENGTH + 1), help_text)
+        self.assertLess(len(help_text), 10000)
+
+    def test_cached_in_memory(self):
+        parser = make_parser()
+        parser.parse_args([])
+        help_text = parser.format_help()
+        with mock.patch.object(PAIArgumentParser, "_format_help") as format_help:
+            self.assertEqual(help_text, parser.format_help())
+            format_help.assert_not_called()
+
+    def test_selection_changes_help(self):
+        parser = make_parser()
+        parser.parse_args([])
+        help_text = parser.format_help()
+        parser.parse_args(["--root.level.l", "test.dataclasse_setup:Level2b"])
+        help_b = parser.format_help()
+        self.assertNotEqual(help_text, help_b)
+        self.assertIn("--root.level.l.pb", help_b)
+        parser.parse_args([])
+        self.assertEqual(help_text, parser.format_help())
+
+    def test_terminal_width_changes_help(self):
+        parser = make_parser()
+        parser.parse_args([])
+        with mock.patch.dict(os.environ, {"COLUMNS": "60"}):
+            narrow = parser.format_help()
+        with mock.patch.dict(os.environ, {"COLUMNS": "200"}):
+            wide = parser.format_help()
+        self.assertNotEqual(narrow, wide)
+
+    def test_memory_cache_is_bounded(self):
+        parser = make_parser()
+        parser.parse_args([])
+        for columns in range(60, 60 + 2 * MAX_HELP_CACHE_ENTRIES):
+            with mock.patch.dict(os.environ, {"COLUMNS": str(columns)}):
+                parser.format_help()
+        self.assertEqual(MAX_HELP_CACHE_ENTRIES, len(parser._help_cache))
+
+
+class TestHelpDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+    def format_help(self) -> str:
+        parser = make_parser(schema_cache_dir=self.cache_dir.name)
+        with redirect_stdout(io.StringIO()) as out, self.assertRaises(SystemExit):
+            parser.parse_args(["-h"])
+        return out.getvalue()
+
+    def test_load_cached_help(self):
+        help_text = self.format_help()
+        self.assertIn("--root.values", help_text)
+        self.assertTrue(any(name.endswith(".help") for name in os.listdir(self.cache_dir.name)))
+        with mock.patch.object(PAIArgumentParser, "_format_help") as format_help:
+            self.assertEqual(help_text, self.format_help())
+            format_help.assert_not_called()
+
+    def test_invalidate_on_source_change(self):
+        help_text = self.format_help()
+        with mock.patch.object(schema_cache, "module_source_hash", return_value="changed"):
+            with mock.patch.object(PAIArgumentParser, "_format_help", return_value="rendered") as format_help:
+                self.assertEqual("rendered", self.format_help())
+                format_help.assert_called_once()
+        self.assertNotEqual("rendered", help_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
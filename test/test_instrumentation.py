@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, class_registry, instrumentation
+from paiargparse.instrumentation import ENV_VARIABLE, instrument
+from test.dataclasse_setup import Level1
+
+
+def create_parser():
+    parser = PAIArgumentParser()
+    parser.add_root_argument("root", Level1)
+    return parser
+
+
+ARGS = ["--root.l", "test.dataclasse_setup:Level2a", "--root.l.lvl3.p", "3"]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_phases_and_counters(self):
+        parser = create_parser()
+        parser.parse_args([])  # expand the template
+        with instrument() as stats:
+            root = parser.parse_args(ARGS).root
+        self.assertEqual(3, root.l.lvl3.p)
+
+        phases = stats.to_dict()["phases_ms"]
+        self.assertEqual({"parse", "argparse", "build", "expand", "instantiate"}, set(phases.keys()))
+        self.assertTrue(all(t >= 0 for t in phases.values()))
+        self.assertLessEqual(phases["expand"] + phases["instantiate"], phases["parse"])
+
+        dc_parser = parser._data_class_parser
+        self.assertEqual(dc_parser._num_parse_passes, stats.counters["parse_passes"])
+        self.assertEqual(len(dc_parser._actions), stats.counters["actions"])
+        self.assertEqual(3, stats.counters["nodes"])  # root, l, lvl3
+
+    def test_imports(self):
+        class_registry._classes.pop("test.dataclasse_setup:Level2a", None)
+        with instrument() as stats:
+            create_parser().parse_args(ARGS)
+        self.assertEqual(1, stats.counters["imports"])
+        with instrument() as stats:
+            create_parser().parse_args(ARGS)
+        self.assertNotIn("imports", stats.counters)
+
+    def test_accumulate_and_nest(self):
+        parser = create_parser()
+        with instrument() as outer:
+            parser.parse_args([])
+            with instrument() as inner:
+                parser.parse_args(ARGS)
+            parser.parse_args([])
+        self.assertEqual(3, inner.counters["nodes"])
+        # only the parses outside of the inner context, which only expand the template once
+        self.assertEqual(3, outer.counters["nodes"])
+        self.assertEqual(2, len([p for p in outer.phases if p.name == "parse"]))
+
+    def test_disabled(self):
+        self.assertFalse(instrumentation.is_active())
+        self.assertIs(instrumentation.phase("parse"), instrumentation.phase("expand"))
+        with instrument() as stats:
+            pass
+        create_parser().parse_args(ARGS)
+        self.assertEqual([], stats.phases)
+        self.assertEqual({}, stats.counters)
+
+    def test_chrome_trace(self):
+        with instrument() as stats:
+            create_parser().parse_args(ARGS)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            stats.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(len(stats.phases), len(events))
+        self.assertEqual("parse", events[0]["name"])
+        self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+        self.assertEqual(stats.counters, trace["otherData"])
+
+    def test_environment_variable(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            with mock.patch.dict(os.environ, {ENV_VARIABLE: path}):
+                create_parser().parse_args(ARGS)
+            with open(path) as f:
+                trace = json.load(f)
+        self.assertIn("expand", {e["name"] for e in trace["traceEvents"]})
+        self.assertFalse(instrumentation.is_active())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import datetime
+import json
+import unittest
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from paiargparse import pai_dataclass, set_json_backend
+from paiargparse import json_backend
+from test.dataclasse_setup import Level1, Level2a, Level3aa
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@pai_dataclass
+@dataclass
+class Sample:
+    i: int = 0
+    text: str = 'äöü \\ " / \n \x01 \u2028 😀'
+    color: Color = Color.BLUE
+    date: datetime.datetime = datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+    decimal: Decimal = Decimal("1.5")
+    uuid: UUID = UUID(int=1)
+    values: List[float] = field(default_factory=lambda: [0.5, 1.5])
+    by_id: Dict[int, str] = field(default_factory=lambda: {1: "a"})
+    opt: Optional[Level1] = None
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    samples: List[Sample] = field(default_factory=lambda: [Sample(i=i) for i in range(10)])
+    level1: Level1 = field(default_factory=lambda: Level1(l=Level2a(lvl3=Level3aa())))
+
+
+class TestJsonBackend(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_json_backend(None)
+
+    def backends(self):
+        return json_backend.available_json_backends()
+
+    def test_round_trip(self):
+        root = Root()
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                data = root.to_json_bytes(backend=backend)
+                self.assertIsInstance(data, bytes)
+                decoded = Root.from_json(data, backend=backend)
+                self.assertEqual(root, decoded)
+                self.assertIsInstance(decoded.level1.l, Level2a)
+                self.assertIsInstance(decoded.level1.l.lvl3, Level3aa)
+                self.assertEqual(root, Root.from_json(root.to_json(backend=backend), backend=backend))
+
+    def test_same_values_as_dataclasses_json(self):
+        root = Root()
+        expected = json.loads(root.to_json(indent=2))  # options of json.dumps use dataclasses_json
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(expected, json.loads(root.to_json_bytes(backend=backend)))
+
+    def test_same_output_of_all_backends(self):
+        root = Root()
+        outputs = {backend: root.to_json_bytes(backend=backend) for backend in self.backends()}
+        self.assertEqual(1, len(set(outputs.values())), outputs.keys())
+        self.assertNotIn(b", ", outputs["json"])
+        self.assertEqual(outputs["json"].decode("utf-8"), root.to_json(backend="json"))
+
+    def test_default_output_of_dataclasses_json(self):
+        from dataclasses_json import DataClassJsonMixin
+
+        root = Root()
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                set_json_backend(backend)
+                self.assertEqual(DataClassJsonMixin.to_json(root), root.to_json())
+        text = Sample().to_json()
+        self.assertIn('"i": 0, ', text)
+        self.assertIn("\\u00e4", text)
+
+    def test_select_backend(self):
+        for backend in self.backends():
+            set_json_backend(backend)
+            self.assertEqual(backend, json_backend.json_backend().name)
+        set_json_backend(None)
+        self.assertEqual(self.backends()[-1], json_backend.json_backend().name)
+
+        self.assertRaises(ValueError, set_json_backend, "unknown")
+        self.assertRaises(ValueError, Root().to_json_bytes, backend="unknown")
+
+    def test_json_options(self):
+        root = Root()
+        self.assertIn("\n  ", root.to_json(indent=2))
+        self.assertEqual(root, Root.from_json(root.to_json(), parse_float=float))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import datetime
+import unittest
+import warnings
+from dataclasses import MISSING, dataclass, field, is_dataclass
+from decimal import Decimal
+from typing import Dict, List, NewType, Optional, TypeVar
+from unittest import mock
+from uuid import UUID
+
+from dataclasses_json import CatchAll, LetterCase, Undefined, config, dataclass_json
+from dataclasses_json.core import (
+    _decode_generic,
+    _decode_letter_case_overrides,
+    _is_supported_generic,
+    _support_extended_types,
+    _user_overrides_or_exts,
+)
+from dataclasses_json.utils import _handle_undefined_parameters_safe, _is_new_type, _is_optional
+
+from paiargparse import dataclass_json_overrides, pai_dataclass
+from paiargparse.class_registry import resolve_class
+from paiargparse.dataclass_extractor import type_plan
+from paiargparse.dataclass_json_overrides import _decode_dataclass
+from test.dataclasse_setup import Level1, Level2a, Level3aa
+
+
+def reference_decode_dataclass(cls, kvs, infer_missing):
+    """The previous (uncompiled) implementation of _decode_dataclass"""
+    if isinstance(kvs, cls):
+        return kvs
+
+    if "__cls__" in kvs and kvs["__cls__"] != cls.__module__ + ":" + cls.__name__:
+        cls = resolve_class(kvs["__cls__"])
+
+    plan = type_plan(cls)
+    overrides = _user_overrides_or_exts(cls)
+    kvs = {} if kvs is None and infer_missing else kvs
+    decode_names = _decode_letter_case_overrides(plan.field_names, overrides)
+    kvs = {decode_names.get(k, k): v for k, v in kvs.items()}
+    missing_fields = {field for field in plan.fields if field.name not in kvs}
+
+    for field in missing_fields:
+        if field.default is not MISSING:
+            kvs[field.name] = field.default
+        elif field.default_factory is not MISSING:
+            kvs[field.name] = field.default_factory()
+        elif infer_missing:
+            kvs[field.name] = None
+
+    kvs = _handle_undefined_parameters_safe(cls, kvs, usage="from")
+
+    init_kwargs = {}
+    types = plan.type_hints
+    for field in plan.fields:
+        if not field.init:
+            continue
+
+        field_value = kvs[field.name]
+        field_type = types[field.name]
+        if isinstance(field_type, TypeVar):
+            field_type = field_type.__bound__
+        if field_value is None and not _is_optional(field_type):
+            warning = f"value of non-optional type {field.name} detected " f"when decoding {cls.__name__}"
+            if infer_missing:
+                warnings.warn(f"Missing {warning}", RuntimeWarning)
+            else:
+                warnings.warn(f"`NoneType` object {warning}.", RuntimeWarning)
+            init_kwargs[field.name] = field_value
+            continue
+
+        while _is_new_type(field_type):
+            field_type = field_type.__supertype__
+
+        if field.name in overrides and overrides[field.name].decoder is not None:
+            if field_type is type(field_value):
+                init_kwargs[field.name] = field_value
+            else:
+                init_kwargs[field.name] = overrides[field.name].decoder(field_value)
+        elif is_dataclass(field_type):
+            if is_dataclass(field_value):
+                value = field_value
+            else:
+                value = reference_decode_dataclass(field_type, field_value, infer_missing)
+            init_kwargs[field.name] = value
+        elif _is_supported_generic(field_type) and field_type != str:
+            init_kwargs[field.name] = _decode_generic(field_type, field_value, infer_missing)
+        else:
+            init_kwargs[field.name] = _support_extended_types(field_type, field_value)
+
+    return cls(**init_kwargs)
+
+
+UserId = NewType("UserId", int)
+T = TypeVar("T", bound=Level1)
+
+
+@pai_dataclass
+@dataclass
+class Leaf:
+    i: int = 0
+    opt: Optional[int] = None
+    opt_leaf: Optional[Level2a] = None
+    user: UserId = UserId(1)
+    date: datetime.datetime = datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+    decimal: Decimal = Decimal("1.5")
+    uuid: UUID = UUID(int=1)
+    not_init: int = field(default=5, init=False)
+
+
+@dataclass
+class Overrides:
+    camel_case_name: int = field(default=1, metadata=config(letter_case=LetterCase.CAMEL))
+    decoded: int = field(default=3, metadata=config(decoder=lambda v: int(v) // 2))
+
+
+@pai_dataclass
+@dataclass_json(undefined=Undefined.INCLUDE)
+@dataclass
+class WithCatchAll:
+    p: int = 0
+    rest: CatchAll = None
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    leaves: List[Leaf] = field(default_factory=lambda: [Leaf(i=i) for i in range(5)])
+    by_name: Dict[str, Leaf] = field(default_factory=lambda: {"a": Leaf(), "b": Leaf(i=2)})
+    nested: List[List[int]] = field(default_factory=lambda: [[1, 2], [3]])
+    optional_leaves: Optional[List[Leaf]] = None
+    overrides: Overrides = field(default_factory=Overrides)
+    catch_all: WithCatchAll = field(default_factory=lambda: WithCatchAll(p=1))
+    level1: Level1 = field(default_factory=lambda: Level1(l=Level2a()))
+    generic: T = field(default_factory=Level1)
+
+
+class TestJsonDecoder(unittest.TestCase):
+    def assertSameDecoding(self, cls, kvs, infer_missing=False):
+        with warnings.catch_warnings(record=True) as expected_warnings:
+            warnings.simplefilter("always")
+            expected = reference_decode_dataclass(cls, kvs, infer_missing)
+        with warnings.catch_warnings(record=True) as actual_warnings:
+            warnings.simplefilter("always")
+            actual = _decode_dataclass(cls, kvs, infer_missing)
+        self.assertEqual(repr(expected), repr(actual))
+        self.assertEqual(len(expected_warnings), len(actual_warnings))
+        return actual
+
+    def test_same_as_reference(self):
+        d = Root(optional_leaves=[Leaf()]).to_dict()
+        d["overrides"] = {"camelCaseName": 5, "decoded": "10"}
+        d["catch_all"] = {"p": 2, "unknown": 3}
+        d["level1"]["l"]["lvl3"] = Level3aa(q=4).to_dict()
+        d["leaves"][0]["user"] = 10
+        d["leaves"][0]["opt_leaf"] = Level2a(p1a=0.5).to_dict()
+        root = self.assertSameDecoding(Root, d)
+        self.assertIsInstance(root.level1.l.lvl3, Level3aa)
+        self.assertDictEqual({"unknown": 3}, root.catch_all.rest)
+        self.assertEqual(5, root.overrides.camel_case_name)
+        self.assertEqual(5, root.overrides.decoded)
+        self.assertIsInstance(root.leaves[0].opt_leaf, Level2a)
+
+        self.assertSameDecoding(Root, {})
+        self.assertSameDecoding(Root, {"leaves": [{}, {"i": 3}], "by_name": {"x": {"decimal": "2.5"}}})
+
+    def test_missing_and_none_values(self):
+        self.assertSameDecoding(Leaf, {"i": None})
+        self.assertSameDecoding(Root, {"leaves": None, "optional_leaves": None})
+
+        @dataclass
+        class Required:
+            a: int
+            b: Optional[int]
+
+        self.assertSameDecoding(Required, {}, infer_missing=True)
+        self.assertSameDecoding(Required, {"a": 1, "b": None})
+
+    def test_instances_are_kept(self):
+        leaf = Leaf()
+        root = _decode_dataclass(Root, {"leaves": [leaf], "level1": Level1()}, False)
+        self.assertIs(leaf, root.leaves[0])
+        self.assertIs(leaf, _decode_dataclass(Leaf, leaf, False))
+
+    def test_decoder_is_compiled_once_per_class(self):
+        _decode_dataclass(Root, Root().to_dict(), False)
+        with mock.patch.object(
+            dataclass_json_overrides, "_compile_decoder", wraps=dataclass_json_overrides._compile_decoder
+        ) as compile_decoder:
+            for _ in range(3):
+                _decode_dataclass(Root, Root().to_dict(), False)
+            compile_decoder.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
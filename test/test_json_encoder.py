@@ -0,0 +1,132 @@
+import copy
+import datetime
+import unittest
+from dataclasses import dataclass, field, fields
+from enum import Enum, IntEnum
+from typing import Collection, Dict, List, Mapping, Optional, Tuple
+
+from dataclasses_json import CatchAll, LetterCase, Undefined, config, dataclass_json
+from dataclasses_json.core import _encode_overrides, _user_overrides_or_exts
+from dataclasses_json.utils import _handle_undefined_parameters_safe
+
+from paiargparse import pai_dataclass
+from paiargparse.dataclass_json_overrides import _asdict
+from test.dataclasse_setup import Level1, Level2a
+
+
+def reference_asdict(obj, encode_json=False, include_cls=True):
+    """The previous (uncompiled) implementation of _asdict"""
+    if hasattr(type(obj), "__dataclass_fields__"):
+        result = []
+        for f in fields(obj):
+            value = reference_asdict(getattr(obj, f.name), encode_json=encode_json)
+            result.append((f.name, value))
+
+        result = _handle_undefined_parameters_safe(cls=obj, kvs=dict(result), usage="to")
+        if include_cls and hasattr(obj.__class__, "__pai_dataclass__"):
+            result = dict(result)
+            result["__cls__"] = obj.__class__.__module__ + ":" + obj.__class__.__name__
+        return _encode_overrides(dict(result), _user_overrides_or_exts(obj), encode_json=encode_json)
+    elif isinstance(obj, Mapping):
+        return dict(
+            (reference_asdict(k, encode_json=encode_json), reference_asdict(v, encode_json=encode_json))
+            for k, v in obj.items()
+        )
+    elif isinstance(obj, Collection) and not isinstance(obj, str) and not isinstance(obj, bytes):
+        return list(reference_asdict(v, encode_json=encode_json) for v in obj)
+    else:
+        return copy.deepcopy(obj)
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Level(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Mutable:
+    def __init__(self, values):
+        self.values = values
+
+    def __eq__(self, other):
+        return isinstance(other, Mutable) and self.values == other.values
+
+    def __repr__(self):
+        return f"Mutable({self.values})"
+
+
+@dataclass
+class Plain:
+    x: float = 1.5
+    b: bytes = b"abc"
+
+
+@pai_dataclass
+@dataclass
+class Leaf:
+    i: int = 0
+    s: str = "s"
+    color: Color = Color.RED
+    level: Level = Level.HIGH
+    opt: Optional[int] = None
+    date: datetime.datetime = datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+
+
+@pai_dataclass
+@dataclass
+class Overrides:
+    camel_case_name: int = field(default=1, metadata=config(letter_case=LetterCase.CAMEL))
+    excluded: int = field(default=2, metadata=config(exclude=lambda v: v == 2))
+    encoded: int = field(default=3, metadata=config(encoder=lambda v: str(v * 2)))
+
+
+@pai_dataclass
+@dataclass_json(undefined=Undefined.INCLUDE)
+@dataclass
+class WithCatchAll:
+    p: int = 0
+    rest: CatchAll = None
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    leaves: List[Leaf] = field(default_factory=lambda: [Leaf(i=i, s=str(i)) for i in range(20)])
+    by_name: Dict[str, Leaf] = field(default_factory=lambda: {"a": Leaf(), "b": Leaf(color=Color.BLUE)})
+    pair: Tuple[int, str] = (1, "a")
+    nested: List[List[int]] = field(default_factory=lambda: [[1, 2], [3]])
+    plain: Plain = field(default_factory=Plain)
+    overrides: Overrides = field(default_factory=Overrides)
+    catch_all: WithCatchAll = field(default_factory=lambda: WithCatchAll(p=1, rest={"x": 1}))
+    mutable: Mutable = field(default_factory=lambda: Mutable([1, 2]))
+    level1: Level1 = field(default_factory=lambda: Level1(l=Level2a()))
+
+
+class TestJsonEncoder(unittest.TestCase):
+    def assertSameEncoding(self, obj, **kwargs):
+        expected = reference_asdict(obj, **kwargs)
+        actual = _asdict(obj, **kwargs)
+        self.assertEqual(repr(expected), repr(actual))
+
+    def test_same_as_reference(self):
+        for include_cls in [False, True]:
+            self.assertSameEncoding(Root(), encode_json=False, include_cls=include_cls)
+            # Mutable can not be encoded as json
+            self.assertSameEncoding(Root(mutable=None), encode_json=True, include_cls=include_cls)
+        self.assertSameEncoding(Level1(l=Level2a()))
+
+    def test_mutable_values_are_copied(self):
+        root = Root()
+        d = root.to_dict()
+        self.assertIsNot(root.mutable, d["mutable"])
+        self.assertIsNot(root.nested[0], d["nested"][0])
+        d["mutable"].values.append(3)
+        self.assertListEqual([1, 2], root.mutable.values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+from unittest import mock
+
+from paiargparse import class_registry, pai_dataclass, read_json_lines, write_json_lines
+from paiargparse import json_lines
+from paiargparse.json_backend import available_json_backends
+from test.dataclasse_setup import Level1, Level2a, Level2b
+
+
+@pai_dataclass
+@dataclass
+class Trial:
+    lr: float = 0.1
+    level1: Level1 = field(default_factory=Level1)
+    tags: List[str] = field(default_factory=list)
+
+
+def trials(n):
+    for i in range(n):
+        yield Trial(lr=i / n, level1=Level1(l=Level2a() if i % 2 else Level2b()), tags=[str(i)])
+
+
+class TestJsonLines(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "trials.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        for backend in available_json_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(10, write_json_lines(self.path, trials(10), backend=backend))
+                self.assertListEqual(list(trials(10)), list(read_json_lines(self.path, backend=backend)))
+
+    def test_append_and_file_objects(self):
+        write_json_lines(self.path, trials(2))
+        write_json_lines(self.path, [Level1()], append=True)
+        read = list(read_json_lines(self.path))
+        self.assertListEqual(list(trials(2)) + [Level1()], read)
+
+        text = io.StringIO()
+        write_json_lines(text, trials(3))
+        text.seek(0)
+        self.assertListEqual(list(trials(3)), list(read_json_lines(text)))
+
+    def test_default_class(self):
+        with open(self.path, "w") as f:
+            f.write('{"lr": 0.5}\n\n{"lr": 0.25, "level1": {"p1": 2}}\n')
+        self.assertListEqual(
+            [Trial(lr=0.5), Trial(lr=0.25, level1=Level1(p1=2))], list(read_json_lines(self.path, Trial))
+        )
+        with self.assertRaises(ValueError):
+            list(read_json_lines(self.path))
+
+    def test_filter_before_decoding(self):
+        write_json_lines(self.path, trials(100))
+        with mock.patch("paiargparse.dataclass_json_overrides._decode_dataclass") as decode:
+            list(read_json_lines(self.path, where=lambda d: d["lr"] >= 0.9))
+        self.assertEqual(10, decode.call_count)
+
+        read = list(read_json_lines(self.path, where=lambda d: d["level1"]["l"]["__cls__"].endswith("Level2a")))
+        self.assertEqual(50, len(read))
+        self.assertTrue(all(isinstance(t.level1.l, Level2a) for t in read))
+
+    def test_classes_are_resolved_once_per_stream(self):
+        write_json_lines(self.path, trials(10))
+        with mock.patch.object(json_lines, "resolve_class", wraps=class_registry.resolve_class) as resolve:
+            list(read_json_lines(self.path))
+        self.assertEqual(1, resolve.call_count)
+
+    def test_lazy_reading(self):
+        write_json_lines(self.path, trials(10000))
+        tracemalloc.start()
+        try:
+            for _ in read_json_lines(self.path):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, os.path.getsize(self.path) / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+
+from paiargparse import pai_dataclass, PAIArgumentParser
+from paiargparse.dataclass_extractor import extract_args_of_dataclass
+
+factory_calls = []
+
+
+def counting_factory(cls):
+    def factory():
+        factory_calls.append(cls)
+        return cls()
+
+    return factory
+
+
+@pai_dataclass
+@dataclass
+class Leaf:
+    values: List[int] = field(default_factory=lambda: list(range(1000)))
+
+
+@pai_dataclass
+@dataclass
+class Node:
+    leaf: Leaf = field(default_factory=counting_factory(Leaf))
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    node: Node = field(default_factory=counting_factory(Node))
+
+
+class TestLazyDefault(unittest.TestCase):
+    def setUp(self) -> None:
+        factory_calls.clear()
+
+    def test_extract_does_not_call_factory(self):
+        args = extract_args_of_dataclass(Root)
+        self.assertListEqual([], factory_calls)
+
+        self.assertIsInstance(args[0].default, Node)
+        self.assertIs(args[0].default, args[0].default)  # memoized
+        self.assertListEqual([Node, Leaf], factory_calls)
+
+    def test_default_of_parent_is_used(self):
+        root = Root()
+        factory_calls.clear()
+
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root, root)
+        parsed = parser.parse_args(["--root.node.leaf.values", "1"]).root
+
+        # The defaults of the fields are taken from the passed default, the factories are not called
+        self.assertListEqual([], factory_calls)
+        self.assertListEqual([1], parsed.node.leaf.values)
+
+    def test_factories_called_once(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root)
+        parsed = parser.parse_args([]).root
+
+        # One call to create the default of Root.node (which creates its Leaf)
+        self.assertListEqual([Node, Leaf], factory_calls)
+        self.assertEqual(Root(), parsed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+
+CODE = """
+import sys
+from dataclasses import dataclass, field
+from typing import List
+from paiargparse import PAIArgumentParser, pai_dataclass
+
+lazy_modules = ["dataclasses_json", "marshmallow", "editdistance", "orjson", "concurrent.futures"]
+
+@pai_dataclass
+@dataclass
+class Sub:
+    q: float = 0.5
+
+@pai_dataclass
+@dataclass
+class Params:
+    p: int = 0
+    subs: List[Sub] = field(default_factory=lambda: [Sub()])
+
+parser = PAIArgumentParser()
+parser.add_root_argument("root", Params)
+params = parser.parse_args(["--root.p", "1", "--root.subs.0.q", "2"]).root
+assert not any(m in sys.modules for m in lazy_modules), [m for m in lazy_modules if m in sys.modules]
+
+d = params.to_dict()
+assert "dataclasses_json" in sys.modules
+assert Params.from_dict(d) == params
+assert Params.from_json(params.to_json()) == params
+assert Params.schema().load(Params.schema().dump(params)) == params
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_serialization_modules_are_imported_on_first_use(self):
+        subprocess.run([sys.executable, "-c", CODE], check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
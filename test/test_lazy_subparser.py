@@ -0,0 +1,65 @@
+import unittest
+from dataclasses import dataclass
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+
+
+@pai_dataclass
+@dataclass
+class Sub1:
+    p: int = 1
+
+
+@pai_dataclass
+@dataclass
+class Sub2:
+    q: int = 5
+
+
+class TestLazySubParser(unittest.TestCase):
+    def test_unselected_sub_parser_is_not_expanded(self):
+        parser = PAIArgumentParser()
+        sub_parser = parser.add_subparsers(dest="sub", required=True)
+        sub_parser1: PAIArgumentParser = sub_parser.add_parser("sub1")
+        sub_parser1.add_root_argument("root", Sub1)
+        sub_parser2: PAIArgumentParser = sub_parser.add_parser("sub2")
+        sub_parser2.add_root_argument("root", Sub2)
+
+        root = parser.parse_args(args=["sub2", "--root.q", "10"]).root
+        self.assertEqual(Sub2(q=10), root)
+        self.assertIsNotNone(sub_parser2._dc_parser)
+        self.assertIsNone(sub_parser1._dc_parser)
+
+    def test_builder_only_called_for_selected_sub_command(self):
+        built = []
+
+        def builder(name, dc_type):
+            def build(p: PAIArgumentParser):
+                built.append(name)
+                p.add_root_argument("root", dc_type)
+
+            return build
+
+        parser = PAIArgumentParser()
+        sub_parser = parser.add_subparsers(dest="sub", required=True)
+        sub_parser.add_parser("sub1", builder=builder("sub1", Sub1))
+        sub_parser.add_parser("sub2", builder=builder("sub2", Sub2))
+        self.assertListEqual([], built)
+
+        args = parser.parse_args(args=["sub1", "--root.p", "3"])
+        self.assertEqual("sub1", args.sub)
+        self.assertEqual(Sub1(p=3), args.root)
+        self.assertListEqual(["sub1"], built)
+
+    def test_builder_is_used_for_help(self):
+        parser = PAIArgumentParser(builder=lambda p: p.add_root_argument("root", Sub2))
+        self.assertIn("--root", parser.format_help())
+
+    def test_invalid_root_type_raises_immediately(self):
+        parser = PAIArgumentParser()
+        with self.assertRaises(TypeError):
+            parser.add_root_argument("root", Sub1())
+
+
+if __name__ == "__main__":
+    unittest.main()
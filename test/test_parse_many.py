@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+
+from paiargparse import PAIArgumentParser
+from paiargparse.dataclass_parser import PAIDataClassArgumentParser, UnknownArgumentError
+from test.dataclasse_setup import Level1, Level1b
+from test.test_sweep import make_parser
+
+ARGVS = [
+    ["--trainer.lr", "0.1", "--model.depth", "3"],
+    ["--model.encoder.l", "test.dataclasse_setup:Level2b", "--trainer.epochs", "1"],
+    ["--trainer.lr", "0.2"],
+    ["--model.encoder.l", "test.dataclasse_setup:Level2b", "--model.encoder.l.pb", "False"],
+    ["--model.encoder.l=test.dataclasse_setup:Level2b", "--model.decoder.p1", "4"],
+    ["--model.encoder.l", "test.dataclasse_setup:Level2a", "--model.encoder.l.p1a", "0.5"],
+    [],
+    ["--data.paths", "a", "b", "--model.encoder.l", "test.dataclasse_setup:Level2b"],
+]
+
+
+class TestParseMany(unittest.TestCase):
+    def assertSameAsParseArgs(self, results, argvs=ARGVS):
+        self.assertEqual([vars(make_parser().parse_args(argv)) for argv in argvs], [vars(r) for r in results])
+
+    def test_same_as_parse_args(self):
+        self.assertSameAsParseArgs(make_parser().parse_many(ARGVS))
+
+    def test_expand_once_per_selection(self):
+        with mock.patch.object(
+            PAIDataClassArgumentParser,
+            "parse_known_args",
+            autospec=True,
+            side_effect=PAIDataClassArgumentParser.parse_known_args,
+        ) as parse_known_args:
+            results = make_parser().parse_many([["--trainer.lr", str(i)] for i in range(50)])
+        self.assertEqual(list(range(50)), [r.trainer.lr for r in results])
+        # only the template without any values
+        self.assertEqual(1, parse_known_args.call_count)
+        self.assertTrue(all(r.model is results[0].model for r in results))
+
+    def test_errors(self):
+        parser = make_parser()
+        self.assertEqual(0.1, parser.parse_many([["--trainer.lr", "0.1"]])[0].trainer.lr)
+        with self.assertRaises(ValueError):
+            parser.parse_many([["--trainer.lr", "0.1"], ["--trainer.lr", "x"]])
+        with self.assertRaises(UnknownArgumentError):
+            parser.parse_many([["--trainer.lr", "0.1"], ["--trainer.unknown", "1"]])
+
+    def test_required_field(self):
+        def make_required_parser():
+            parser = PAIArgumentParser()
+            parser.add_root_argument("root", Level1b)
+            return parser
+
+        argvs = [["--root.p1", "1"], ["--root.p1", "2", "--root.p2", "b"], ["--root.p2", "c", "--root.p1", "3"]]
+        results = make_required_parser().parse_many(argvs)
+        self.assertEqual([1, 2, 3], [r.root.p1 for r in results])
+        self.assertEqual([vars(make_required_parser().parse_args(argv)) for argv in argvs], [vars(r) for r in results])
+
+    def test_processes(self):
+        results = make_parser().parse_many(ARGVS, processes=3)
+        self.assertSameAsParseArgs(results)
+
+    def test_processes_require_root_arguments_only(self):
+        parser = make_parser()
+        parser.add_argument("--other")
+        self.assertRaises(ValueError, parser.parse_many, ARGVS, processes=2)
+
+    def test_sub_parsers(self):
+        parser = PAIArgumentParser()
+        sub_parsers = parser.add_subparsers(dest="command")
+        sub_parsers.add_parser("a").add_root_argument("root", Level1)
+        results = parser.parse_many([["a", "--root.p1", "1"], ["a", "--root.p1", "2"]])
+        self.assertEqual([1, 2], [r.root.p1 for r in results])
+
+
+if __name__ == "__main__":
+    unittest.main()
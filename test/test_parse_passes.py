@@ -0,0 +1,46 @@
+import unittest
+from dataclasses import make_dataclass, field
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+
+
+def make_nested_dataclass(depth: int):
+    """Create a chain of dataclasses Level{depth}.sub -> ... -> Level0 where each level has an int parameter p"""
+    cls = pai_dataclass(make_dataclass("Level0", [("p", int, field(default=0))]))
+    for i in range(1, depth + 1):
+        cls = pai_dataclass(
+            make_dataclass(f"Level{i}", [("p", int, field(default=0)), ("sub", cls, field(default_factory=cls))])
+        )
+    return cls
+
+
+class TestParsePasses(unittest.TestCase):
+    def parse_nested(self, depth: int, args):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", make_nested_dataclass(depth))
+        root = parser.parse_args(args=args).root
+        return root, parser._data_class_parser._num_parse_passes
+
+    def test_passes_linear_in_depth(self):
+        num_passes = []
+        for depth in range(1, 7):
+            root, passes = self.parse_nested(depth, [f"--root.{'sub.' * depth}p", "1", "--root.p", "2"])
+            self.assertEqual(root.p, 2)
+            for _ in range(depth):
+                root = root.sub
+            self.assertEqual(root.p, 1)
+            num_passes.append(passes)
+
+        for depth, passes in enumerate(num_passes, start=1):
+            self.assertLessEqual(passes, depth + 2)
+        for prev, cur in zip(num_passes, num_passes[1:]):
+            self.assertLessEqual(cur - prev, 1)
+
+    def test_passes_independent_of_argv_length(self):
+        _, passes = self.parse_nested(3, [])
+        _, passes_many_args = self.parse_nested(3, ["--root.p", "1"] * 100 + ["--root.sub.sub.p", "3"] * 100)
+        self.assertEqual(passes, passes_many_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import gc
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from test.dataclasse_setup import Level1, Level2a
+
+
+@pai_dataclass
+@dataclass
+class Sub:
+    p: int = 0
+    l: List[int] = field(default_factory=lambda: [1, 2])
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    subs: List[Sub] = field(default_factory=lambda: [Sub(), Sub(p=1)])
+    level: Level1 = field(default_factory=Level1)
+
+
+class TestReentrantParser(unittest.TestCase):
+    def test_parse_different_args(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root)
+        for _ in range(2):
+            root = parser.parse_args(["--root.level.l", "test.dataclasse_setup:Level2a", "--root.subs.0.p", "3"]).root
+            self.assertIsInstance(root.level.l, Level2a)
+            self.assertEqual(3, root.subs[0].p)
+
+            root = parser.parse_args([]).root
+            self.assertEqual(Root(), root)
+
+    def test_expand_template_once(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root)
+        with mock.patch.object(
+            PAIArgumentParser,
+            "_create_data_class_parser",
+            autospec=True,
+            side_effect=PAIArgumentParser._create_data_class_parser,
+        ) as create_data_class_parser:
+            for i in range(10):
+                root = parser.parse_args(["--root.subs.0.p", str(i), "--root.level.l.lvl3.p", "2"]).root
+                self.assertEqual(i, root.subs[0].p)
+                self.assertEqual(2, root.level.l.lvl3.p)
+            self.assertEqual(1, create_data_class_parser.call_count)
+
+            # selecting a dataclass expands a new parser
+            root = parser.parse_args(["--root.level.l", "test.dataclasse_setup:Level2a"]).root
+            self.assertIsInstance(root.level.l, Level2a)
+            self.assertEqual(2, create_data_class_parser.call_count)
+
+            # the template is expanded again after adding a root argument
+            parser.add_root_argument("sub", Sub)
+            self.assertEqual(Sub(p=3), parser.parse_args(["--sub.p", "3"]).sub)
+            parser.parse_args([])
+            self.assertEqual(3, create_data_class_parser.call_count)
+
+    def test_results_are_independent(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root)
+        root = parser.parse_args([]).root
+        root.subs[0].l.append(3)
+        root.level.l.lvl3.p = 5
+        self.assertEqual(Root(), parser.parse_args([]).root)
+        self.assertEqual(Root(), parser.parse_args(["--root.subs.1.p", "1"]).root)
+
+    def test_sub_parser(self):
+        parser = PAIArgumentParser()
+        sub_parser = parser.add_subparsers(dest="sub", required=True)
+        sub_parser.add_parser("sub").add_root_argument("root", Sub)
+        sub_parser.add_parser("root").add_root_argument("root", Root)
+
+        self.assertEqual(Sub(p=2), parser.parse_args(["sub", "--root.p", "2"]).root)
+        self.assertEqual(Root(), parser.parse_args(["root"]).root)
+        self.assertEqual(Sub(), parser.parse_args(["sub"]).root)
+
+    def test_memory_is_bounded(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Root)
+        args = ["--root.subs", "test.test_reentrant:Sub", "--root.subs.0.l", "3", "4"]
+        expected = parser.parse_args(args)
+
+        def parse(n):
+            for _ in range(n):
+                self.assertEqual(vars(expected), vars(parser.parse_args(args)))
+            gc.collect()
+            return len(gc.get_objects())
+
+        # 10k parses in total, the number of live objects must not grow after the first ones
+        num_objects = parse(1000)
+        num_objects_after = parse(9000)
+        self.assertEqual(0, len(parser._actions))
+        self.assertLess(len(parser._all_actions), 50)
+        self.assertLess(num_objects_after - num_objects, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
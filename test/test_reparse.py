@@ -0,0 +1,134 @@
+import unittest
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse.dataclass_parser import PAIDataClassArgumentParser, UnknownArgumentError
+from test.dataclasse_setup import Level1, Level2a, Level2b
+
+
+class Mode(str, Enum):
+    A = "a"
+    B = "b"
+
+
+@pai_dataclass
+@dataclass
+class Block:
+    units: int = 1
+    level1: Level1 = field(default_factory=Level1)
+
+
+@pai_dataclass
+@dataclass
+class Model:
+    lr: float = 0.1
+    mode: Mode = Mode.A
+    flag: bool = False
+    seed: Optional[int] = None
+    values: List[int] = field(default_factory=lambda: [1])
+    mapping: Dict[str, int] = field(default_factory=dict)
+    blocks: List[Block] = field(default_factory=lambda: [Block() for _ in range(20)])
+    head: Block = field(default_factory=Block)
+
+
+@pai_dataclass
+@dataclass
+class Data:
+    path: str = "data"
+
+
+BASE_ARGS = ["--model.blocks.3.units", "5", "--model.head.level1.l", "test.dataclasse_setup:Level2a"]
+
+
+class TestReparse(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = PAIArgumentParser()
+        self.parser.add_root_argument("model", Model)
+        self.parser.add_root_argument("data", Data)
+        self.base = self.parser.parse_args(BASE_ARGS)
+
+    def assertSameAsFullParse(self, delta, base=None, base_args=BASE_ARGS):
+        result = self.parser.reparse(self.base if base is None else base, delta)
+        parser = PAIArgumentParser()
+        parser.add_root_argument("model", Model)
+        parser.add_root_argument("data", Data)
+        self.assertEqual(vars(parser.parse_args(base_args + delta)), vars(result))
+        return result
+
+    def test_same_as_full_parse(self):
+        for delta in [
+            ["--model.lr", "0.5"],
+            ["--model.mode", "b", "--model.flag", "True", "--model.seed", "3"],
+            ["--model.values", "2", "3", "--model.mapping", "a=1", "b=2"],
+            ["--model.blocks.3.units", "7", "--model.blocks.10.level1.l.lvl3.p", "4"],
+            ["--model.head.level1.l.p1a", "0.5", "--data.path", "other"],
+            ["--model.seed", "None"],
+            [],
+        ]:
+            with self.subTest(delta=delta):
+                self.assertSameAsFullParse(delta)
+
+    def test_unchanged_dataclasses_are_reused(self):
+        result = self.parser.reparse(self.base, ["--model.blocks.3.level1.p1", "2"])
+        self.assertEqual(2, result.model.blocks[3].level1.p1)
+        self.assertIsNot(self.base.model, result.model)
+        self.assertIsNot(self.base.model.blocks[3], result.model.blocks[3])
+        self.assertIs(self.base.model.blocks[3].level1.l, result.model.blocks[3].level1.l)
+        self.assertIs(self.base.model.head, result.model.head)
+        for i in [0, 1, 2, 4, 19]:
+            self.assertIs(self.base.model.blocks[i], result.model.blocks[i])
+        self.assertIs(self.base.data, result.data)
+
+        # the base is unchanged and can be reparsed again
+        self.assertEqual(0, self.base.model.blocks[3].level1.p1)
+        self.assertEqual(0, self.parser.reparse(self.base, ["--model.lr", "1"]).model.blocks[3].level1.p1)
+
+    def test_cost_depends_on_delta(self):
+        with mock.patch.object(
+            PAIDataClassArgumentParser,
+            "_instantiate",
+            autospec=True,
+            side_effect=PAIDataClassArgumentParser._instantiate,
+        ) as instantiate:
+            self.parser.reparse(self.base, ["--model.blocks.3.level1.l.lvl3.p", "2"])
+        # lvl3, l, level1, blocks.3, blocks, model
+        self.assertEqual(6, instantiate.call_count)
+
+    def test_reparse_result(self):
+        result = self.parser.reparse(self.base, ["--model.lr", "0.5"])
+        result = self.parser.reparse(result, ["--model.blocks.0.units", "3"])
+        self.assertEqual(0.5, result.model.lr)
+        self.assertEqual(3, result.model.blocks[0].units)
+        self.assertEqual(5, result.model.blocks[3].units)
+        self.assertSameAsFullParse(
+            ["--data.path", "x"],
+            base=result,
+            base_args=BASE_ARGS + ["--model.lr", "0.5", "--model.blocks.0.units", "3"],
+        )
+
+    def test_select_dataclass(self):
+        # changes the structure of the tree, all args are parsed again
+        result = self.assertSameAsFullParse(["--model.blocks.3.level1.l", "test.dataclasse_setup:Level2b"])
+        self.assertIsInstance(result.model.blocks[3].level1.l, Level2b)
+        self.assertIsInstance(self.base.model.head.level1.l, Level2a)
+        # override a field of a dataclass that was selected by the previous args
+        self.assertSameAsFullParse(["--model.head.level1.l.p1a", "0.25"])
+
+    def test_unknown_args(self):
+        self.assertRaises(UnknownArgumentError, self.parser.reparse, self.base, ["--model.unknown", "1"])
+        self.assertRaises(UnknownArgumentError, self.parser.reparse, self.base, ["--model.lr", "1", "2"])
+
+    def test_invalid_value(self):
+        with self.assertRaises(SystemExit):
+            self.parser.reparse(self.base, ["--model.mode", "c"])
+        self.assertEqual(self.base.model, self.parser.reparse(self.base, []).model)
+
+    def test_only_results_of_parse_args(self):
+        self.assertRaises(ValueError, self.parser.reparse, self.parser.parse_known_args([])[0], ["--model.lr", "1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from dataclasses import MISSING, dataclass, field
+from typing import List
+from unittest import mock
+
+from paiargparse import PAIArgumentParser, pai_dataclass
+from paiargparse import dataclass_parser, schema_cache
+from paiargparse.dataclass_parser import add_dataclass_field
+from paiargparse.schema_cache import SchemaCache
+from test.dataclasse_setup import Level1, Level2a, Level3a
+
+
+@pai_dataclass
+@dataclass
+class Sub:
+    p: int = 0
+    l: List[int] = field(default_factory=lambda: [1, 2])
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    subs: List[Sub] = field(default_factory=lambda: [Sub(), Sub(p=1)])
+    level: Level1 = field(default_factory=Level1)
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+    def parse(self, args, default=Root()):
+        parser = PAIArgumentParser(schema_cache_dir=self.cache_dir.name)
+        parser.add_root_argument("root", Root, default)
+        namespace, argv = parser.parse_known_args(args)
+        return namespace, argv, parser._data_class_parser
+
+    def test_load_cached_tree(self):
+        args = ["--root.subs.1.l", "4", "5", "--root.level.p1=3", "--root.level.l.lvl3.t", "1.5"]
+        namespace, _, dc_parser = self.parse(args)
+        self.assertEqual(1, len(os.listdir(self.cache_dir.name)))
+
+        with mock.patch.object(dataclass_parser, "add_dataclass_field") as add_dataclass_field:
+            cached_namespace, argv, dc_parser = self.parse(args)
+            add_dataclass_field.assert_not_called()
+        self.assertListEqual([], argv)
+        self.assertEqual(vars(namespace), vars(cached_namespace))
+        self.assertListEqual([4, 5], cached_namespace.root.subs[1].l)
+        self.assertEqual(3, cached_namespace.root.level.p1)
+        self.assertEqual(1.5, cached_namespace.root.level.l.lvl3.t)
+
+        # the actions are restored, e.g. to display the help
+        self.assertIn("--root.level.l.lvl3.t", dc_parser.format_help())
+
+    def test_one_entry_per_schema(self):
+        self.parse([])
+        self.parse(["--root.level.p1", "1"])
+        self.parse(["--root.subs.0.p", "2"])
+        self.assertEqual(1, len(os.listdir(self.cache_dir.name)))
+        self.parse([], default=Root(subs=[]))
+        self.assertEqual(2, len(os.listdir(self.cache_dir.name)))
+
+    def test_without_default(self):
+        self.parse(["--root.level.p1", "1"], default=MISSING)
+        with mock.patch.object(dataclass_parser, "add_dataclass_field") as add_dataclass_field:
+            namespace, _, _ = self.parse(["--root.level.p1", "2"], default=MISSING)
+            add_dataclass_field.assert_not_called()
+        self.assertEqual(Root(level=Level1(p1=2)), namespace.root)
+
+    def test_select_dataclass(self):
+        self.parse([])
+        args = ["--root.level.l", "test.dataclasse_setup:Level2a", "--root.level.l.p1a=1"]
+        namespace, argv, dc_parser = self.parse(args)
+        self.assertListEqual([], argv)
+        self.assertGreater(dc_parser._num_parse_passes, 0)
+        self.assertIsInstance(namespace.root.level.l, Level2a)
+        self.assertEqual(1, namespace.root.level.l.p1a)
+        self.assertIsInstance(namespace.root.level.l.lvl3, Level3a)
+
+        # the cached tree is unchanged
+        namespace, _, _ = self.parse([])
+        self.assertEqual(Root(), namespace.root)
+
+    def test_unknown_args(self):
+        for _ in range(2):
+            _, argv, _ = self.parse(["--root.unknown", "1"])
+            self.assertListEqual(["--root.unknown", "1"], argv)
+
+    def test_invalidate_on_source_change(self):
+        self.parse([])
+        with mock.patch.object(schema_cache, "module_source_hash", return_value="changed"):
+            with mock.patch.object(dataclass_parser, "add_dataclass_field", wraps=add_dataclass_field) as add_field:
+                namespace, _, _ = self.parse([])
+                add_field.assert_called()
+        self.assertEqual(Root(), namespace.root)
+
+    def test_remove_least_recently_used(self):
+        cache = SchemaCache(self.cache_dir.name, max_entries=2)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.store_help(key, key, [])
+            os.utime(os.path.join(self.cache_dir.name, f"{key}.help"), ns=(i, i))
+        self.assertEqual({"b.help", "c.help"}, set(os.listdir(self.cache_dir.name)))
+
+        self.assertEqual("b", cache.load_help("b"))  # mark as recently used
+        cache.store_help("d", "d", [])
+        self.assertEqual({"b.help", "d.help"}, set(os.listdir(self.cache_dir.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import copy
+import pickle
+import sys
+import unittest
+from dataclasses import dataclass, field, fields
+from typing import Dict, List
+
+from paiargparse import PAIArgumentParser, pai_dataclass, pai_meta
+
+
+@pai_dataclass(slots=True)
+@dataclass
+class Point:
+    x: float = 0.0
+    y: float = 0.0
+
+    def norm(self):
+        return (self.x**2 + self.y**2) ** 0.5
+
+
+@pai_dataclass(slots=True)
+@dataclass
+class Point3D(Point):
+    z: float = 0.0
+
+    def norm(self):
+        return (super().norm() ** 2 + self.z**2) ** 0.5
+
+
+@pai_dataclass
+@dataclass
+class Unslotted:
+    a: int = 0
+
+
+@pai_dataclass(slots=True)
+@dataclass
+class SlottedOfUnslotted(Unslotted):
+    b: int = 1
+
+
+@pai_dataclass(slots=True, alt="Shape")
+@dataclass
+class Polygon:
+    points: List[Point] = field(default_factory=lambda: [Point(), Point(1, 1)])
+    center: Point = field(default_factory=Point, metadata=pai_meta(choices=[Point, Point3D]))
+    by_name: Dict[str, Point] = field(default_factory=dict)
+    name: str = "polygon"
+
+
+class TestSlots(unittest.TestCase):
+    def test_no_dict(self):
+        p = Point3D(1, 2, 3)
+        self.assertFalse(hasattr(p, "__dict__"))
+        self.assertEqual(("z",), Point3D.__slots__)
+        self.assertEqual(["x", "y", "z"], [f.name for f in fields(Point3D)])
+        self.assertEqual(0.0, fields(Point3D)[0].default)
+        self.assertLess(sys.getsizeof(Point(1, 2)), sys.getsizeof(Unslotted()) + sys.getsizeof(Unslotted().__dict__))
+
+    def test_assign_unknown(self):
+        p = Point()
+        p.x = 2
+        self.assertEqual(2, p.x)
+        with self.assertRaises(AttributeError):
+            p.unknown = 1
+
+        # base classes with __dict__ are still guarded
+        s = SlottedOfUnslotted()
+        s.a = 1
+        with self.assertRaises(AttributeError):
+            s.unknown = 1
+
+    def test_methods(self):
+        self.assertEqual(Point3D(1, 2, 2).norm(), 3)
+        self.assertEqual(Point3D(1, 2, 2), Point3D(1, 2, 2))
+        self.assertEqual("Point3D(x=1, y=2, z=2)", repr(Point3D(1, 2, 2)))
+
+    def test_serialization(self):
+        polygon = Polygon(center=Point3D(z=1), by_name={"a": Point3D()})
+        self.assertEqual(polygon, Polygon.from_dict(polygon.to_dict()))
+        self.assertEqual(polygon, Polygon.from_json(polygon.to_json()))
+        self.assertEqual(polygon, pickle.loads(pickle.dumps(polygon)))
+        self.assertEqual(polygon, copy.deepcopy(polygon))
+
+    def test_parse(self):
+        parser = PAIArgumentParser()
+        parser.add_root_argument("root", Polygon)
+        args = parser.parse_args(
+            ["--root.points.1.x", "2", "--root.center", "Point3D", "--root.center.z", "3", "--root.name", "p"]
+        )
+        self.assertEqual(Polygon(points=[Point(), Point(2, 1)], center=Point3D(z=3), name="p"), args.root)
+
+
+if __name__ == "__main__":
+    unittest.main()
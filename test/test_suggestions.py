@@ -0,0 +1,58 @@
+import random
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import editdistance
+
+from paiargparse import suggestions
+from paiargparse.suggestions import SuggestionIndex, suggestion_index
+
+
+def brute_force_suggest(arg, option_strings, n_best):
+    cmd1 = set(arg.split("."))
+    common = [len(cmd1.intersection(option_string.split("."))) for option_string in option_strings]
+    candidates = [o for o, c in zip(option_strings, common) if c >= max(common) - 1]
+    return sorted(candidates, key=lambda o: editdistance.eval(arg, o))[:n_best]
+
+
+class TestSuggestions(unittest.TestCase):
+    def setUp(self) -> None:
+        rnd = random.Random(42)
+        words = ["root", "level", "lvl", "model", "data", "p1", "p2", "lr", "layers", "0", "1"]
+        self.option_strings = list(
+            dict.fromkeys("--" + ".".join(rnd.choice(words) for _ in range(rnd.randint(1, 5))) for _ in range(2000))
+        )
+        self.queries = ["--" + ".".join(rnd.choice(words + ["levle", "x"]) for _ in range(3)) for _ in range(100)]
+
+    def test_same_as_brute_force(self):
+        index = SuggestionIndex(self.option_strings)
+        for query in self.queries + ["--xyz", "--root.x"]:
+            self.assertListEqual(brute_force_suggest(query, self.option_strings, 3), index.suggest(query, 3))
+
+    def test_index_visits_few_options(self):
+        index = SuggestionIndex([f"--root.group{i}.param{j}" for i in range(100) for j in range(50)])
+        with mock.patch.object(suggestions, "edit_distance", wraps=suggestions.edit_distance) as edit_distance:
+            self.assertListEqual(["--root.group12.param3"], index.suggest("--root.group12.param3.x"))
+        # only the options that share group12 or param3
+        self.assertEqual(149, edit_distance.call_count)
+
+    def test_index_is_reused(self):
+        self.assertIs(suggestion_index(tuple(self.option_strings)), suggestion_index(tuple(self.option_strings)))
+
+    def test_editdistance_not_imported_on_success(self):
+        code = (
+            "import sys\n"
+            "from paiargparse import PAIArgumentParser\n"
+            "from test.dataclasse_setup import Level1\n"
+            "parser = PAIArgumentParser()\n"
+            "parser.add_root_argument('root', Level1)\n"
+            "parser.parse_args(['--root.p1', '1'])\n"
+            "assert 'editdistance' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
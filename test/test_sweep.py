@@ -0,0 +1,158 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+
+from paiargparse import PAIArgumentParser, pai_dataclass, pai_meta
+from paiargparse.sweep import split_sweep_args
+from test.dataclasse_setup import Level1, Level2a, Level2b
+
+
+@pai_dataclass
+@dataclass
+class Trainer:
+    lr: float = 1e-3
+    epochs: int = 10
+
+
+@pai_dataclass
+@dataclass
+class Model:
+    depth: int = 2
+    name: str = field(default="model", metadata=pai_meta(sweep=True))
+    comment: str = ""
+    encoder: Level1 = field(default_factory=Level1)
+    decoder: Level1 = field(default_factory=Level1)
+
+
+@pai_dataclass
+@dataclass
+class Data:
+    paths: List[str] = field(default_factory=list)
+
+
+def make_parser():
+    parser = PAIArgumentParser()
+    parser.add_root_argument("trainer", Trainer)
+    parser.add_root_argument("model", Model)
+    parser.add_root_argument("data", Data)
+    return parser
+
+
+def is_option(arg):
+    return arg.startswith("--")
+
+
+class TestSplitSweepArgs(unittest.TestCase):
+    def test_split(self):
+        sweep_args = split_sweep_args(
+            ["--a", "1,2", "--b", "x", "--c=3,4,5", "--d", "p,q", "r", "--e", "u\\,v", "--f", "s\\,t,w"], is_option
+        )
+        self.assertEqual(["--b", "x", "--d", "p,q", "r", "--e", "u\\,v"], sweep_args.fixed)
+        self.assertEqual(
+            [[["--a", "1"], ["--a", "2"]], [["--c=3"], ["--c=4"], ["--c=5"]], [["--f", "s,t"], ["--f", "w"]]],
+            sweep_args.dimensions,
+        )
+        self.assertEqual(12, sweep_args.num_combinations())
+        combinations = list(sweep_args.combinations())
+        self.assertEqual(
+            ["--a", "1", "--b", "x", "--c=3", "--d", "p,q", "r", "--e", "u\\,v", "--f", "s,t"], combinations[0]
+        )
+        self.assertEqual(
+            ["--a", "2", "--b", "x", "--c=5", "--d", "p,q", "r", "--e", "u\\,v", "--f", "w"], combinations[-1]
+        )
+
+    def test_positionals(self):
+        sweep_args = split_sweep_args(["a,b", "--x", "1,2", "--", "--y", "3,4"], is_option)
+        self.assertEqual(["a,b", "--", "--y", "3,4"], sweep_args.fixed)
+        self.assertEqual([[["--x", "1"], ["--x", "2"]]], sweep_args.dimensions)
+
+    def test_no_sweep(self):
+        sweep_args = split_sweep_args(["--x", "1"], is_option)
+        self.assertEqual([["--x", "1"]], list(sweep_args.combinations()))
+
+
+class TestSweep(unittest.TestCase):
+    def assertSameAsFullParses(self, args):
+        results = list(make_parser().sweep(args))
+        parser = make_parser()
+        parser.parse_args([])
+        combinations = split_sweep_args(args, is_option, parser._is_sweepable_option).combinations()
+        expected = [make_parser().parse_args(c) for c in combinations]
+        self.assertEqual([vars(e) for e in expected], [vars(r) for r in results])
+        return results
+
+    def test_cartesian_product(self):
+        results = self.assertSameAsFullParses(
+            ["--trainer.lr", "1e-3,1e-4", "--model.depth", "4,8", "--trainer.epochs", "3"]
+        )
+        self.assertEqual([(1e-3, 4), (1e-3, 8), (1e-4, 4), (1e-4, 8)], [(r.trainer.lr, r.model.depth) for r in results])
+        self.assertTrue(all(r.trainer.epochs == 3 for r in results))
+
+    def test_shared_dataclasses(self):
+        results = self.assertSameAsFullParses(
+            ["--trainer.lr", "1e-3,1e-4", "--model.encoder.p1", "1,2,3", "--model.name=a,b", "--data.paths", "x"]
+        )
+        self.assertEqual(12, len(results))
+        # independent of all swept values
+        self.assertTrue(all(r.data is results[0].data for r in results))
+        self.assertTrue(all(r.model.decoder is results[0].model.decoder for r in results))
+        # depends on a single dimension
+        self.assertEqual(2, len({id(r.trainer) for r in results}))
+        self.assertEqual(3, len({id(r.model.encoder) for r in results}))
+        self.assertTrue(all(r.model.encoder.l is results[0].model.encoder.l for r in results))
+        # depends on two dimensions
+        self.assertEqual(6, len({id(r.model) for r in results}))
+
+    def test_select_dataclasses(self):
+        # each combination is parsed separately
+        results = self.assertSameAsFullParses(
+            ["--model.encoder.l", "test.dataclasse_setup:Level2a,test.dataclasse_setup:Level2b", "--trainer.lr", "1,2"]
+        )
+        self.assertEqual([Level2a, Level2a, Level2b, Level2b], [type(r.model.encoder.l) for r in results])
+
+    def test_lazy(self):
+        parser = make_parser()
+        results = parser.sweep(["--trainer.epochs", "1,2,3"])
+        self.assertEqual(1, next(results).trainer.epochs)
+        self.assertEqual(2, next(results).trainer.epochs)
+        # parsing in between does not change the sweep
+        parser.parse_args(["--trainer.epochs", "5"])
+        self.assertEqual(3, next(results).trainer.epochs)
+        self.assertRaises(StopIteration, next, results)
+
+    def test_last_occurrence_wins(self):
+        results = self.assertSameAsFullParses(["--trainer.lr", "1,2", "--trainer.epochs", "3", "--trainer.lr", "5"])
+        self.assertEqual([(5, 3)], [(r.trainer.lr, r.trainer.epochs) for r in results])
+
+        results = self.assertSameAsFullParses(["--trainer.lr", "5", "--trainer.lr=1,2", "--trainer.epochs", "2,3"])
+        self.assertEqual([(1, 2), (1, 3), (2, 2), (2, 3)], [(r.trainer.lr, r.trainer.epochs) for r in results])
+
+    def test_str_fields_are_not_split(self):
+        results = self.assertSameAsFullParses(["--model.comment", "a,b", "--trainer.lr", "1,2"])
+        self.assertEqual([("a,b", 1), ("a,b", 2)], [(r.model.comment, r.trainer.lr) for r in results])
+        self.assertEqual(["a,b"], [r.data.paths for r in make_parser().sweep(["--data.paths", "a,b"])][0])
+        # marked by pai_meta(sweep=True)
+        results = self.assertSameAsFullParses(["--model.name", "a,b"])
+        self.assertEqual(["a", "b"], [r.model.name for r in results])
+
+    def test_escape_of_values_that_are_not_swept(self):
+        args = ["--model.comment", "a\\,b", "--data.paths", "c\\,d", "--trainer.lr", "1,2"]
+        expected = make_parser().parse_args(["--model.comment", "a\\,b", "--data.paths", "c\\,d"])
+        self.assertEqual("a\\,b", expected.model.comment)
+        results = list(make_parser().sweep(args))
+        self.assertEqual([expected.model] * 2, [r.model for r in results])
+        self.assertEqual([expected.data] * 2, [r.data for r in results])
+
+    def test_split_sweepable(self):
+        sweep_args = split_sweep_args(["--a", "1,2", "--b", "x,y", "--b", "z"], is_option, lambda o: o != "--c")
+        self.assertEqual(["--b", "z"], sweep_args.fixed)
+        self.assertEqual([[["--a", "1"], ["--a", "2"]]], sweep_args.dimensions)
+        sweep_args = split_sweep_args(["--a", "1,2", "--c", "x,y"], is_option, lambda o: o != "--c")
+        self.assertEqual(["--c", "x,y"], sweep_args.fixed)
+
+    def test_no_dimensions(self):
+        self.assertSameAsFullParses(["--trainer.epochs", "5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import gc
+import unittest
+from dataclasses import dataclass, field, make_dataclass
+from typing import List, Optional
+from unittest import mock
+
+from paiargparse import pai_dataclass, PAIArgumentParser
+from paiargparse import dataclass_extractor
+from paiargparse.dataclass_extractor import type_plan, invalidate_type_plans, extract_args_of_dataclass
+
+
+@pai_dataclass
+@dataclass
+class Sub:
+    p: Optional[List[int]] = None
+
+
+@pai_dataclass
+@dataclass
+class Root:
+    sub: Sub = field(default_factory=Sub)
+    subs: List[Sub] = field(default_factory=lambda: [Sub(), Sub()])
+
+
+class TestTypePlan(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_type_plans()
+
+    def test_cached(self):
+        plan = type_plan(Root)
+        self.assertIs(plan, type_plan(Root))
+        self.assertEqual(("sub", "subs"), plan.field_names)
+        self.assertTrue(plan.field_types["subs"].dataclass)
+        self.assertIs(plan.field_types["subs"].list, list)
+
+        invalidate_type_plans(Root)
+        self.assertIsNot(plan, type_plan(Root))
+
+    def test_analyse_types_once(self):
+        with mock.patch.object(
+            dataclass_extractor, "split_field_type", wraps=dataclass_extractor.split_field_type
+        ) as split_field_type:
+            for _ in range(3):
+                parser = PAIArgumentParser()
+                parser.add_root_argument("root", Root)
+                root = parser.parse_args(["--root.subs.1.p", "1", "2"]).root
+                self.assertEqual(Root.from_dict(root.to_dict()), root)
+                self.assertEqual(3, len(extract_args_of_dataclass(Sub)) + len(extract_args_of_dataclass(Root)))
+
+        # one call per field of Root and Sub
+        self.assertEqual(3, split_field_type.call_count)
+
+    def test_weakly_keyed(self):
+        cls = pai_dataclass(make_dataclass("Dynamic", [("p", int, field(default=0))]))
+        type_plan(cls)
+        self.assertEqual(1, len(dataclass_extractor._type_plans))
+        del cls
+        gc.collect()
+        self.assertEqual(0, len(dataclass_extractor._type_plans))
+
+
+if __name__ == "__main__":
+    unittest.main()